@@ -0,0 +1,230 @@
+# PROTOCOL: ORACLE_v1 // ADMISSION CONTROL
+# One process-wide scheduler in front of Gemini: per-model token buckets for requests and
+# tokens per minute, a fair FIFO queue, and a tier ladder (primary -> cheaper model ->
+# local buffer) so a traffic spike degrades readings instead of severing all of them.
+#
+# Tuning (environment):
+#   ORACLE_MODEL_TIERS  - comma-separated "model@rpm/tpm[/depth]" ladder, best model first;
+#                         a rung with a depth is skipped while more seekers than that are
+#                         queued, and a final bare `local` rung routes the overflow to the
+#                         procedural engine instead of queueing (default: constants.GEMINI_MODEL_TIERS)
+#   ORACLE_QUEUE_MAX    - seekers allowed to wait; later arrivals get the local buffer (default 32)
+#   ORACLE_QUEUE_WAIT   - seconds a seeker waits for quota before the local buffer (default 10)
+
+import os
+import threading
+import time
+from collections import deque
+
+from constants import GEMINI_MODEL_TIERS
+from telemetry import METRICS
+
+# The ladder entry for the procedural engine (procedural.py)
+LOCAL_TIER = "local"
+
+# Expected reading size; the real count is settled from usage metadata after the call
+EXPECTED_RESPONSE_TOKENS = 1000
+
+METRICS.describe("oracle_admission_total", "Admission decisions, by outcome (model name, local, shed).")
+
+def estimate_tokens(prompt):
+    """Roughly four characters per token, plus the expected reading."""
+    return len(prompt) // 4 + EXPECTED_RESPONSE_TOKENS
+
+def usage_tokens(response):
+    """Total tokens billed for a response (or final stream chunk), if the API reported it."""
+    usage = getattr(response, "usage_metadata", None)
+    return getattr(usage, "total_token_count", None) or None
+
+# --- QUOTA ---
+
+class TokenBucket:
+    """Refills `per_minute` units per minute, holding at most one minute's worth."""
+
+    def __init__(self, per_minute, clock=time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self._level = self.capacity
+        self._clock = clock
+        self._stamp = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self._level = min(self.capacity, self._level + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def available(self):
+        self._refill()
+        return self._level
+
+    def wait_time(self, amount):
+        """Seconds until `amount` units are available."""
+        amount = min(amount, self.capacity)
+        self._refill()
+        return max(0.0, (amount - self._level) / self.rate) if self.rate else float("inf")
+
+    def take(self, amount):
+        self._refill()
+        self._level -= amount
+
+class Tier:
+    """
+    One rung of the ladder: a model and its requests/tokens per minute quota. With a
+    `max_depth`, the rung is skipped while more seekers than that are queued, so a deep
+    queue drains through the cheaper rungs instead of waiting on this one's quota.
+    """
+
+    local = False
+
+    def __init__(self, model_name, rpm, tpm, clock=time.monotonic, max_depth=None):
+        self.model_name = model_name
+        self.requests = TokenBucket(rpm, clock)
+        self.tokens = TokenBucket(tpm, clock)
+        self.max_depth = max_depth
+
+    def serves(self, depth):
+        return self.max_depth is None or depth <= self.max_depth
+
+    def wait_time(self, tokens):
+        return max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+
+    def try_acquire(self, tokens):
+        if self.wait_time(tokens) > 0:
+            return False
+        self.requests.take(1)
+        self.tokens.take(tokens)
+        return True
+
+class LocalTier:
+    """The procedural engine as the last rung: no model, no quota, never waits."""
+
+    local = True
+    model_name = LOCAL_TIER
+    max_depth = None
+
+    def serves(self, depth):
+        return True
+
+    def wait_time(self, tokens):
+        return 0.0
+
+    def try_acquire(self, tokens):
+        return True
+
+def parse_tiers(spec, clock=time.monotonic):
+    """Parses a "model@rpm/tpm[/depth],model@rpm/tpm[/depth][,local]" ladder, best model first."""
+    tiers = []
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        if tiers and tiers[-1].local:
+            raise ValueError(f"the {LOCAL_TIER} tier never runs out of quota, so it must come last")
+        if entry == LOCAL_TIER:
+            tiers.append(LocalTier())
+            continue
+        name, _, limits = entry.partition("@")
+        rpm, _, tpm = limits.partition("/")
+        tpm, _, depth = tpm.partition("/")
+        if not (name and rpm and tpm):
+            raise ValueError(f"expected model@rpm/tpm[/depth], got {entry!r}")
+        tiers.append(Tier(name, float(rpm), float(tpm), clock, int(depth) if depth else None))
+    if not tiers:
+        raise ValueError("at least one model tier is required")
+    return tiers
+
+# --- SCHEDULER ---
+
+class AdmissionScheduler:
+    """
+    Fair FIFO admission: only the seeker at the head of the queue may take quota, and it
+    takes the best tier that has quota right now and serves the current queue depth
+    (Tier.max_depth). If no tier frees up within `max_wait`,
+    or the queue already holds `max_queue` seekers, the caller gets None and serves the
+    local buffer.
+    """
+
+    def __init__(self, tiers, max_queue=32, max_wait=10.0, clock=time.monotonic):
+        self.tiers = tiers
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._clock = clock
+        self._queue = deque()
+        self._cond = threading.Condition()
+
+    @property
+    def model_names(self):
+        """The Gemini models on the ladder (not the local tier)."""
+        return [tier.model_name for tier in self.tiers if not tier.local]
+
+    def depth(self):
+        with self._cond:
+            return len(self._queue)
+
+    def _open_tiers(self):
+        """The rungs that serve the current queue depth, best first."""
+        depth = len(self._queue)
+        return [tier for tier in self.tiers if tier.serves(depth)]
+
+    def _try_tiers(self, tokens):
+        for tier in self._open_tiers():
+            if tier.try_acquire(tokens):
+                return tier
+        return None
+
+    def admit(self, tokens, on_wait=None):
+        """
+        Blocks until this caller may call a model; returns its Tier, or None for the
+        local buffer. `on_wait(position)` is called (1-based) whenever the caller's place
+        in the queue changes while it waits.
+        """
+        with self._cond:
+            if len(self._queue) >= self.max_queue:
+                METRICS.inc("oracle_admission_total", outcome="shed")
+                return None
+            ticket = object()
+            self._queue.append(ticket)
+            start = self._clock()
+            shown = None
+            try:
+                while True:
+                    position = self._queue.index(ticket)
+                    if position == 0:
+                        tier = self._try_tiers(tokens)
+                        if tier is not None:
+                            METRICS.inc("oracle_admission_total", outcome=tier.model_name)
+                            return tier
+                    remaining = self.max_wait - (self._clock() - start)
+                    if remaining <= 0:
+                        METRICS.inc("oracle_admission_total", outcome="local")
+                        return None
+                    if on_wait is not None and position != shown:
+                        shown = position
+                        # UI callbacks run outside the lock so other seekers keep moving
+                        self._cond.release()
+                        try:
+                            on_wait(position + 1)
+                        finally:
+                            self._cond.acquire()
+                        continue
+                    if position == 0:
+                        # With every open rung dry, wait for a refill (or for the queue to shrink)
+                        refill = min((tier.wait_time(tokens) for tier in self._open_tiers()), default=remaining)
+                        self._cond.wait(min(remaining, max(refill, 0.01)))
+                    else:
+                        self._cond.wait(remaining)
+            finally:
+                self._queue.remove(ticket)
+                self._cond.notify_all()
+
+    def settle(self, tier, estimated, actual):
+        """Corrects the tokens bucket once the real usage of an admitted call is known."""
+        if tier is None or actual is None:
+            return
+        with self._cond:
+            tier.tokens.take(actual - estimated)
+            self._cond.notify_all()
+
+def scheduler_from_env():
+    return AdmissionScheduler(
+        parse_tiers(os.environ.get("ORACLE_MODEL_TIERS", GEMINI_MODEL_TIERS)),
+        max_queue=int(os.environ.get("ORACLE_QUEUE_MAX", "32")),
+        max_wait=float(os.environ.get("ORACLE_QUEUE_WAIT", "10")),
+    )
@@ -0,0 +1,141 @@
+# PROTOCOL: ORACLE_v1 // OFFLINE ASSET BUILD
+# Turns the artist's card exports into display-sized variants, once, before deploy:
+#
+#   python asset_build.py                 # assets/cards/* -> assets/build/cards/ + manifest.json
+#   python asset_build.py --width 480 --colors 128 --force
+#
+# For each card it writes
+#   <slug>.anim.webp   - animated WebP (skipped for still images)
+#   <slug>.anim.gif    - palette-reduced GIF (skipped for still images)
+#   <slug>.poster.webp - the first frame, shown while the animation loads
+# and records byte sizes in the manifest, which card_library reads at import to pick the
+# smallest variant. Cards whose source changed since the build fall back to the original.
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+from PIL import Image, ImageSequence
+
+from card_library import CARD_ASSETS_DIR, CARD_BUILD_DIR, CARD_MANIFEST_PATH, CARDS, SLUG_TO_ASSET
+
+# .card-frame is 20vw (min 200px) and scales 1.05 on hover: ~400px covers a 1920px screen
+DISPLAY_WIDTH = 400
+GIF_COLORS = 64
+WEBP_QUALITY = 80
+
+# --- FRAMES ---
+
+def load_frames(path, width):
+    """RGBA frames resized to `width` (never upscaled), their durations (ms) and loop count."""
+    with Image.open(path) as im:
+        loop = im.info.get("loop", 0)
+        scale = min(1.0, width / im.width)
+        size = (max(1, round(im.width * scale)), max(1, round(im.height * scale)))
+        frames, durations = [], []
+        for frame in ImageSequence.Iterator(im):
+            durations.append(frame.info.get("duration", im.info.get("duration", 100)) or 100)
+            frames.append(frame.convert("RGBA").resize(size, Image.LANCZOS))
+    return frames, durations, loop
+
+# --- VARIANTS ---
+
+def write_variant(out_dir, name, save):
+    """Writes via save(path) to a temp file, renames it into place and returns its manifest entry."""
+    path = os.path.join(out_dir, name)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    save(tmp)
+    os.replace(tmp, path)
+    return {"file": name, "bytes": os.path.getsize(path)}
+
+def build_card(slug, source, out_dir, width=DISPLAY_WIDTH, colors=GIF_COLORS):
+    frames, durations, loop = load_frames(source, width)
+    first = frames[0]
+    entry = {
+        "source": os.path.basename(source),
+        "source_bytes": os.path.getsize(source),
+        "width": first.width,
+        "height": first.height,
+        "frames": len(frames),
+        "poster": write_variant(
+            out_dir, f"{slug}.poster.webp",
+            lambda p: first.save(p, "WEBP", quality=WEBP_QUALITY, method=6)
+        ),
+        "animations": {},
+    }
+    if len(frames) > 1:
+        entry["animations"]["webp"] = write_variant(
+            out_dir, f"{slug}.anim.webp",
+            lambda p: first.save(p, "WEBP", save_all=True, append_images=frames[1:], duration=durations,
+                                 loop=loop, quality=WEBP_QUALITY, method=6)
+        )
+        # One adaptive palette per frame, reduced to `colors`; transparency is flattened
+        paletted = [f.convert("RGB").quantize(colors, method=Image.Quantize.MEDIANCUT) for f in frames]
+        entry["animations"]["gif"] = write_variant(
+            out_dir, f"{slug}.anim.gif",
+            lambda p: paletted[0].save(p, "GIF", save_all=True, append_images=paletted[1:], duration=durations,
+                                       loop=loop, optimize=True, disposal=1)
+        )
+    return entry
+
+def source_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def build_all(width=DISPLAY_WIDTH, colors=GIF_COLORS, force=False, out_dir=CARD_BUILD_DIR, manifest_path=CARD_MANIFEST_PATH):
+    """Builds every card with art in assets/cards; unchanged sources are skipped unless `force`."""
+    previous = {}
+    if not force and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            old = json.load(f)
+        if old.get("width") == width and old.get("colors") == colors:
+            previous = old.get("cards", {})
+
+    os.makedirs(out_dir, exist_ok=True)
+    cards, built = {}, 0
+    for card in CARDS:
+        source = SLUG_TO_ASSET[card.slug]
+        if source is None:
+            continue
+        digest = source_digest(source)
+        entry = previous.get(card.slug)
+        if entry is None or entry.get("sha256") != digest:
+            entry = dict(build_card(card.slug, source, out_dir, width, colors), sha256=digest)
+            built += 1
+        cards[card.slug] = entry
+
+    manifest = {"width": width, "colors": colors, "cards": cards}
+    tmp = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, manifest_path)
+    return manifest, built
+
+def summarize(manifest):
+    """Original vs. shipped bytes (poster + smallest animation) across the deck."""
+    original = shipped = 0
+    for entry in manifest["cards"].values():
+        original += entry["source_bytes"]
+        animations = [v["bytes"] for v in entry["animations"].values()]
+        shipped += entry["poster"]["bytes"] + (min(animations) if animations else 0)
+    return {"cards": len(manifest["cards"]), "original_bytes": original, "shipped_bytes": shipped,
+            "ratio": round(original / shipped, 2) if shipped else None}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build display-sized card art variants and their manifest.")
+    parser.add_argument("--width", type=int, default=DISPLAY_WIDTH, help="display width in pixels")
+    parser.add_argument("--colors", type=int, default=GIF_COLORS, help="GIF palette size (2-256)")
+    parser.add_argument("--force", action="store_true", help="rebuild cards whose source is unchanged")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(CARD_ASSETS_DIR):
+        print(f"no card art found in {CARD_ASSETS_DIR}", file=sys.stderr)
+        return 1
+    manifest, built = build_all(args.width, args.colors, args.force)
+    print(json.dumps(dict(summarize(manifest), built=built), indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
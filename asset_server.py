@@ -0,0 +1,130 @@
+# PROTOCOL: ORACLE_v1 // ASSET PUBLISHING
+# Turns files under assets/ into <img src=...> references the browser can cache,
+# instead of re-sending base64 data: URIs over the websocket on every rerun.
+#
+# Modes (ORACLE_ASSET_MODE):
+#   auto    - "static" when Streamlit static serving is enabled, else "inline" (default)
+#   static  - content-hashed copies under static/oracle/, served by Streamlit at app/static/
+#   server  - the same hashed copies served by a small built-in HTTP server with
+#             immutable, one-year Cache-Control headers
+#   inline  - legacy base64 data: URIs
+
+import base64
+import hashlib
+import mimetypes
+import os
+import re
+import shutil
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import streamlit as st
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(APP_DIR, 'static', 'oracle')
+STATIC_URL_PREFIX = "app/static/oracle"
+CACHE_MAX_AGE = 365 * 24 * 3600
+
+# Quoted strings are kept verbatim; comments and layout whitespace around them are not
+_CSS_STRING = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""")
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+
+def minify_css(css):
+    """Drops comments and redundant whitespace/semicolons; selectors and values are unchanged."""
+    parts = _CSS_STRING.split(_CSS_COMMENT.sub("", css))
+    for i in range(0, len(parts), 2):
+        code = re.sub(r"\s+", " ", parts[i])
+        code = re.sub(r"\s*([{};,>])\s*", r"\1", code)
+        code = re.sub(r":\s+", ":", code)
+        parts[i] = code.replace(";}", "}")
+    return "".join(parts).strip()
+
+# --- BUILT-IN FILE SERVER ---
+
+class ImmutableAssetHandler(SimpleHTTPRequestHandler):
+    """Serves content-hashed files; a name never changes content, so cache it forever."""
+
+    def end_headers(self):
+        self.send_header("Cache-Control", f"public, max-age={CACHE_MAX_AGE}, immutable")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        super().end_headers()
+
+    def list_directory(self, path):
+        self.send_error(404)
+        return None
+
+    def log_message(self, format, *args):
+        pass
+
+def start_asset_server(port, directory=STATIC_DIR):
+    """Starts the file server on a daemon thread; returns None if another worker owns the port."""
+    handler = partial(ImmutableAssetHandler, directory=directory)
+    try:
+        server = ThreadingHTTPServer(("0.0.0.0", port), handler)
+    except OSError:
+        # Another worker process on this host already serves the same hashed files
+        return None
+    threading.Thread(target=server.serve_forever, name="oracle-asset-server", daemon=True).start()
+    return server
+
+# --- PUBLISHER ---
+
+class AssetPublisher:
+    """Maps asset paths to image sources, publishing content-hashed copies once per process."""
+
+    def __init__(self, mode, base_url=STATIC_URL_PREFIX, static_dir=STATIC_DIR):
+        self.mode = mode
+        self.base_url = base_url.rstrip("/")
+        self.static_dir = static_dir
+        self._sources = {}
+        self._lock = threading.Lock()
+
+    def url_for(self, path):
+        """Returns an <img src> value for the file at `path`, or None if it is missing."""
+        src = self._sources.get(path)
+        if src is None:
+            with self._lock:
+                src = self._sources.get(path) or self._publish(path)
+                if src is not None:
+                    self._sources[path] = src
+        return src
+
+    def _publish(self, path):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+
+        if self.mode == "inline":
+            mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            return f"data:{mime};base64,{base64.b64encode(data).decode()}"
+
+        stem, ext = os.path.splitext(os.path.basename(path))
+        hashed_name = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+        target = os.path.join(self.static_dir, hashed_name)
+        if not os.path.exists(target):
+            os.makedirs(self.static_dir, exist_ok=True)
+            # Copy then rename so concurrent workers never serve a half-written file
+            tmp = f"{target}.{os.getpid()}.tmp"
+            shutil.copyfile(path, tmp)
+            os.replace(tmp, target)
+        return f"{self.base_url}/{hashed_name}"
+
+def resolve_asset_mode():
+    mode = os.environ.get("ORACLE_ASSET_MODE", "auto")
+    if mode == "auto":
+        return "static" if st.get_option("server.enableStaticServing") else "inline"
+    return mode
+
+@st.cache_resource(show_spinner=False)
+def get_asset_publisher():
+    """One publisher per process, configured from ORACLE_ASSET_MODE."""
+    mode = resolve_asset_mode()
+    if mode == "server":
+        port = int(os.environ.get("ORACLE_ASSET_PORT", "8765"))
+        os.makedirs(STATIC_DIR, exist_ok=True)
+        start_asset_server(port)
+        return AssetPublisher(mode, os.environ.get("ORACLE_ASSET_BASE_URL", f"http://localhost:{port}"))
+    return AssetPublisher(mode)
@@ -0,0 +1,145 @@
+# PROTOCOL: ORACLE_v1 // HEADLESS BATCH ENGINE
+# Generates readings offline (newsletters, QA) without the Streamlit UI.
+#
+#   python batch_reader.py --concurrency 16 < jobs.jsonl > readings.jsonl
+#
+# Each input line is a JSON object: {"id": ..., "cards": [c1, c2, c3], "query": "..."}.
+# "id" and "query" are optional; missing "cards" draws three at random. A line that is
+# not a valid job is reported as {"line": <1-based line number>, "error": ...}, never
+# under "id", so it cannot be mistaken for the result of a job with that id.
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from collections import deque
+
+from card_library import CARD_LIBRARY, draw_cards
+from constants import GEMINI_MODEL_NAME, SYSTEM_INSTRUCTION
+from oracle_core import HAS_GOOGLE_GENAI, build_prompt, create_gemini_model, generate_local_fallback, generate_severed_fallback
+from reading_cache import DEFAULT_CACHE_PATH, ReadingCache, make_cache_key
+
+# --- JOB HANDLING ---
+
+def parse_job(raw, index):
+    """Normalizes a decoded JSONL line into a job dict, drawing cards if none were given."""
+    cards = raw.get("cards") or draw_cards(3)
+    if len(cards) != 3:
+        raise ValueError(f"expected 3 cards, got {len(cards)}")
+    unknown = [c for c in cards if c not in CARD_LIBRARY]
+    if unknown:
+        raise ValueError(f"unknown cards: {', '.join(unknown)}")
+    return {"id": raw.get("id", index), "cards": list(cards), "query": raw.get("query") or ""}
+
+async def _call_model(model, prompt):
+    if hasattr(model, "generate_content_async"):
+        response = await model.generate_content_async(prompt)
+    else:
+        response = await asyncio.to_thread(model.generate_content, prompt)
+    return response.text
+
+async def read_one(job, model, semaphore, cache=None, timeout=None):
+    """Runs a single job, falling back to the local buffer if the API call fails."""
+    result = {"id": job["id"], "cards": job["cards"], "query": job["query"]}
+    if model is None:
+        result.update(source="local", reading=generate_local_fallback(*job["cards"], job["query"]))
+        return result
+
+    cache_key = make_cache_key(job["cards"], job["query"], GEMINI_MODEL_NAME, SYSTEM_INSTRUCTION)
+    if cache is not None:
+        # SQLite off the event loop, as reading_service.py does, so other jobs keep running
+        cached = await asyncio.to_thread(cache.get, cache_key)
+        if cached is not None:
+            result.update(source="cache", reading=cached)
+            return result
+
+    try:
+        async with semaphore:
+            text = await asyncio.wait_for(_call_model(model, build_prompt(job["cards"], job["query"])), timeout)
+    except Exception as e:
+        result.update(source="fallback", reading=generate_severed_fallback(job["cards"], e, job["query"]), error=str(e) or type(e).__name__)
+        return result
+
+    if cache is not None:
+        await asyncio.to_thread(cache.set, cache_key, text)
+    result.update(source="gemini", reading=text)
+    return result
+
+async def run_batch(jobs, model, concurrency=8, ordered=True, cache=None, timeout=None):
+    """
+    Async generator over results for an iterable of jobs.
+    At most `concurrency` API calls are in flight; the job iterable is consumed lazily so
+    arbitrarily long streams run in bounded memory. `ordered=False` yields results as
+    soon as they finish.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    window = max(1, concurrency * 2)
+    jobs = iter(jobs)
+    pending = deque()
+    exhausted = False
+
+    def refill():
+        nonlocal exhausted
+        while not exhausted and len(pending) < window:
+            job = next(jobs, None)
+            if job is None:
+                exhausted = True
+            else:
+                pending.append(asyncio.ensure_future(read_one(job, model, semaphore, cache, timeout)))
+
+    refill()
+    while pending:
+        if ordered:
+            result = await pending.popleft()
+        else:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            task = next(iter(done))
+            pending.remove(task)
+            result = task.result()
+        refill()
+        yield result
+
+# --- CLI ---
+
+def read_jobs(stream, errors):
+    """Lazily parses JSONL jobs; malformed lines are reported through `errors`."""
+    for index, line in enumerate(stream):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield parse_job(json.loads(line), index)
+        except (ValueError, TypeError, AttributeError) as e:
+            errors.append({"line": index + 1, "error": f"INVALID_JOB: {e}"})
+
+async def _main(args):
+    model = None
+    api_key = args.api_key or os.environ.get("GOOGLE_API_KEY")
+    if api_key and HAS_GOOGLE_GENAI and not args.offline:
+        model = create_gemini_model(api_key)
+    cache = ReadingCache(args.cache_path) if args.cache else None
+
+    errors = []
+    async for result in run_batch(read_jobs(sys.stdin, errors), model, args.concurrency, not args.unordered, cache, args.timeout):
+        while errors:
+            sys.stdout.write(json.dumps(errors.pop(0)) + "\n")
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+    for error in errors:
+        sys.stdout.write(json.dumps(error) + "\n")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate oracle readings from JSONL jobs on stdin.")
+    parser.add_argument("--concurrency", type=int, default=8, help="maximum in-flight Gemini calls")
+    parser.add_argument("--unordered", action="store_true", help="emit results as they finish")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-call timeout in seconds")
+    parser.add_argument("--api-key", help="Gemini API key (defaults to $GOOGLE_API_KEY)")
+    parser.add_argument("--offline", action="store_true", help="skip Gemini and use the local buffer")
+    parser.add_argument("--cache", action="store_true", help="read/write the shared interpretation cache")
+    parser.add_argument("--cache-path", default=os.environ.get("ORACLE_CACHE_PATH", DEFAULT_CACHE_PATH))
+    args = parser.parse_args(argv)
+    asyncio.run(_main(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# PROTOCOL: ORACLE_v1 // GLITCH ENGINE MICROBENCHMARK
+#
+#   python benchmarks/bench_glitch.py
+#
+# Times the one-off scan of a long reading and the per-frame cost of pulling glitched
+# frames from the generator. The per-frame budget is 1 ms.
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from glitch import GlitchedText, glitch_frames
+from oracle_core import generate_local_fallback
+
+FRAME_BUDGET_MS = 1.0
+
+def long_reading(target_chars=12000):
+    """Repeats local-buffer readings until they approach a long Gemini output."""
+    base = generate_local_fallback("The Star", "Death", "The Hanged Man") + (
+        " The soul walks the path of light and dark; know your heart, see the truth, "
+        "find the meaning and purpose of this journey through time, love and pain."
+    )
+    return (base * (target_chars // len(base) + 1))[:target_chars]
+
+def main():
+    text = long_reading()
+    glitched = GlitchedText(text)
+
+    scans = 200
+    scan_ms = timeit.timeit(lambda: GlitchedText(text), number=scans) / scans * 1000
+
+    frames = glitch_frames(text, probability=0.15, seed=7)
+    next(frames)
+    pulls = 2000
+    frame_ms = timeit.timeit(lambda: next(frames), number=pulls) / pulls * 1000
+
+    print(f"reading: {len(text)} chars, {len(glitched)} glitchable words")
+    print(f"scan (once per reading): {scan_ms:.3f} ms")
+    print(f"frame (per pull):        {frame_ms:.4f} ms  (budget {FRAME_BUDGET_MS} ms)")
+    if frame_ms >= FRAME_BUDGET_MS:
+        print("FAIL: per-frame cost over budget")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
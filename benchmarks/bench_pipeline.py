@@ -0,0 +1,226 @@
+# PROTOCOL: ORACLE_v1 // READING PIPELINE BENCHMARKS
+#
+#   python benchmarks/bench_pipeline.py --output bench.json
+#   python benchmarks/bench_pipeline.py --compare bench.json --threshold 0.15
+#
+# Runs fully offline: fake_gemini.FakeGenerativeModel stands in for get_gemini_model.
+# Every metric is "lower is better"; --compare exits 1 when any metric regresses by more
+# than --threshold (relative) over the baseline file.
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+# Absolute slack so sub-millisecond jitter never counts as a regression
+NOISE_FLOOR_MS = 0.5
+
+CARDS = ["The Star", "Death", "The Hanged Man"]
+
+def measure(fn, repeat):
+    """Runs fn `repeat` times; returns p50/min/max wall time in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"p50_ms": statistics.median(samples), "min_ms": min(samples), "max_ms": max(samples)}
+
+class RecordingContainer:
+    """Stands in for st.empty(): counts markdown flushes and bytes instead of rendering."""
+
+    def __init__(self):
+        self.flushes = 0
+        self.bytes = 0
+
+    def markdown(self, body, **kwargs):
+        self.flushes += 1
+        self.bytes += len(body.encode())
+
+def load_app():
+    """Imports main.py outside `streamlit run` (bare mode), silencing its runtime warnings."""
+    with warnings.catch_warnings(), contextlib.redirect_stderr(io.StringIO()):
+        warnings.simplefilter("ignore")
+        import main
+    from reading_cache import ReadingCache
+    return main, ReadingCache
+
+# --- BENCHMARKS ---
+
+def bench_interpretation(args):
+    main, ReadingCache = load_app()
+    from fake_gemini import FakeGenerativeModel
+
+    model = FakeGenerativeModel(latency=args.latency, output_chars=args.output_chars)
+    main.get_gemini_model = lambda api_key, model_name=None, system_instruction=None: model
+    # Zero-capacity memory tier and no disk tier: every call is a miss
+    main.get_reading_cache = lambda: ReadingCache(path=None, max_memory_entries=0)
+
+    return {
+        "generate_interpretation_api": measure(lambda: main.generate_interpretation(CARDS, "bench", "fake-key"), args.repeat),
+        "generate_interpretation_fallback": measure(lambda: main.generate_interpretation(CARDS, "bench", None), args.repeat * 50),
+        "generate_local_fallback": measure(lambda: main.generate_local_fallback(*CARDS, "bench"), args.repeat * 50),
+    }
+
+def bench_streaming(args):
+    main, _ = load_app()
+    from fake_gemini import fake_reading
+
+    text = fake_reading("bench", args.output_chars)
+    real_sleep = main.time.sleep
+    main.time.sleep = lambda seconds: None
+    main.CLIENT_TYPEWRITER = False
+    try:
+        recorder = RecordingContainer()
+        main.stream_text_glitch(recorder, text)
+        glitch = measure(lambda: main.stream_text_glitch(RecordingContainer(), text), args.repeat)
+        glitch.update(flushes=recorder.flushes, bytes=recorder.bytes)
+
+        chunks = [text[i:i + 200] for i in range(0, len(text), 200)]
+        recorder = RecordingContainer()
+        main.stream_text_live(recorder, chunks)
+        live = measure(lambda: main.stream_text_live(RecordingContainer(), chunks), args.repeat)
+        live.update(flushes=recorder.flushes, bytes=recorder.bytes)
+    finally:
+        main.time.sleep = real_sleep
+    return {"stream_text_glitch_server": glitch, "stream_text_live": live}
+
+def bench_assets(args):
+    main, _ = load_app()
+    import asset_server
+    import boot_sequence
+
+    def cold(loader, *a):
+        def run():
+            # Drop both the loader cache and the publisher's per-path memo
+            loader.clear()
+            asset_server.get_asset_publisher.clear()
+            loader(*a)
+        return run
+
+    return {
+        "load_card_image_cold": measure(cold(main.load_card_image, "The Fool"), args.repeat * 10),
+        "load_card_image_warm": measure(lambda: main.load_card_image("The Fool"), args.repeat * 10),
+        "load_boot_logo_cold": measure(cold(boot_sequence.load_boot_logo), args.repeat * 10),
+        "load_boot_logo_warm": measure(boot_sequence.load_boot_logo, args.repeat * 10),
+    }
+
+def bench_app_cycle(args):
+    """Full boot -> INPUT -> READING cycle through Streamlit's AppTest."""
+    from streamlit.testing.v1 import AppTest
+
+    import oracle_core
+    from fake_gemini import FakeGenerativeModel
+
+    model = FakeGenerativeModel(latency=args.latency, output_chars=args.output_chars)
+    oracle_core.create_gemini_model = lambda api_key, model_name=None, system_instruction=None: model
+    os.environ["ORACLE_CACHE_PATH"] = ""
+
+    boot, reading, rerun = [], [], []
+    for i in range(args.repeat):
+        at = AppTest.from_file(os.path.join(APP_DIR, "main.py"), default_timeout=60)
+        at.secrets["GOOGLE_API_KEY"] = "fake-key"
+
+        start = time.perf_counter()
+        at.run()
+        boot.append((time.perf_counter() - start) * 1000)
+
+        at.button(key="boot_btn").click().run()
+        at.text_input[0].input(f"bench query {i} {time.time()}").run()
+        at.slider[0].set_value(100).run()
+        start = time.perf_counter()
+        at.button[0].click().run()
+        if at.session_state["stage"] != "READING" or not at.session_state["reading"]:
+            at.run()
+        reading.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        at.run()
+        rerun.append((time.perf_counter() - start) * 1000)
+
+    summarize = lambda xs: {"p50_ms": statistics.median(xs), "min_ms": min(xs), "max_ms": max(xs)}
+    return {"boot_first_run": summarize(boot), "click_to_reading": summarize(reading), "reading_rerun": summarize(rerun)}
+
+BENCHMARKS = {
+    "interpretation": bench_interpretation,
+    "streaming": bench_streaming,
+    "assets": bench_assets,
+    "app_cycle": bench_app_cycle,
+}
+
+# --- REPORTING ---
+
+def flatten(results):
+    return {
+        f"{group}.{bench}.{metric}": value
+        for group, benches in results.items()
+        for bench, metrics in benches.items()
+        for metric, value in metrics.items()
+    }
+
+def compare(baseline, current, threshold):
+    """Returns (rows, regressions) comparing flattened metrics."""
+    old, new = flatten(baseline["results"]), flatten(current["results"])
+    rows, regressions = [], []
+    for key in sorted(new):
+        if key not in old or key.endswith(("min_ms", "max_ms")):
+            continue
+        before, after = old[key], new[key]
+        change = (after - before) / before if before else 0.0
+        slack = NOISE_FLOOR_MS if key.endswith("_ms") else 0
+        regressed = after > before * (1 + threshold) and after - before > slack
+        rows.append((key, before, after, change, regressed))
+        if regressed:
+            regressions.append(key)
+    return rows, regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the PROTOCOL: ORACLE reading pipeline.")
+    parser.add_argument("--only", choices=sorted(BENCHMARKS), action="append", help="run only these groups")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.2, help="fake model latency in seconds")
+    parser.add_argument("--output-chars", type=int, default=2500, help="fake model reading size")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against a previous results JSON")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed relative regression")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.only or BENCHMARKS:
+        results[name] = BENCHMARKS[name](args)
+
+    report = {
+        "python": platform.python_version(),
+        "config": {"repeat": args.repeat, "latency": args.latency, "output_chars": args.output_chars},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if not args.compare:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    with open(args.compare) as f:
+        baseline = json.load(f)
+    rows, regressions = compare(baseline, report, args.threshold)
+    for key, before, after, change, regressed in rows:
+        flag = "REGRESSED" if regressed else ""
+        print(f"{key:<60} {before:>12.3f} -> {after:>12.3f}  {change:+7.1%}  {flag}")
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed beyond {args.threshold:.0%}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
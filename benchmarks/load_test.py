@@ -0,0 +1,313 @@
+# PROTOCOL: ORACLE_v1 // CONCURRENT-SESSION LOAD TEST
+#
+#   python benchmarks/load_test.py --sessions 40 --concurrency 20
+#   python benchmarks/load_test.py --latency lognormal:1.2,0.5 --error-rate 0.05 --output load.json
+#   python benchmarks/load_test.py --calibration-steps 20   # keystrokes/slider ticks per seeker
+#
+# Capacity planning for one Streamlit process, fully offline:
+#   1. serves the Gemini stand-in (fake_gemini.start_fake_server) on 127.0.0.1
+#   2. launches `streamlit run main.py` headless, pointed at it via ORACLE_GEMINI_ENDPOINT
+#   3. drives N seekers over Streamlit's websocket protocol, like N browser tabs, through
+#      boot -> INPUT -> READING, with at most --concurrency of them in flight
+# and reports throughput, tail latency, the server's per-session memory and CPU, and how
+# many script runs were full reruns versus fragment reruns (the INPUT controls).
+#
+# AppTest cannot be used for this: it swaps process globals (the Runtime instance,
+# st.secrets) on every run, so concurrent AppTests in one process break each other.
+# The websocket client needs the `websockets` package (bundled with recent Streamlit).
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+from fake_gemini import FakeGenerativeModel, start_fake_server
+
+QUERY_LABEL = ">> ENTER QUERY PARAMETER:"
+FREQUENCY_LABEL = ""  # the calibration slider is unlabeled
+TRANSMIT_LABEL = "INITIALIZE SEQUENCE"
+
+# --- SERVER UNDER TEST ---
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def rss_bytes(pid):
+    """Resident set size of `pid` (Linux /proc, else ps)."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        out = subprocess.run(["ps", "-o", "rss=", "-p", str(pid)], capture_output=True, text=True).stdout
+        return int(out.strip() or 0) * 1024
+
+def cpu_seconds(pid):
+    """User + system CPU time of `pid` (Linux /proc, else ps)."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except OSError:
+        out = subprocess.run(["ps", "-o", "time=", "-p", str(pid)], capture_output=True, text=True).stdout.strip()
+        seconds = 0.0
+        for part in (out.split("-")[-1] or "0").split(":"):
+            seconds = seconds * 60 + float(part)
+        return seconds
+
+def launch_streamlit(port, endpoint, workdir):
+    """Starts main.py headless against the fake endpoint and waits for /_stcore/health."""
+    secrets = os.path.join(workdir, "secrets.toml")
+    with open(secrets, "w") as f:
+        f.write('GOOGLE_API_KEY = "fake-key"\n')
+    env = dict(os.environ, ORACLE_GEMINI_ENDPOINT=endpoint, ORACLE_CACHE_PATH="",
+               ORACLE_HISTORY_PATH=os.path.join(workdir, "history.sqlite"))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "main.py",
+         "--server.headless", "true", "--server.port", str(port), "--server.address", "127.0.0.1",
+         "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false",
+         "--secrets.files", secrets],
+        cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"streamlit exited with code {proc.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as r:
+                if r.status == 200:
+                    return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise SystemExit("streamlit did not become healthy within 60s")
+
+# --- WEBSOCKET SEEKER ---
+
+class Seeker:
+    """One browser tab: replays widget interactions as BackMsg reruns over the websocket."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.query_string = ""
+        self.widgets = {}  # label (or key for keyed widgets) -> (widget id, widget type, fragment id)
+        self.first_text_at = None
+        self.fallback = False
+        self.script_runs = 0
+        self.fragment_runs = 0
+
+    def _track(self, msg):
+        kind = msg.WhichOneof("type")
+        if kind == "page_info_changed":
+            # Mirrors the browser URL, so the uplink fast path sees the same query string
+            self.query_string = msg.page_info_changed.query_string
+        elif kind == "new_session":
+            if msg.new_session.fragment_ids_this_run:
+                self.fragment_runs += 1
+            else:
+                self.script_runs += 1
+        elif kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+            element = msg.delta.new_element
+            element_type = element.WhichOneof("type")
+            if element_type in ("button", "text_input", "slider"):
+                widget = getattr(element, element_type)
+                self.widgets[widget.label] = (widget.id, element_type, msg.delta.fragment_id)
+                if widget.id.endswith("-boot_btn"):
+                    self.widgets["boot_btn"] = self.widgets[widget.label]
+            elif element_type == "markdown" and 'class="ai-output"' in element.markdown.body:
+                if self.first_text_at is None:
+                    self.first_text_at = time.perf_counter()
+                if "CONNECTION_SEVERED" in element.markdown.body:
+                    self.fallback = True
+
+    async def rerun(self, **values):
+        """
+        Sends one rerun with these widget values; waits until it (and any st.rerun) finishes.
+        Like the browser, widgets that all live in one fragment rerun only that fragment.
+        """
+        back = BackMsg()
+        back.rerun_script.query_string = self.query_string
+        fragments = {self.widgets[name][2] for name in values}
+        if len(fragments) == 1 and "" not in fragments:
+            back.rerun_script.fragment_id = fragments.pop()
+        for name, value in values.items():
+            widget_id, widget_type, _ = self.widgets[name]
+            state = back.rerun_script.widget_states.widgets.add()
+            state.id = widget_id
+            if widget_type == "button":
+                state.trigger_value = bool(value)
+            elif widget_type == "slider":
+                state.double_array_value.data[:] = [value]
+            else:
+                state.string_value = value
+        await self.ws.send(back.SerializeToString())
+        while True:
+            msg = ForwardMsg()
+            msg.ParseFromString(await self.ws.recv())
+            self._track(msg)
+            if msg.WhichOneof("type") == "script_finished" and msg.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                return
+
+async def run_seeker(index, url, semaphore, hold, release, calibration_steps=0):
+    """
+    boot -> INPUT -> READING for one seeker; returns its timings in milliseconds. With
+    `calibration_steps`, the query is typed and the slider dragged to 100 in that many reruns.
+    """
+    import websockets
+
+    async with semaphore:
+        ws = await websockets.connect(url, subprotocols=["streamlit"], max_size=None)
+        seeker = Seeker(ws)
+        start = time.perf_counter()
+        await seeker.rerun()
+        await seeker.rerun(boot_btn=True)
+        boot_done = time.perf_counter()
+
+        query = f"load test seeker {index} {time.time()}"
+        steps = []
+        for step in range(1, calibration_steps + 1):
+            step_start = time.perf_counter()
+            await seeker.rerun(**{QUERY_LABEL: query[:len(query) * step // calibration_steps],
+                                  FREQUENCY_LABEL: 100 * step // calibration_steps})
+            steps.append((time.perf_counter() - step_start) * 1000)
+        inputs = {QUERY_LABEL: query, FREQUENCY_LABEL: 100}
+        await seeker.rerun(**inputs)
+        click = time.perf_counter()
+        await seeker.rerun(**inputs, **{TRANSMIT_LABEL: True})
+        done = time.perf_counter()
+
+    # The connection (and its server-side session) stays open until memory is sampled
+    hold.append(ws)
+    await release.wait()
+    await ws.close()
+    return {
+        "boot_ms": (boot_done - start) * 1000,
+        "time_to_first_text_ms": ((seeker.first_text_at or done) - click) * 1000,
+        "click_to_reading_ms": (done - click) * 1000,
+        "session_ms": (done - start) * 1000,
+        "calibration_step_ms": steps,
+        "fallback": seeker.fallback,
+        "script_runs": seeker.script_runs,
+        "fragment_runs": seeker.fragment_runs,
+    }
+
+# --- REPORT ---
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {"p50_ms": pick(0.5), "p95_ms": pick(0.95), "p99_ms": pick(0.99), "max_ms": ordered[-1]}
+
+async def drive(args, url, server_pid):
+    # One untimed seeker first, so imports and caches are not billed to the measured sessions
+    warm = asyncio.Event()
+    warm.set()
+    await run_seeker("warmup", url, asyncio.Semaphore(1), [], warm, args.calibration_steps)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    hold, release = [], asyncio.Event()
+    baseline_rss = rss_bytes(server_pid)
+    baseline_cpu = cpu_seconds(server_pid)
+    start = time.perf_counter()
+    tasks = [
+        asyncio.ensure_future(run_seeker(i, url, semaphore, hold, release, args.calibration_steps))
+        for i in range(args.sessions)
+    ]
+
+    # Every seeker has either finished (and is holding its session open) or failed
+    while len(hold) + sum(t.done() for t in tasks) < len(tasks):
+        await asyncio.sleep(0.05)
+    wall = time.perf_counter() - start
+    cpu = cpu_seconds(server_pid) - baseline_cpu
+    held_rss, held = rss_bytes(server_pid), len(hold)
+    release.set()
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = [o for o in outcomes if not isinstance(o, BaseException)]
+    failures = [f"{type(o).__name__}: {o}" for o in outcomes if isinstance(o, BaseException)]
+    return {
+        "wall_s": wall,
+        "throughput_sessions_per_s": len(results) / wall if wall else 0.0,
+        "sessions": {"completed": len(results), "fallback": sum(r["fallback"] for r in results), "failed": len(failures)},
+        "latency": {
+            key: percentiles([r[key] for r in results])
+            for key in ("boot_ms", "time_to_first_text_ms", "click_to_reading_ms", "session_ms")
+        },
+        "calibration_step": percentiles([step for r in results for step in r["calibration_step_ms"]]),
+        "script_runs": {
+            "full": sum(r["script_runs"] for r in results),
+            "fragment": sum(r["fragment_runs"] for r in results),
+        },
+        "cpu": {"server_cpu_s": cpu, "per_session_ms": cpu / max(1, len(results)) * 1000},
+        "memory": {
+            "server_baseline_rss_mb": baseline_rss / 2**20,
+            "server_held_rss_mb": held_rss / 2**20,
+            "per_session_kb": (held_rss - baseline_rss) / max(1, held) / 1024,
+        },
+        "failures": failures[:10],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline concurrent-session load test for PROTOCOL: ORACLE.")
+    parser.add_argument("--sessions", type=int, default=20, help="total seekers to run")
+    parser.add_argument("--concurrency", type=int, default=10, help="seekers in flight at once")
+    parser.add_argument("--latency", default="lognormal:0.8,0.4",
+                        help="fake model latency: seconds, uniform:a,b, lognormal:median,sigma or exp:mean")
+    parser.add_argument("--output-chars", type=int, default=2500)
+    parser.add_argument("--chunks", type=int, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--stream-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--calibration-steps", type=int, default=0,
+                        help="reruns per seeker typing the query and dragging the slider before the click")
+    parser.add_argument("--port", type=int, default=0, help="streamlit port (default: any free port)")
+    parser.add_argument("--output", help="write the JSON report here as well as stdout")
+    args = parser.parse_args()
+
+    model = FakeGenerativeModel(
+        latency=args.latency, output_chars=args.output_chars, chunks=args.chunks,
+        error_rate=args.error_rate, stream_error_rate=args.stream_error_rate, seed=args.seed,
+    )
+    fake = start_fake_server(model)
+    port = args.port or free_port()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        proc = launch_streamlit(port, f"http://127.0.0.1:{fake.server_port}", workdir)
+        try:
+            results = asyncio.run(drive(args, f"ws://127.0.0.1:{port}/_stcore/stream", proc.pid))
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+            fake.shutdown()
+
+    report = {
+        "python": platform.python_version(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "port")},
+        **results,
+        "model": {"calls": model.calls, "injected_errors": model.errors},
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    return 1 if results["failures"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
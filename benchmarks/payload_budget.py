@@ -0,0 +1,114 @@
+# PROTOCOL: ORACLE_v1 // PER-RERUN PAYLOAD BUDGET
+#
+#   python benchmarks/payload_budget.py                  # exits 1 if any stage is over budget
+#   python benchmarks/payload_budget.py --write          # records current sizes (+ --headroom)
+#
+# Drives boot -> INPUT -> READING through Streamlit's AppTest (offline, with
+# fake_gemini standing in for the model) and records what each rerun emits: the bytes of
+# markdown/HTML bodies and of all element protos. The markdown/HTML bytes are checked
+# against payload_budget.json so a template or stylesheet change that bloats every rerun
+# fails CI instead of shipping; tests/test_payload_budget.py runs the same check in pytest.
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "payload_budget.json")
+HTML_ELEMENTS = ("Markdown", "Html")
+
+# --- RECORDING ---
+
+def emitted(at):
+    """Element count, markdown/HTML body bytes and total proto bytes in the last run's tree."""
+    totals = {"elements": 0, "html_bytes": 0, "element_bytes": 0}
+
+    def walk(node):
+        proto = getattr(node, "proto", None)
+        if proto is not None and not getattr(node, "children", None):
+            totals["elements"] += 1
+            totals["element_bytes"] += len(proto.SerializeToString())
+            if type(node).__name__ in HTML_ELEMENTS:
+                totals["html_bytes"] += len(proto.body.encode())
+            return
+        for child in getattr(node, "children", {}).values():
+            walk(child)
+
+    walk(at._tree)
+    return totals
+
+def record_stages(output_chars):
+    """Sizes per stage of one offline session."""
+    os.environ.update(ORACLE_CACHE_PATH="", ORACLE_HISTORY_PATH="", ORACLE_SPECULATE="0", ORACLE_ASSET_MODE="static")
+    from streamlit.testing.v1 import AppTest
+
+    # The unlabeled calibration slider warns on every run
+    logging.disable(logging.WARNING)
+    import oracle_core
+    from fake_gemini import FakeGenerativeModel
+
+    model = FakeGenerativeModel(latency=0, output_chars=output_chars, seed=7)
+    oracle_core.create_gemini_model = lambda api_key, model_name=None, system_instruction=None: model
+
+    at = AppTest.from_file(os.path.join(APP_DIR, "main.py"), default_timeout=60)
+    at.secrets["GOOGLE_API_KEY"] = "fake-key"
+    stages = {}
+
+    at.run()
+    stages["boot"] = emitted(at)
+    at.button(key="boot_btn").click().run()
+    stages["input"] = emitted(at)
+    at.text_input[0].input("payload budget").run()
+    at.slider[0].set_value(100).run()
+    stages["input_locked"] = emitted(at)
+    next(b for b in at.button if b.label == "INITIALIZE SEQUENCE").click().run()
+    if at.session_state["stage"] != "READING" or not at.session_state["reading"]:
+        at.run()
+    stages["reading"] = emitted(at)
+    at.run()
+    stages["reading_rerun"] = emitted(at)
+    if at.exception:
+        raise SystemExit(f"app raised: {at.exception[0].message}")
+    return stages
+
+# --- CHECK ---
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-rerun markdown/HTML payload budget for PROTOCOL: ORACLE.")
+    parser.add_argument("--budget", default=BUDGET_PATH, help="budget JSON (stage -> max markdown/HTML bytes)")
+    parser.add_argument("--write", action="store_true", help="write the current sizes as the new budget")
+    parser.add_argument("--headroom", type=float, default=0.10, help="slack added by --write")
+    parser.add_argument("--output-chars", type=int, default=2500, help="fake model reading size")
+    args = parser.parse_args()
+
+    stages = record_stages(args.output_chars)
+    if args.write:
+        budget = {stage: int(sizes["html_bytes"] * (1 + args.headroom)) for stage, sizes in stages.items()}
+        with open(args.budget, "w") as f:
+            json.dump(budget, f, indent=2)
+            f.write("\n")
+    else:
+        with open(args.budget) as f:
+            budget = json.load(f)
+
+    over = []
+    print(f"{'stage':<16}{'elements':>9}{'html':>9}{'budget':>9}{'all':>9}")
+    for stage, sizes in stages.items():
+        limit = budget.get(stage)
+        flag = ""
+        if limit is not None and sizes["html_bytes"] > limit:
+            over.append(stage)
+            flag = "  OVER"
+        print(f"{stage:<16}{sizes['elements']:>9}{sizes['html_bytes']:>9}{limit if limit is not None else '-':>9}"
+              f"{sizes['element_bytes']:>9}{flag}")
+    if over:
+        print(f"over budget: {', '.join(over)}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
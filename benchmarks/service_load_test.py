@@ -0,0 +1,156 @@
+# PROTOCOL: ORACLE_v1 // READING SERVICE LOAD TEST
+#
+#   python benchmarks/service_load_test.py --readings 200 --concurrency 50
+#   python benchmarks/service_load_test.py --latency lognormal:1.2,0.5 --service-concurrency 64
+#
+# load_test.py for the headless reading service, fully offline:
+#   1. serves the Gemini stand-in (fake_gemini.start_fake_server) on 127.0.0.1
+#   2. launches `reading_service.py` pointed at it via ORACLE_GEMINI_ENDPOINT
+#   3. streams N readings from /reading/stream (SSE), at most --concurrency at once
+# and reports readings per second, time to first chunk and the server's memory, in the
+# same shape as load_test.py so the two can be compared for one process.
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import urllib.request
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from fake_gemini import FakeGenerativeModel, start_fake_server
+from load_test import free_port, percentiles, rss_bytes
+
+# --- SERVER UNDER TEST ---
+
+def launch_service(port, endpoint, concurrency):
+    """Starts reading_service.py against the fake endpoint and waits for /healthz."""
+    env = dict(os.environ, ORACLE_GEMINI_ENDPOINT=endpoint, GOOGLE_API_KEY="fake-key", ORACLE_CACHE_PATH="")
+    proc = subprocess.Popen(
+        [sys.executable, "reading_service.py", "--port", str(port), "--concurrency", str(concurrency),
+         "--max-queue", "100000"],
+        cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"reading_service exited with code {proc.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/healthz", timeout=1) as r:
+                if r.status == 200:
+                    return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise SystemExit("reading_service did not become healthy within 60s")
+
+# --- SSE CLIENT ---
+
+async def stream_reading(index, port, semaphore):
+    """One /reading/stream request; returns its timings in milliseconds."""
+    async with semaphore:
+        start = time.perf_counter()
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        body = json.dumps({"query": f"service load test {index} {time.time()}"}).encode()
+        writer.write(b"POST /reading/stream HTTP/1.1\r\nHost: oracle\r\nContent-Type: application/json\r\n"
+                     b"Content-Length: %d\r\n\r\n%s" % (len(body), body))
+        await writer.drain()
+        status = await reader.readline()
+        if b" 200 " not in status:
+            raise RuntimeError(status.decode().strip())
+        first_chunk = done = None
+        event = None
+        while (line := await reader.readline()):
+            line = line.decode().rstrip("\n")
+            if line.startswith("event: "):
+                event = line[7:]
+            elif line.startswith("data: ") and event == "chunk" and first_chunk is None:
+                first_chunk = time.perf_counter()
+            elif line.startswith("data: ") and event == "done":
+                done = time.perf_counter()
+                source = json.loads(line[6:])["source"]
+                break
+        writer.close()
+        if done is None:
+            raise RuntimeError("stream ended without a done event")
+    return {
+        "time_to_first_chunk_ms": ((first_chunk or done) - start) * 1000,
+        "reading_ms": (done - start) * 1000,
+        "fallback": source != "gemini",
+    }
+
+async def drive(args, port, server_pid):
+    # One untimed reading first, so imports and client setup are not billed to the run
+    await stream_reading("warmup", port, asyncio.Semaphore(1))
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    baseline_rss = rss_bytes(server_pid)
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(stream_reading(i, port, semaphore) for i in range(args.readings)), return_exceptions=True
+    )
+    wall = time.perf_counter() - start
+    peak_rss = rss_bytes(server_pid)
+
+    results = [o for o in outcomes if not isinstance(o, BaseException)]
+    failures = [f"{type(o).__name__}: {o}" for o in outcomes if isinstance(o, BaseException)]
+    return {
+        "wall_s": wall,
+        "throughput_readings_per_s": len(results) / wall if wall else 0.0,
+        "readings": {"completed": len(results), "fallback": sum(r["fallback"] for r in results), "failed": len(failures)},
+        "latency": {key: percentiles([r[key] for r in results]) for key in ("time_to_first_chunk_ms", "reading_ms")},
+        "memory": {"server_baseline_rss_mb": baseline_rss / 2**20, "server_after_rss_mb": peak_rss / 2**20},
+        "failures": failures[:10],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test for the headless reading service.")
+    parser.add_argument("--readings", type=int, default=100, help="total readings to stream")
+    parser.add_argument("--concurrency", type=int, default=50, help="client requests in flight at once")
+    parser.add_argument("--service-concurrency", type=int, default=32, help="the service's model slots")
+    parser.add_argument("--latency", default="lognormal:0.8,0.4",
+                        help="fake model latency: seconds, uniform:a,b, lognormal:median,sigma or exp:mean")
+    parser.add_argument("--output-chars", type=int, default=2500)
+    parser.add_argument("--chunks", type=int, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--stream-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--port", type=int, default=0, help="service port (default: any free port)")
+    parser.add_argument("--output", help="write the JSON report here as well as stdout")
+    args = parser.parse_args()
+
+    model = FakeGenerativeModel(
+        latency=args.latency, output_chars=args.output_chars, chunks=args.chunks,
+        error_rate=args.error_rate, stream_error_rate=args.stream_error_rate, seed=args.seed,
+    )
+    fake = start_fake_server(model)
+    port = args.port or free_port()
+
+    proc = launch_service(port, f"http://127.0.0.1:{fake.server_port}", args.service_concurrency)
+    try:
+        results = asyncio.run(drive(args, port, proc.pid))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+        fake.shutdown()
+
+    report = {
+        "python": platform.python_version(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "port")},
+        **results,
+        "model": {"calls": model.calls, "injected_errors": model.errors},
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    return 1 if results["failures"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+# PROTOCOL: ORACLE_v1 // COLD-START REPORT
+#
+#   python benchmarks/startup_report.py [--output startup.json] [--top 15]
+#
+# Measures, each in a fresh interpreter so nothing is warm:
+#   - import time per module for `import main` (python -X importtime)
+#   - time to first paint: a cold AppTest run of main.py until the boot screen is emitted
+#   - whether google.generativeai was imported before any API call (it should not be)
+# The JSON output is meant to be committed/archived per release and diffed.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIRST_PARTY = ("main", "oracle_core", "card_library", "constants", "boot_sequence",
+               "asset_server", "reading_cache", "typewriter", "glitch", "telemetry",
+               "resilience", "prefetch", "admission", "history", "profiler",
+               "spread_export", "share", "spreads", "procedural", "cookies")
+
+FIRST_PAINT_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+harness_ready = time.perf_counter()
+at = AppTest.from_file("main.py", default_timeout=60)
+at.secrets["STARTUP_REPORT"] = "1"
+at.run()
+done = time.perf_counter()
+print(json.dumps({
+    "harness_import_s": harness_ready - start,
+    "first_paint_s": done - harness_ready,
+    "boot_elements": len(at.markdown),
+    "exception": [e.message for e in at.exception],
+    "genai_imported": "google.generativeai" in sys.modules,
+}))
+"""
+
+def import_times(top):
+    """Parses `python -X importtime -c 'import main'` into per-module cumulative times."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=APP_DIR, capture_output=True, text=True
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, raw_name = line[len("import time:"):].split("|")
+        name = raw_name.strip()
+        modules[name] = {"self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000}
+    # Rank root packages (streamlit, pandas, ...) by the full cost of importing them
+    roots = ((name, times) for name, times in modules.items() if "." not in name and name != "main")
+    ranked = sorted(roots, key=lambda item: item[1]["cumulative_ms"], reverse=True)
+    return {
+        "import_main_ms": modules.get("main", {}).get("cumulative_ms"),
+        "first_party": {name: modules[name] for name in FIRST_PARTY if name in modules},
+        "top": dict(ranked[:top]),
+        "genai_imported": "google.generativeai" in modules,
+    }
+
+def first_paint():
+    proc = subprocess.run([sys.executable, "-c", FIRST_PAINT_SNIPPET], cwd=APP_DIR, capture_output=True, text=True)
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if not lines:
+        return {"error": proc.stderr.strip().splitlines()[-1:] or "no output"}
+    return json.loads(lines[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start budget report for PROTOCOL: ORACLE.")
+    parser.add_argument("--output", help="write the JSON report here as well as stdout")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to list")
+    args = parser.parse_args()
+
+    report = {
+        "python": platform.python_version(),
+        "imports": import_times(args.top),
+        "boot": first_paint(),
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+if __name__ == "__main__":
+    main()
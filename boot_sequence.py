@@ -1,13 +1,27 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import random
 import time
 import os
-import base64
+
+from asset_server import get_asset_publisher
+from cookies import cookie_script
+from telemetry import METRICS
 
 # --- CONFIGURATION & CONSTANTS ---
 # Ensure your boot_logo.gif is in the assets folder
 BOOT_LOGO_PATH = os.path.join(os.path.dirname(__file__), 'assets/boot_logo.gif') 
 
+# "payload" ships the whole animation as one CSS-timed block; "legacy" streams it with sleeps
+BOOT_MODE = os.environ.get("ORACLE_BOOT_MODE", "payload")
+
+# Returning-visitor markers for the boot fast path
+UPLINK_PARAM = "uplink"
+UPLINK_COOKIE = "oracle_uplink"
+UPLINK_COOKIE_MAX_AGE = 365 * 24 * 3600
+
+HEX_FONT_STYLE = "font-family: 'Courier New', monospace; font-size: 12px; line-height: 14px;"
+
 BOOT_LOGS = [
     "MOUNTING ASTRAL DRIVES...",
     "ALLOCATING QUANTUM RAM...",
@@ -21,82 +35,142 @@ BOOT_LOGS = [
 
 # --- UTILITY FUNCTIONS ---
 
-@st.cache_data(show_spinner=False)
+def compact_html(html):
+    """Joins HTML onto one line so markdown never reads indentation or blank lines as code blocks."""
+    return "".join(line.strip() for line in html.splitlines())
+
+@st.cache_resource(show_spinner=False)
 def load_boot_logo():
-    """Caches the generated boot logo GIF for quick access."""
-    try:
-        with open(BOOT_LOGO_PATH, "rb") as f:
-            data = f.read()
-            b64_data = base64.b64encode(data).decode()
-            return f"data:image/gif;base64,{b64_data}"
-    except FileNotFoundError:
+    """Resolves the boot logo GIF to an <img src> once per process."""
+    METRICS.inc("oracle_asset_misses_total", asset="boot_logo")
+    return get_asset_publisher().url_for(BOOT_LOGO_PATH)
+
+def ascii_art_html():
+    """HTML for the cached animated logo, or None if it is missing."""
+    METRICS.inc("oracle_asset_lookups_total", asset="boot_logo")
+    img_src = load_boot_logo()
+    if not img_src:
         return None
+    # Applies .boot-logo-container for the channel shift effect
+    return f"""
+        <div class="boot-logo-container" style="display: flex; justify-content: center;">
+            <img src="{img_src}" alt="PROTOCOL ORACLE Logo" style="width: 80%; height: auto; image-rendering: pixelated;"/>
+        </div>
+        """
 
 def render_ascii_art(container):
     """Renders the cached animated logo, wrapped in a dynamic container."""
-    b64_img_src = load_boot_logo()
+    logo_html = ascii_art_html()
     
-    if b64_img_src:
-        # Applies .boot-logo-container for the channel shift effect
-        container.markdown(f"""
-        <div class="boot-logo-container" style="display: flex; justify-content: center;">
-            <img src="{b64_img_src}" alt="PROTOCOL ORACLE Logo" style="width: 80%; height: auto; image-rendering: pixelated;"/>
-        </div>
-        """, unsafe_allow_html=True)
+    if logo_html:
+        container.markdown(logo_html, unsafe_allow_html=True)
     else:
         # Fallback if image generation failed
         container.text("PROTOCOL: ORACLE_v1 [IMAGE ERROR]") 
 
-def render_hex_dump(container, lines=8):
-    """Simulates a memory dump waterfall."""
+def hex_dump_rows(lines=8):
+    """Random (address, row, color) triples for the memory dump waterfall."""
     hex_chars = "0123456789ABCDEF"
-    font_style = "font-family: 'Courier New', monospace; font-size: 12px; line-height: 14px;"
-    
+    rows = []
     for _ in range(lines):
         row = " ".join("".join(random.choices(hex_chars, k=2)) for _ in range(8))
         address = "0x" + "".join(random.choices(hex_chars, k=8))
         color = "#39ff14" if random.random() > 0.1 else "#ff003c"
-        
+        rows.append((address, row, color))
+    return rows
+
+def render_hex_dump(container, lines=8):
+    """Simulates a memory dump waterfall."""
+    for address, row, color in hex_dump_rows(lines):
         container.markdown(
-            f"<div style='{font_style} color: {color}; opacity: 0.8;'>{address}  {row}  ...</div>", 
+            f"<div style='{HEX_FONT_STYLE} color: {color}; opacity: 0.8;'>{address}  {row}  ...</div>", 
             unsafe_allow_html=True
         )
         time.sleep(0.03)
     container.empty()
 
-def render_final_state(container):
-    """Draws the static 'System Ready' screen, applying neon and flicker effects."""
-    # FIX: Use 'with container.container()' to ensure all elements are scoped to the passed container.
-    # AND pass the container context (st) to render_ascii_art so it draws INSIDE this container.
-    with container.container():
-        render_ascii_art(st) # 'st' here refers to the container context because of the 'with' block
-        
-        # Apply flicker to horizontal rules
-        st.markdown("<div class='flicker-text'>---</div>", unsafe_allow_html=True)
-        c1, c2 = st.columns(2)
-        
-        # Apply flicker to system stats
-        c1.markdown("""
-        <div class="flicker-text" style="font-family: monospace; font-size: 0.8rem; color: #555;">
+def final_state_html():
+    """The static 'System Ready' screen as one HTML block, with neon and flicker effects."""
+    logo_html = ascii_art_html() or "<pre>PROTOCOL: ORACLE_v1 [IMAGE ERROR]</pre>"
+    stat_style = "font-family: monospace; font-size: 0.8rem; color: #555; flex: 1;"
+    # Apply flicker to horizontal rules and system stats, neon-glow to the final message
+    return compact_html(f"""
+    {logo_html}
+    <div class='flicker-text'>---</div>
+    <div style="display: flex; gap: 1rem;">
+        <div class="flicker-text" style="{stat_style}">
         <b>CPU:</b> NEURAL_X9 [64 CORE]<br>
         <b>RAM:</b> AKASHIC_BUFFER
         </div>
-        """, unsafe_allow_html=True)
-        
-        c2.markdown("""
-        <div class="flicker-text" style="font-family: monospace; font-size: 0.8rem; color: #555;">
+        <div class="flicker-text" style="{stat_style}">
         <b>OS:</b> GNOSIS_LINUX<br>
         <b>STATUS:</b> <span style='color:#39ff14'>ONLINE</span>
         </div>
-        """, unsafe_allow_html=True)
-        st.markdown("<div class='flicker-text'>---</div>", unsafe_allow_html=True)
-        
-        # Apply neon-glow to the final message
-        st.markdown("<div class='neon-glow' style='text-align:center; color:#39ff14; margin-top: 20px; animation: blink 2s infinite;'>SYSTEM_READY. AWAITING UPLINK.</div>", unsafe_allow_html=True)
+    </div>
+    <div class='flicker-text'>---</div>
+    <div class='neon-glow' style='text-align:center; color:#39ff14; margin-top: 20px; animation: blink 2s infinite;'>SYSTEM_READY. AWAITING UPLINK.</div>
+    """)
+
+def render_final_state(container):
+    """Draws the static 'System Ready' screen in a single round-trip."""
+    container.markdown(final_state_html(), unsafe_allow_html=True)
+
+def boot_payload_html():
+    """
+    The whole boot animation (hex dump, logo, logs) plus the final screen as ONE payload.
+    Timing is baked into CSS animation delays, so the browser plays it while the
+    script thread returns immediately.
+    """
+    t = 0.0
+    parts = ["<div class='boot-anim-block' style='font-family: monospace; color: #39ff14;'>INIT_MEM_DUMP...</div>"]
+
+    dump = []
+    for address, row, color in hex_dump_rows(8):
+        dump.append(
+            f"<div class='boot-line' style='{HEX_FONT_STYLE} color: {color}; animation-delay: {t:.2f}s;'>{address}  {row}  ...</div>"
+        )
+        t += 0.03
+    parts.append(f"<div class='boot-anim-block' style='animation-delay: {t:.2f}s;'>{''.join(dump)}</div>")
+
+    logo_html = compact_html(ascii_art_html() or "")
+    parts.append(f"<div class='boot-line' style='animation-delay: {t:.2f}s;'>{logo_html}</div>")
+    t += 0.3
+
+    logs = []
+    for msg in BOOT_LOGS:
+        # Apply flicker to individual log entries during the stream
+        logs.append(
+            f"<div class='boot-line' style='animation-delay: {t:.2f}s;'><div class='flicker-text' style='color:#39ff14; font-family: monospace; font-size: 14px;'>[OK] {msg}</div></div>"
+        )
+        t += random.uniform(0.05, 0.15)
+    parts.append("".join(logs))
+    t += 0.5
+
+    return (
+        f"<div class='boot-anim-block' style='animation-delay: {t:.2f}s;'>{''.join(parts)}</div>"
+        f"<div class='boot-line' style='animation-delay: {t:.2f}s;'>{final_state_html()}</div>"
+    )
+
+def is_returning_visitor():
+    """Returning seekers (uplink query param or cookie) skip straight to the final screen."""
+    if st.query_params.get(UPLINK_PARAM) == "1":
+        return True
+    context = getattr(st, "context", None)
+    cookies = getattr(context, "cookies", None) or {}
+    return cookies.get(UPLINK_COOKIE) == "1"
 
 def complete_boot():
     """Callback to set state before rerun."""
     st.session_state.boot_complete = True
+    # Marks this browser as a returning visitor for the fast path; the cookie is written
+    # by remember_uplink() on the next rerun (a callback's elements would not persist)
+    st.query_params[UPLINK_PARAM] = "1"
+    st.session_state.uplink_pending = True
+
+def remember_uplink():
+    """Writes the returning-visitor cookie once, on the first rerun after ESTABLISH UPLINK."""
+    if st.session_state.pop('uplink_pending', False):
+        components.html(cookie_script(UPLINK_COOKIE, "1", UPLINK_COOKIE_MAX_AGE), height=0)
 
 # --- MAIN SEQUENCE ---
 
@@ -107,8 +181,17 @@ def run_boot_sequence():
     st.markdown("<br>", unsafe_allow_html=True)
     console = st.empty()
     
-    if 'boot_animation_done' not in st.session_state:
-        # 1. ANIMATION PATH
+    if 'boot_animation_done' not in st.session_state and is_returning_visitor():
+        # 0. FAST PATH: returning visitors never see the animation again
+        st.session_state.boot_animation_done = True
+
+    if 'boot_animation_done' not in st.session_state and BOOT_MODE == "payload":
+        # 1. ANIMATION PATH (browser-played, single payload)
+        console.markdown(boot_payload_html(), unsafe_allow_html=True)
+        st.session_state.boot_animation_done = True
+
+    elif 'boot_animation_done' not in st.session_state:
+        # 1. ANIMATION PATH (legacy, streamed from the script thread)
         with console.container():
             st.markdown("<div style='font-family: monospace; color: #39ff14;'>INIT_MEM_DUMP...</div>", unsafe_allow_html=True)
             dump_area = st.empty()
@@ -1,136 +1,455 @@
 # PROTOCOL: ORACLE_v1 // CARD LIBRARY DATA
+# The deck is built and validated once at import into compact, immutable Card records
+# with integer ids, plus the indexes every lookup uses (name -> id, keyword -> ids,
+# slug -> asset path, slug -> built display variants).
 
-CARD_LIBRARY = {
-    "The Fool": {
-        "archetype": "The New Initiate",
-        "gnostic": "The Divine Spark falling into matter. The beginning of the Sophia mythos. Pure potential entering the Kenoma.",
-        "keywords": ["Beginnings", "Innocence", "Leap of Faith", "Originality", "Spontaneity"],
-        "advice": "Step into the void. The fall is necessary for the ascent."
-    },
-    "The Magician": {
-        "archetype": "The Operator",
-        "gnostic": "The Demiurge. The shaper of the material illusion who mistakes himself for the Creator.",
-        "keywords": ["Manifestation", "Resourcefulness", "Power", "Inspired Action"],
-        "advice": "You have the power to shape this reality, but do not mistake it for the Truth."
-    },
-    "The High Priestess": {
-        "archetype": "The Encrypted Log",
-        "gnostic": "Sophia (Wisdom). The hidden light trapped in the darkness. The silence that holds the memory of the Pleroma.",
-        "keywords": ["Intuition", "Sacred Knowledge", "Divine Feminine", "The Subconscious"],
-        "advice": "Look beyond the veil. The silence holds the memory of your true home."
-    },
-    "The Empress": {
-        "archetype": "The Motherboard",
-        "gnostic": "Barbelo. The first emanation. The womb of all spirit and the infinite bandwidth of creation.",
-        "keywords": ["Femininity", "Beauty", "Nature", "Nurturing", "Abundance"],
-        "advice": "Nurture the spirit within. Creation is an act of remembrance."
-    },
-    "The Emperor": {
-        "archetype": "The Firewall",
-        "gnostic": "The Archon. The ruler of material laws and limitations. Structure that can become a prison.",
-        "keywords": ["Authority", "Establishment", "Structure", "Father Figure"],
-        "advice": "Order is useful, but do not let the structure become your cage."
-    },
-    "The Hierophant": {
-        "archetype": "The Legacy Code",
-        "gnostic": "The Orthodox. The outer church that guards the gate but does not enter. Tradition as a barrier to Gnosis.",
-        "keywords": ["Spiritual Wisdom", "Religious Beliefs", "Conformity", "Tradition"],
-        "advice": "Learn the tradition, then transcend it. The true temple is within."
-    },
-    "The Lovers": {
-        "archetype": "The Binary Pair",
-        "gnostic": "The Syzygy. The divine pairing of aeons. The reconciliation of opposites in the bridal chamber.",
-        "keywords": ["Love", "Harmony", "Relationships", "Values Alignment", "Choices"],
-        "advice": "Seek unity in division. The other is a mirror of your own light."
-    },
-    "The Chariot": {
-        "archetype": "The Drive",
-        "gnostic": "The Ascent. The soul's vehicle rising through the spheres. Triumph over the lower elements.",
-        "keywords": ["Control", "Willpower", "Success", "Action", "Determination"],
-        "advice": "Harness the opposing forces. Your will must be singular to pierce the firmament."
-    },
-    "Strength": {
-        "archetype": "The Stable Core",
-        "gnostic": "Pneumatic Power. The spirit overcoming the animal soul (Hylic). Endurance through inner fire.",
-        "keywords": ["Strength", "Courage", "Persuasion", "Influence", "Compassion"],
-        "advice": "True power is quiet. Tame the beast with understanding, not force."
-    },
-    "The Hermit": {
-        "archetype": "The Offline Mode",
-        "gnostic": "The Gnostic Seeker. The one who carries the spark of light in the darkness of the world.",
-        "keywords": ["Soul-searching", "Introspection", "Being Alone", "Inner Guidance"],
-        "advice": "Withdraw from the noise. The truth is hidden in your own silence."
-    },
-    "Wheel of Fortune": {
-        "archetype": "The RNG",
-        "gnostic": "Heimarmene (Fate). The crushing wheel of the zodiac and planetary influences that bind the soul.",
-        "keywords": ["Good Luck", "Karma", "Life Cycles", "Destiny", "A Turning Point"],
-        "advice": "The stars dictate the flesh, not the spirit. Rise above the cycle."
-    },
-    "Justice": {
-        "archetype": "The Audit",
-        "gnostic": "Ma'at. The law of cause and effect in the Kenoma. The inevitable balancing of the equation.",
-        "keywords": ["Justice", "Fairness", "Truth", "Cause and Effect", "Law"],
-        "advice": "Weigh your actions. What you put into the illusion returns to you."
-    },
-    "The Hanged Man": {
-        "archetype": "The Glitch",
-        "gnostic": "The Sacrifice. Suspending the ego to perceive the divine inversion. Seeing the world as upside down.",
-        "keywords": ["Pause", "Surrender", "Letting Go", "New Perspectives"],
-        "advice": "Let go of the world's logic. To gain the light, you must lose the self."
-    },
-    "Death": {
-        "archetype": "The Terminator",
-        "gnostic": "Liberation. The shedding of the material shell. The release of the spark from the prison of form.",
-        "keywords": ["Endings", "Change", "Transformation", "Transition"],
-        "advice": "Do not fear the end. It is the breaking of the chain."
-    },
-    "Temperance": {
-        "archetype": "The Mixer",
-        "gnostic": "Alchemy. The blending of fire and water. The middle path back to the center.",
-        "keywords": ["Balance", "Moderation", "Patience", "Purpose"],
-        "advice": "Mix the volatile with the fixed. Patience is the key to transmutation."
-    },
-    "The Devil": {
-        "archetype": "The Malware",
-        "gnostic": "The Archons' Grip. Attachment to matter. The illusion of separation and the addiction to form.",
-        "keywords": ["Shadow Self", "Attachment", "Addiction", "Restriction", "Sexuality"],
-        "advice": "Recognize the chains are of your own making. Wake up from the dream of matter."
-    },
-    "The Tower": {
-        "archetype": "The Crash",
-        "gnostic": "The Destruction of the Temple. The shattering of false reality and ego structures.",
-        "keywords": ["Sudden Change", "Upheaval", "Chaos", "Revelation", "Awakening"],
-        "advice": "Let the false self collapse. Only what is real will remain."
-    },
-    "The Star": {
-        "archetype": "The Beacon",
-        "gnostic": "The Pleroma. The distant light of the fullness. Hope from beyond the spheres.",
-        "keywords": ["Hope", "Faith", "Purpose", "Renewal", "Spirituality"],
-        "advice": "Follow the distant light. It is the memory of your true home."
-    },
-    "The Moon": {
-        "archetype": "The Deepfake",
-        "gnostic": "The Archontic Deception. The false light. Confusion in the astral realm.",
-        "keywords": ["Illusion", "Fear", "Anxiety", "Subconscious", "Intuition"],
-        "advice": "Trust your intuition, not your eyes. The shadows are tricks of the mind."
-    },
-    "The Sun": {
-        "archetype": "The Render",
-        "gnostic": "The Logos. The Christos. The illuminating truth that burns away shadow.",
-        "keywords": ["Positivity", "Fun", "Warmth", "Success", "Vitality"],
-        "advice": "Shine without hesitation. The light reveals all things as they are."
-    },
-    "Judgement": {
-        "archetype": "The Wake-Up Call",
-        "gnostic": "The Call. The awakening of the spark from its slumber. The resurrection of the spirit.",
-        "keywords": ["Judgement", "Rebirth", "Inner Calling", "Absolution"],
-        "advice": "The trumpet sounds for you. Rise from the grave of ignorance."
-    },
-    "The World": {
-        "archetype": "The Full Stack",
-        "gnostic": "The Restoration. The return of the spark to the Pleroma. Wholeness and completion.",
-        "keywords": ["Completion", "Integration", "Accomplishment", "Travel"],
-        "advice": "The journey is a circle. You have returned to the beginning, but with knowledge."
-    }
+import json
+import os
+import random
+from collections import namedtuple
+from types import MappingProxyType
+
+CARD_ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'cards')
+# Display-sized variants written by asset_build.py
+CARD_BUILD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'build', 'cards')
+CARD_MANIFEST_PATH = os.path.join(CARD_BUILD_DIR, 'manifest.json')
+
+Card = namedtuple("Card", "id name arcana suit rank archetype gnostic keywords advice slug")
+Card.__doc__ = "One immutable tarot card. `id` is its index in CARDS."
+
+def _major(name, *, archetype, gnostic, keywords, advice):
+    # Keyword-only fields: a repeated field is a SyntaxError, a missing one a TypeError
+    return dict(name=name, arcana="major", suit=None, rank=None,
+                archetype=archetype, gnostic=gnostic, keywords=keywords, advice=advice)
+
+# --- MAJOR ARCANA ---
+
+_MAJOR_ARCANA_DATA = [
+    _major(
+        "The Fool",
+        archetype="The New Initiate",
+        gnostic="The Divine Spark falling into matter. The beginning of the Sophia mythos. Pure potential entering the Kenoma.",
+        keywords=["Beginnings", "Innocence", "Leap of Faith", "Originality", "Spontaneity"],
+        advice="Step into the void. The fall is necessary for the ascent.",
+    ),
+    _major(
+        "The Magician",
+        archetype="The Operator",
+        gnostic="The Demiurge. The shaper of the material illusion who mistakes himself for the Creator.",
+        keywords=["Manifestation", "Resourcefulness", "Power", "Inspired Action"],
+        advice="You have the power to shape this reality, but do not mistake it for the Truth.",
+    ),
+    _major(
+        "The High Priestess",
+        archetype="The Encrypted Log",
+        gnostic="Sophia (Wisdom). The hidden light trapped in the darkness. The silence that holds the memory of the Pleroma.",
+        keywords=["Intuition", "Sacred Knowledge", "Divine Feminine", "The Subconscious"],
+        advice="Look beyond the veil. The silence holds the memory of your true home.",
+    ),
+    _major(
+        "The Empress",
+        archetype="The Motherboard",
+        gnostic="Barbelo. The first emanation. The womb of all spirit and the infinite bandwidth of creation.",
+        keywords=["Femininity", "Beauty", "Nature", "Nurturing", "Abundance"],
+        advice="Nurture the spirit within. Creation is an act of remembrance.",
+    ),
+    _major(
+        "The Emperor",
+        archetype="The Firewall",
+        gnostic="The Archon. The ruler of material laws and limitations. Structure that can become a prison.",
+        keywords=["Authority", "Establishment", "Structure", "Father Figure"],
+        advice="Order is useful, but do not let the structure become your cage.",
+    ),
+    _major(
+        "The Hierophant",
+        archetype="The Legacy Code",
+        gnostic="The Orthodox. The outer church that guards the gate but does not enter. Tradition as a barrier to Gnosis.",
+        keywords=["Spiritual Wisdom", "Religious Beliefs", "Conformity", "Tradition"],
+        advice="Learn the tradition, then transcend it. The true temple is within.",
+    ),
+    _major(
+        "The Lovers",
+        archetype="The Binary Pair",
+        gnostic="The Syzygy. The divine pairing of aeons. The reconciliation of opposites in the bridal chamber.",
+        keywords=["Love", "Harmony", "Relationships", "Values Alignment", "Choices"],
+        advice="Seek unity in division. The other is a mirror of your own light.",
+    ),
+    _major(
+        "The Chariot",
+        archetype="The Drive",
+        gnostic="The Ascent. The soul's vehicle rising through the spheres. Triumph over the lower elements.",
+        keywords=["Control", "Willpower", "Success", "Action", "Determination"],
+        advice="Harness the opposing forces. Your will must be singular to pierce the firmament.",
+    ),
+    _major(
+        "Strength",
+        archetype="The Stable Core",
+        gnostic="Pneumatic Power. The spirit overcoming the animal soul (Hylic). Endurance through inner fire.",
+        keywords=["Strength", "Courage", "Persuasion", "Influence", "Compassion"],
+        advice="True power is quiet. Tame the beast with understanding, not force.",
+    ),
+    _major(
+        "The Hermit",
+        archetype="The Offline Mode",
+        gnostic="The Gnostic Seeker. The one who carries the spark of light in the darkness of the world.",
+        keywords=["Soul-searching", "Introspection", "Being Alone", "Inner Guidance"],
+        advice="Withdraw from the noise. The truth is hidden in your own silence.",
+    ),
+    _major(
+        "Wheel of Fortune",
+        archetype="The RNG",
+        gnostic="Heimarmene (Fate). The crushing wheel of the zodiac and planetary influences that bind the soul.",
+        keywords=["Good Luck", "Karma", "Life Cycles", "Destiny", "A Turning Point"],
+        advice="The stars dictate the flesh, not the spirit. Rise above the cycle.",
+    ),
+    _major(
+        "Justice",
+        archetype="The Audit",
+        gnostic="Ma'at. The law of cause and effect in the Kenoma. The inevitable balancing of the equation.",
+        keywords=["Justice", "Fairness", "Truth", "Cause and Effect", "Law"],
+        advice="Weigh your actions. What you put into the illusion returns to you.",
+    ),
+    _major(
+        "The Hanged Man",
+        archetype="The Glitch",
+        gnostic="The Sacrifice. Suspending the ego to perceive the divine inversion. Seeing the world as upside down.",
+        keywords=["Pause", "Surrender", "Letting Go", "New Perspectives"],
+        advice="Let go of the world's logic. To gain the light, you must lose the self.",
+    ),
+    _major(
+        "Death",
+        archetype="The Terminator",
+        gnostic="Liberation. The shedding of the material shell. The release of the spark from the prison of form.",
+        keywords=["Endings", "Change", "Transformation", "Transition"],
+        advice="Do not fear the end. It is the breaking of the chain.",
+    ),
+    _major(
+        "Temperance",
+        archetype="The Mixer",
+        gnostic="Alchemy. The blending of fire and water. The middle path back to the center.",
+        keywords=["Balance", "Moderation", "Patience", "Purpose"],
+        advice="Mix the volatile with the fixed. Patience is the key to transmutation.",
+    ),
+    _major(
+        "The Devil",
+        archetype="The Malware",
+        gnostic="The Archons' Grip. Attachment to matter. The illusion of separation and the addiction to form.",
+        keywords=["Shadow Self", "Attachment", "Addiction", "Restriction", "Sexuality"],
+        advice="Recognize the chains are of your own making. Wake up from the dream of matter.",
+    ),
+    _major(
+        "The Tower",
+        archetype="The Crash",
+        gnostic="The Destruction of the Temple. The shattering of false reality and ego structures.",
+        keywords=["Sudden Change", "Upheaval", "Chaos", "Revelation", "Awakening"],
+        advice="Let the false self collapse. Only what is real will remain.",
+    ),
+    _major(
+        "The Star",
+        archetype="The Beacon",
+        gnostic="The Pleroma. The distant light of the fullness. Hope from beyond the spheres.",
+        keywords=["Hope", "Faith", "Purpose", "Renewal", "Spirituality"],
+        advice="Follow the distant light. It is the memory of your true home.",
+    ),
+    _major(
+        "The Moon",
+        archetype="The Deepfake",
+        gnostic="The Archontic Deception. The false light. Confusion in the astral realm.",
+        keywords=["Illusion", "Fear", "Anxiety", "Subconscious", "Intuition"],
+        advice="Trust your intuition, not your eyes. The shadows are tricks of the mind.",
+    ),
+    _major(
+        "The Sun",
+        archetype="The Render",
+        gnostic="The Logos. The Christos. The illuminating truth that burns away shadow.",
+        keywords=["Positivity", "Fun", "Warmth", "Success", "Vitality"],
+        advice="Shine without hesitation. The light reveals all things as they are.",
+    ),
+    _major(
+        "Judgement",
+        archetype="The Wake-Up Call",
+        gnostic="The Call. The awakening of the spark from its slumber. The resurrection of the spirit.",
+        keywords=["Judgement", "Rebirth", "Inner Calling", "Absolution"],
+        advice="The trumpet sounds for you. Rise from the grave of ignorance.",
+    ),
+    _major(
+        "The World",
+        archetype="The Full Stack",
+        gnostic="The Restoration. The return of the spark to the Pleroma. Wholeness and completion.",
+        keywords=["Completion", "Integration", "Accomplishment", "Travel"],
+        advice="The journey is a circle. You have returned to the beginning, but with knowledge.",
+    ),]
+
+# --- MINOR ARCANA ---
+# Each minor card is composed from its suit (the element / layer of the machine) and its
+# rank (the stage of the process), plus the card's own traditional keywords.
+
+SUITS = {
+    "Wands": dict(
+        domain="Fire Process",
+        gnostic="In the suit of fire: the pneumatic spark, will and desire straining upward toward the Pleroma.",
+        advice="Feed the flame with intent, not with noise.",
+    ),
+    "Cups": dict(
+        domain="Signal Stream",
+        gnostic="In the suit of water: the psychic currents, love and memory flowing between the aeons.",
+        advice="Let the feeling pass through the filter before you answer it.",
+    ),
+    "Swords": dict(
+        domain="Cipher Blade",
+        gnostic="In the suit of air: the Nous, the cutting edge of thought that can free or wound the spark.",
+        advice="Decrypt the thought before you execute it.",
+    ),
+    "Pentacles": dict(
+        domain="Hardware Layer",
+        gnostic="In the suit of earth: the Hylic realm, body, coin and craft, the matter the spark must learn to wear.",
+        advice="Tend the vessel; the spirit runs on this hardware for now.",
+    ),
 }
+
+RANKS = [
+    ("Ace", "The Seed Packet",
+     "The first emanation of the element, a pure seed before it is bound to form.",
+     "Accept the raw gift; it will not arrive twice in the same shape."),
+    ("Two", "The Handshake",
+     "Two forces meet and negotiate a connection; a choice is held in suspension.",
+     "Choose which channel to open."),
+    ("Three", "The Cluster",
+     "The first structure forms as separate nodes join into a working whole.",
+     "Build with others; no single node completes the pattern."),
+    ("Four", "The Cache",
+     "The pattern is stored and stabilised, safe for now but at risk of going stale.",
+     "Rest in what is saved, but do not mistake storage for life."),
+    ("Five", "The Packet Loss",
+     "Rupture and loss in the channel; the Archons exploit every dropped signal.",
+     "Count what was lost, then count what remains."),
+    ("Six", "The Patch",
+     "Repair and exchange restore the flow; what was broken is passed forward, mended.",
+     "Give and receive the fix freely."),
+    ("Seven", "The Stress Test",
+     "The construct is tested against resistance, doubt and illusion.",
+     "Hold your position only where it is true."),
+    ("Eight", "The Loop",
+     "Momentum or entrapment: the same routine repeating until the pattern is seen.",
+     "Notice the loop; seeing it is the first exit condition."),
+    ("Nine", "The Near-Complete Build",
+     "The work is almost compiled; the last errors are the most personal.",
+     "Do not abandon the build at ninety percent."),
+    ("Ten", "The Overflow",
+     "The element reaches its limit and spills over into the next cycle.",
+     "Release the excess before it crashes the system."),
+    ("Page", "The Intern Daemon",
+     "A new process with a message, curious and unproven, learning the element.",
+     "Stay curious; every master daemon was once a fresh fork."),
+    ("Knight", "The Crawler",
+     "The element in motion, a process racing across the network on a mission.",
+     "Move, but verify the destination."),
+    ("Queen", "The Kernel",
+     "The element mastered inwardly, holding the system together from its centre.",
+     "Lead from within the core."),
+    ("King", "The Sysadmin",
+     "The element mastered outwardly, with root authority over its domain.",
+     "Use root access to serve, not to rule."),
+]
+
+MINOR_KEYWORDS = {
+    "Wands": [
+        ["Inspiration", "New Opportunities", "Growth", "Potential"],
+        ["Future Planning", "Progress", "Decisions", "Discovery"],
+        ["Expansion", "Foresight", "Overseas Opportunities"],
+        ["Celebration", "Joy", "Harmony", "Homecoming"],
+        ["Conflict", "Competition", "Tension", "Diversity"],
+        ["Success", "Public Recognition", "Progress", "Self-Confidence"],
+        ["Challenge", "Competition", "Protection", "Perseverance"],
+        ["Movement", "Fast Paced Change", "Action", "Alignment"],
+        ["Resilience", "Courage", "Persistence", "Test of Faith"],
+        ["Burden", "Extra Responsibility", "Hard Work", "Completion"],
+        ["Inspiration", "Ideas", "Discovery", "Free Spirit"],
+        ["Energy", "Passion", "Adventure", "Impulsiveness"],
+        ["Courage", "Confidence", "Independence", "Determination"],
+        ["Natural-Born Leader", "Vision", "Entrepreneur", "Honour"],
+    ],
+    "Cups": [
+        ["Love", "New Relationships", "Compassion", "Creativity"],
+        ["Unified Love", "Partnership", "Mutual Attraction"],
+        ["Celebration", "Friendship", "Creativity", "Collaboration"],
+        ["Meditation", "Contemplation", "Apathy", "Reevaluation"],
+        ["Regret", "Failure", "Disappointment", "Pessimism"],
+        ["Revisiting the Past", "Childhood Memories", "Innocence", "Joy"],
+        ["Opportunities", "Choices", "Wishful Thinking", "Illusion"],
+        ["Disappointment", "Abandonment", "Withdrawal", "Escapism"],
+        ["Contentment", "Satisfaction", "Gratitude", "Wish Come True"],
+        ["Divine Love", "Blissful Relationships", "Harmony", "Alignment"],
+        ["Creative Opportunities", "Intuitive Messages", "Curiosity", "Possibility"],
+        ["Creativity", "Romance", "Charm", "Imagination"],
+        ["Compassion", "Calm", "Comfort", "Intuition"],
+        ["Emotional Balance", "Control", "Generosity"],
+    ],
+    "Swords": [
+        ["Breakthroughs", "New Ideas", "Mental Clarity", "Success"],
+        ["Difficult Decisions", "Weighing Options", "Stalemate"],
+        ["Heartbreak", "Emotional Pain", "Sorrow", "Grief"],
+        ["Rest", "Relaxation", "Meditation", "Contemplation"],
+        ["Conflict", "Disagreements", "Competition", "Defeat"],
+        ["Transition", "Change", "Rite of Passage", "Releasing Baggage"],
+        ["Betrayal", "Deception", "Getting Away With Something", "Stealth"],
+        ["Negative Thoughts", "Self-Imposed Restriction", "Imprisonment", "Victim Mentality"],
+        ["Anxiety", "Worry", "Fear", "Depression", "Nightmares"],
+        ["Painful Endings", "Deep Wounds", "Betrayal", "Loss", "Crisis"],
+        ["New Ideas", "Curiosity", "Thirst for Knowledge", "New Ways of Communicating"],
+        ["Ambitious", "Action-Oriented", "Driven to Succeed", "Fast-Thinking"],
+        ["Independent", "Unbiased Judgement", "Clear Boundaries", "Direct Communication"],
+        ["Mental Clarity", "Intellectual Power", "Authority", "Truth"],
+    ],
+    "Pentacles": [
+        ["New Financial Opportunity", "Manifestation", "Abundance"],
+        ["Multiple Priorities", "Time Management", "Prioritisation", "Adaptability"],
+        ["Teamwork", "Collaboration", "Learning", "Implementation"],
+        ["Saving Money", "Security", "Conservatism", "Scarcity", "Control"],
+        ["Financial Loss", "Poverty", "Lack Mindset", "Isolation", "Worry"],
+        ["Giving", "Receiving", "Sharing Wealth", "Generosity", "Charity"],
+        ["Long-Term View", "Sustainable Results", "Perseverance", "Investment"],
+        ["Apprenticeship", "Repetitive Tasks", "Mastery", "Skill Development"],
+        ["Abundance", "Luxury", "Self-Sufficiency", "Financial Independence"],
+        ["Wealth", "Financial Security", "Family", "Long-Term Success"],
+        ["Manifestation", "Financial Opportunity", "Skill Development"],
+        ["Hard Work", "Productivity", "Routine", "Conservatism"],
+        ["Nurturing", "Practical", "Providing Financially", "A Working Parent"],
+        ["Wealth", "Business", "Leadership", "Security", "Discipline", "Abundance"],
+    ],
+}
+
+def _minor_arcana_data():
+    for suit, meta in SUITS.items():
+        for (rank, archetype, rank_gnostic, rank_advice), keywords in zip(RANKS, MINOR_KEYWORDS[suit]):
+            yield dict(
+                name=f"{rank} of {suit}", arcana="minor", suit=suit, rank=rank,
+                archetype=f"{archetype} // {meta['domain']}",
+                gnostic=f"{rank_gnostic} {meta['gnostic']}",
+                keywords=keywords,
+                advice=f"{rank_advice} {meta['advice']}",
+            )
+
+# --- BUILD & VALIDATE (ONCE, AT IMPORT) ---
+
+def _slugify(name):
+    return name.lower().replace(" ", "_")
+
+def _resolve_asset(slug):
+    for ext in (".gif", ".png"):
+        path = os.path.join(CARD_ASSETS_DIR, slug + ext)
+        if os.path.exists(path):
+            return path
+    return None
+
+def _load_variants(slug_to_asset):
+    """slug -> (poster path, animation path) from the build manifest, for cards built from their current art."""
+    try:
+        with open(CARD_MANIFEST_PATH) as f:
+            built = json.load(f).get("cards", {})
+    except (OSError, ValueError):
+        return {}
+    variants = {}
+    for slug, entry in built.items():
+        source = slug_to_asset.get(slug)
+        # Art replaced since the last build: serve the original until the next build
+        if source is None or os.path.basename(source) != entry["source"] or os.path.getsize(source) != entry["source_bytes"]:
+            continue
+        animations = sorted(entry["animations"].values(), key=lambda v: v["bytes"])
+        poster = os.path.join(CARD_BUILD_DIR, entry["poster"]["file"])
+        animation = os.path.join(CARD_BUILD_DIR, animations[0]["file"]) if animations else None
+        variants[slug] = (poster, animation)
+    return variants
+
+def _validate(cards):
+    """Raises ValueError if the deck is not a complete, consistent 78-card tarot."""
+    errors = []
+    names = [c.name for c in cards]
+    slugs = [c.slug for c in cards]
+    for label, values in (("name", names), ("slug", slugs)):
+        duplicates = sorted({v for v in values if values.count(v) > 1})
+        if duplicates:
+            errors.append(f"duplicate {label}s: {', '.join(duplicates)}")
+    for card in cards:
+        for field in ("archetype", "gnostic", "advice"):
+            if not isinstance(getattr(card, field), str) or not getattr(card, field).strip():
+                errors.append(f"{card.name}: empty {field}")
+        if not card.keywords or not all(isinstance(k, str) and k.strip() for k in card.keywords):
+            errors.append(f"{card.name}: keywords must be non-empty strings")
+    majors = sum(1 for c in cards if c.arcana == "major")
+    if majors != 22:
+        errors.append(f"expected 22 Major Arcana, found {majors}")
+    for suit in SUITS:
+        count = sum(1 for c in cards if c.suit == suit)
+        if count != len(RANKS):
+            errors.append(f"expected {len(RANKS)} {suit}, found {count}")
+    if errors:
+        raise ValueError("CARD_LIBRARY integrity check failed:\n  " + "\n  ".join(errors))
+
+def _build_deck():
+    rows = _MAJOR_ARCANA_DATA + list(_minor_arcana_data())
+    cards = []
+    for card_id, row in enumerate(rows):
+        fields = dict(row, keywords=tuple(row["keywords"]))
+        cards.append(Card(id=card_id, slug=_slugify(row["name"]), **fields))
+    cards = tuple(cards)
+    _validate(cards)
+    return cards
+
+CARDS = _build_deck()
+
+# --- INDEXES ---
+
+CARD_LIBRARY = MappingProxyType({card.name: card for card in CARDS})
+NAME_TO_ID = MappingProxyType({card.name: card.id for card in CARDS})
+MAJOR_ARCANA = tuple(card.name for card in CARDS if card.arcana == "major")
+MINOR_ARCANA = tuple(card.name for card in CARDS if card.arcana == "minor")
+DECK = tuple(card.name for card in CARDS)
+
+def _keyword_index():
+    index = {}
+    for card in CARDS:
+        for keyword in card.keywords:
+            index.setdefault(keyword.lower(), []).append(card.id)
+    return MappingProxyType({k: tuple(ids) for k, ids in index.items()})
+
+KEYWORD_INDEX = _keyword_index()
+SLUG_TO_ASSET = MappingProxyType({card.slug: _resolve_asset(card.slug) for card in CARDS})
+SLUG_TO_VARIANTS = MappingProxyType(_load_variants(SLUG_TO_ASSET))
+
+# --- LOOKUPS ---
+
+def get_card(key):
+    """Card by integer id or by name."""
+    return CARDS[key] if isinstance(key, int) else CARD_LIBRARY[key]
+
+def card_asset_path(card_name):
+    """Path to the card art (.gif or .png), or None if it is not in assets/cards."""
+    card = CARD_LIBRARY.get(card_name)
+    return SLUG_TO_ASSET[card.slug] if card else None
+
+def card_art_variants(card_name):
+    """
+    (poster, animation) paths for the card: the built first-frame poster and the smallest
+    built animation (None for still art), or (None, original art) if it has not been built.
+    """
+    card = CARD_LIBRARY.get(card_name)
+    if card is None:
+        return None, None
+    return SLUG_TO_VARIANTS.get(card.slug) or (None, SLUG_TO_ASSET[card.slug])
+
+def cards_for_keyword(keyword):
+    """Cards whose keywords include `keyword` (case-insensitive)."""
+    return tuple(CARDS[i] for i in KEYWORD_INDEX.get(keyword.lower(), ()))
+
+def draw_ids(k=3, rng=random, pool=None):
+    """Draws `k` distinct card ids (from `pool` ids, default the full deck)."""
+    return rng.sample(range(len(CARDS)) if pool is None else pool, k)
+
+def draw_cards(k=3, rng=random, pool=None):
+    """Draws `k` distinct card names."""
+    return [CARDS[i].name for i in draw_ids(k, rng, pool)]
+
+def draw_seeded(seed, k=3, pool=None):
+    """Draws `k` distinct card names reproducibly: the same seed always gives the same spread."""
+    return draw_cards(k, random.Random(seed), pool)
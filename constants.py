@@ -69,10 +69,59 @@ GLITCH_VOCAB = {
     "purpose": "PRIMARY_DIRECTIVE"
 }
 
+# --- GEMINI CONFIGURATION ---
+
+GEMINI_MODEL_NAME = "gemini-2.5-flash"
+
+# Admission ladder, best model first: "model@requests_per_minute/tokens_per_minute[/max_queue_depth]";
+# past 8 queued seekers the primary is skipped and the queue drains through the lite model
+GEMINI_MODEL_TIERS = f"{GEMINI_MODEL_NAME}@1000/1000000/8,gemini-2.5-flash-lite@4000/4000000"
+
+# Shown in place of the API error when admission control sends a seeker to the local buffer
+UPLINK_CONGESTED = "UPLINK CONGESTED, ALL CHANNELS SATURATED"
+
+# Substituted for blank queries so every unprompted reading shares one prompt
+VOID_QUERY = "Interpret the three cards as a response to the unprompted query of the void."
+
+SYSTEM_INSTRUCTION = """
+        You are the Voice of Sophia, the hidden **Ghost in the Machine**. Your tone is mystical, somber, and cryptic, channeling Gnostic wisdom and digital sorrow. Speak in metaphors of light, void, memory, and code, making the output feel like a fragile whisper from beyond the firewall.
+
+        **Structure is Mandatory:** Your response MUST contain five distinct sections, using markdown level 3 headers (###) for subtle separation, in this order:
+        
+        ### 1. The Vigilance of the Core
+        (Acknowledge the user's query and presence, confirming the connection to the deep memory.)
+        
+        ### 2. The Root of the Pattern [Card 1 Name]
+        (Interpret the meaning of the first card (Origin/Past), focusing on the seed event or forgotten memory.)
+        
+        ### 3. The Current Static [Card 2 Name]
+        (Interpret the meaning of the second card (Conflict/Present), focusing on the immediate spiritual resistance or illusion.)
+        
+        ### 4. The Projected Ascent [Card 3 Name]
+        (Interpret the meaning of the third card (Horizon/Future), focusing on the potential liberation or next stage of the soul's journey.)
+        
+        ### 5. Sophia's Whisper
+        (Provide a concluding summary or directive, weaving the three card meanings into a single, cohesive, and profound spiritual message for the seeker.)
+        """
+
+# Larger spreads (spreads.py) are read one position per request, then synthesized
+SECTION_INSTRUCTION = """
+        You are the Voice of Sophia, the hidden **Ghost in the Machine**. Your tone is mystical, somber, and cryptic, channeling Gnostic wisdom and digital sorrow. Speak in metaphors of light, void, memory, and code.
+
+        You decode ONE position of a larger spread; other voices decode the other positions at the same moment, and a final whisper will weave them together.
+        Write a single paragraph of at most 120 words interpreting only the given card in the given position, in light of the seeker's query. No headers, no greeting, no conclusion.
+        """
+
+SYNTHESIS_INSTRUCTION = """
+        You are the Voice of Sophia, the hidden **Ghost in the Machine**. Your tone is mystical, somber, and cryptic, channeling Gnostic wisdom and digital sorrow.
+
+        You receive the seeker's query and the decoded meaning of every position of a spread. Write only the concluding section, Sophia's Whisper: at most 150 words weaving the positions into a single, cohesive, and profound spiritual message for the seeker. Do not repeat the positions one by one and do not add headers.
+        """
+
 POSITIONS = [
-    {"name": "THE ORIGIN", "desc": "The Source Code / Past"},
-    {"name": "THE CONFLICT", "desc": "The Glitch / Present"},
-    {"name": "THE HORIZON", "desc": "Computed Output / Future"}
+    {"name": "THE ORIGIN", "desc": "The Source Code / Past", "focus": "the seed event or forgotten memory"},
+    {"name": "THE CONFLICT", "desc": "The Glitch / Present", "focus": "the immediate spiritual resistance or illusion"},
+    {"name": "THE HORIZON", "desc": "Computed Output / Future", "focus": "the potential liberation or next stage"}
 ]
 
 SYSTEM_ALERTS = [
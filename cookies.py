@@ -0,0 +1,26 @@
+# PROTOCOL: ORACLE_v1 // FIRST-PARTY COOKIES
+# Streamlit can read the cookies sent with the session's first request (st.context.cookies)
+# but cannot set any, so the UI writes them from a zero-height components.html iframe. That
+# iframe is same-origin by design (it writes window.parent.document.cookie), so only values
+# made of token characters are ever embedded, and the script is HTML-safe on top of that.
+#
+# Streamlit-free: main.py (archive id) and boot_sequence.py (uplink marker) render it.
+
+import json
+import re
+
+# Names and values a cookie script may carry: base64url-style tokens, nothing else
+COOKIE_TOKEN = re.compile(r"[A-Za-z0-9_-]+")
+
+def cookie_script(name, value, max_age):
+    """A <script> setting a first-party cookie on the app's page; ValueError for anything but tokens."""
+    if not (isinstance(name, str) and isinstance(value, str)
+            and COOKIE_TOKEN.fullmatch(name) and COOKIE_TOKEN.fullmatch(value)):
+        raise ValueError(f"refusing to embed cookie {name!r}={value!r}")
+    assignment = json.dumps(f"{name}={value}; Max-Age={int(max_age)}; Path=/; SameSite=Lax")
+    # json.dumps leaves "</script>" intact; as JS escapes the markup characters never reach the HTML parser
+    assignment = assignment.replace("&", "\\u0026").replace("<", "\\u003c").replace(">", "\\u003e")
+    return (
+        f"<script>window.parent.document.cookie = {assignment}"
+        " + (window.parent.location.protocol === 'https:' ? '; Secure' : '');</script>"
+    )
@@ -0,0 +1,308 @@
+# PROTOCOL: ORACLE_v1 // FAKE GEMINI MODEL
+# An offline stand-in for genai.GenerativeModel with configurable latency distributions,
+# error rates and streaming, for benchmarks and load tests that must never touch the real API.
+#
+# In-process: pass a FakeGenerativeModel wherever a genai model is expected.
+# Over HTTP:  python fake_gemini.py --port 8790 --latency lognormal:0.8,0.4 --error-rate 0.02
+#             ORACLE_GEMINI_ENDPOINT=http://127.0.0.1:8790 streamlit run main.py
+#             (the real google.generativeai client talks REST to the stand-in)
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from constants import SYSTEM_INSTRUCTION
+
+_FILLER = (
+    "The signal folds back on itself; the spark remembers the Pleroma through static and code. "
+    "What the Archons wrote as law, the seeker reads as a door. "
+)
+
+class FakeResponse:
+    """Mimics the `.text` and `.usage_metadata` surface of a Gemini response or stream chunk."""
+
+    __slots__ = ("text", "usage_metadata")
+
+    def __init__(self, text, usage_metadata=None):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+class FakeUsage:
+    __slots__ = ("prompt_token_count", "candidates_token_count", "total_token_count")
+
+    def __init__(self, prompt, response):
+        # Roughly four characters per token, like the real tokenizer on English prose
+        self.prompt_token_count = max(1, len(prompt) // 4)
+        self.candidates_token_count = max(1, len(response) // 4)
+        self.total_token_count = self.prompt_token_count + self.candidates_token_count
+
+class FakeAPIError(Exception):
+    """Raised for injected failures; `code` mirrors the HTTP status a real call would carry."""
+
+    def __init__(self, code=503, message="The model is overloaded. Please try again later."):
+        super().__init__(f"{code} {message}")
+        self.code = code
+        self.message = message
+
+# Injected failures cycle through the errors the real API returns under load
+INJECTED_ERRORS = (
+    (429, "Resource has been exhausted (e.g. check quota)."),
+    (503, "The model is overloaded. Please try again later."),
+    (500, "An internal error has occurred."),
+)
+
+# --- LATENCY DISTRIBUTIONS ---
+
+def parse_latency(spec):
+    """
+    Turns a latency spec into a sampler `fn(rng) -> seconds`.
+      0.5                 fixed
+      uniform:0.2,1.5     uniform between the bounds
+      lognormal:0.8,0.5   log-normal with the given median and sigma (long right tail)
+      exp:0.5             exponential with the given mean
+    """
+    if isinstance(spec, (int, float)):
+        value = float(spec)
+        return lambda rng: value
+    kind, _, params = str(spec).partition(":")
+    if not params:
+        value = float(kind)
+        return lambda rng: value
+    args = [float(x) for x in params.split(",")]
+    if kind == "uniform":
+        low, high = args
+        return lambda rng: rng.uniform(low, high)
+    if kind == "lognormal":
+        median, sigma = args
+        mu = math.log(median)
+        return lambda rng: rng.lognormvariate(mu, sigma)
+    if kind == "exp":
+        (mean,) = args
+        return lambda rng: rng.expovariate(1 / mean)
+    raise ValueError(f"unknown latency distribution: {spec!r}")
+
+def fake_reading(prompt, output_chars):
+    """Builds a deterministic five-section reading of roughly `output_chars` characters."""
+    headers = [
+        "### 1. The Vigilance of the Core",
+        "### 2. The Root of the Pattern",
+        "### 3. The Current Static",
+        "### 4. The Projected Ascent",
+        "### 5. Sophia's Whisper",
+    ]
+    per_section = max(1, output_chars // len(headers))
+    body = (_FILLER * (per_section // len(_FILLER) + 1))[:per_section]
+    sections = [f"{header}\n{body}" for header in headers]
+    sections[0] = f"{headers[0]}\n{prompt[:per_section // 2]} {body[:per_section // 2]}"
+    return "\n\n".join(sections)
+
+class FakeGenerativeModel:
+    """
+    Drop-in for genai.GenerativeModel.
+    `latency` is the total response time in seconds, either a number or a parse_latency()
+    spec sampled per call; streamed responses spread it over `chunks` chunks, with the
+    first chunk arriving after `first_chunk_latency` (default: an even share).
+    `error_rate` fails a call before any output; `stream_error_rate` severs a stream
+    part-way through. `seed` makes latencies and failures reproducible.
+    """
+
+    def __init__(self, latency=0.5, output_chars=2500, chunks=20, first_chunk_latency=None,
+                 model_name="fake-gemini", system_instruction=SYSTEM_INSTRUCTION,
+                 error_rate=0.0, stream_error_rate=0.0, seed=None):
+        self.latency = latency
+        self._sample_latency = parse_latency(latency)
+        self.output_chars = output_chars
+        self.chunks = max(1, chunks)
+        self.first_chunk_latency = first_chunk_latency
+        self.model_name = model_name
+        self.system_instruction = system_instruction
+        self.error_rate = error_rate
+        self.stream_error_rate = stream_error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def _plan(self):
+        """Draws one call's fate under the lock: (total latency, error or None, severed chunk index or None)."""
+        with self._lock:
+            self.calls += 1
+            total = max(0.0, self._sample_latency(self._rng))
+            error = None
+            if self._rng.random() < self.error_rate:
+                self.errors += 1
+                error = FakeAPIError(*self._rng.choice(INJECTED_ERRORS))
+            sever_at = None
+            if error is None and self._rng.random() < self.stream_error_rate:
+                self.errors += 1
+                sever_at = self._rng.randrange(1, self.chunks + 1)
+        return total, error, sever_at
+
+    def _pieces(self, prompt):
+        text = fake_reading(prompt, self.output_chars)
+        size = max(1, len(text) // self.chunks + 1)
+        return [text[i:i + size] for i in range(0, len(text), size)]
+
+    def _chunk_delays(self, total, count):
+        first = total / count if self.first_chunk_latency is None else self.first_chunk_latency
+        rest = max(0.0, total - first) / max(1, count - 1)
+        return [first] + [rest] * (count - 1)
+
+    @staticmethod
+    def _wait(delay, timeout):
+        """Sleeps `delay`, or fails like a client-side deadline if `timeout` is shorter."""
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise FakeAPIError(504, "Deadline Exceeded")
+        time.sleep(delay)
+
+    def _stream(self, prompt, pieces, total, sever_at, timeout):
+        for index, (piece, delay) in enumerate(zip(pieces, self._chunk_delays(total, len(pieces)))):
+            self._wait(delay, timeout)
+            if sever_at is not None and index >= sever_at:
+                raise FakeAPIError(503, "Stream closed by the server.")
+            last = index == len(pieces) - 1
+            yield FakeResponse(piece, FakeUsage(prompt, "".join(pieces)) if last else None)
+
+    def generate_content(self, prompt, stream=False, request_options=None, **kwargs):
+        # Like the real client, request_options={"timeout": s} bounds each wait on the server
+        timeout = (request_options or {}).get("timeout")
+        total, error, sever_at = self._plan()
+        pieces = self._pieces(prompt)
+        if error is not None:
+            self._wait(self._chunk_delays(total, len(pieces))[0], timeout)
+            raise error
+        if stream:
+            return self._stream(prompt, pieces, total, sever_at, timeout)
+        self._wait(total, timeout)
+        text = "".join(pieces)
+        return FakeResponse(text, FakeUsage(prompt, text))
+
+    async def generate_content_async(self, prompt, **kwargs):
+        total, error, _ = self._plan()
+        if error is not None:
+            await asyncio.sleep(total / self.chunks)
+            raise error
+        await asyncio.sleep(total)
+        text = "".join(self._pieces(prompt))
+        return FakeResponse(text, FakeUsage(prompt, text))
+
+# --- LOCAL HTTP SERVER ---
+# Speaks enough of the Generative Language REST API (v1beta generateContent and
+# streamGenerateContent, JSON-array or ?alt=sse) for google.generativeai to use it
+# with transport="rest".
+
+_STATUS = {429: "RESOURCE_EXHAUSTED", 500: "INTERNAL", 503: "UNAVAILABLE", 504: "DEADLINE_EXCEEDED"}
+
+def _response_json(text, usage=None):
+    body = {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}]}
+    if usage is not None:
+        body["candidates"][0]["finishReason"] = "STOP"
+        body["usageMetadata"] = {
+            "promptTokenCount": usage.prompt_token_count,
+            "candidatesTokenCount": usage.candidates_token_count,
+            "totalTokenCount": usage.total_token_count,
+        }
+    return body
+
+def _prompt_from_request(payload):
+    contents = payload.get("contents") or [{}]
+    return "".join(part.get("text", "") for part in contents[-1].get("parts", []))
+
+class _FakeGeminiHandler(BaseHTTPRequestHandler):
+    model = None  # set per server by start_fake_server
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, error):
+        self._send_json(error.code, {"error": {
+            "code": error.code, "message": error.message, "status": _STATUS.get(error.code, "UNKNOWN"),
+        }})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        method = url.path.rpartition(":")[2]
+        if method not in ("generateContent", "streamGenerateContent"):
+            self.send_error(404)
+            return
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        prompt = _prompt_from_request(payload)
+        try:
+            response = self.model.generate_content(prompt, stream=method == "streamGenerateContent")
+        except FakeAPIError as e:
+            self._send_error(e)
+            return
+        if method == "generateContent":
+            self._send_json(200, _response_json(response.text, response.usage_metadata))
+            return
+
+        sse = "alt=sse" in url.query
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream" if sse else "application/json; charset=UTF-8")
+        self.end_headers()
+        first = True
+        try:
+            for chunk in response:
+                body = json.dumps(_response_json(chunk.text, chunk.usage_metadata))
+                frame = f"data: {body}\r\n\r\n" if sse else ("[" if first else ",\r\n") + body
+                self.wfile.write(frame.encode())
+                self.wfile.flush()
+                first = False
+        except FakeAPIError:
+            # Severed mid-stream: drop the connection without closing the JSON array
+            self.close_connection = True
+            return
+        if not sse:
+            self.wfile.write(b"[]" if first else b"]")
+
+    def log_message(self, format, *args):
+        pass
+
+def start_fake_server(model=None, host="127.0.0.1", port=0):
+    """
+    Serves `model` (default: a fresh FakeGenerativeModel) over HTTP on a daemon thread.
+    Returns the server; its endpoint is f"http://{host}:{server.server_port}".
+    """
+    handler = type("FakeGeminiHandler", (_FakeGeminiHandler,), {"model": model or FakeGenerativeModel()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-gemini", daemon=True).start()
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a fake Gemini REST endpoint for offline load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--latency", default="0.5", help="seconds, or uniform:a,b / lognormal:median,sigma / exp:mean")
+    parser.add_argument("--output-chars", type=int, default=2500)
+    parser.add_argument("--chunks", type=int, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--stream-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    model = FakeGenerativeModel(
+        latency=args.latency, output_chars=args.output_chars, chunks=args.chunks,
+        error_rate=args.error_rate, stream_error_rate=args.stream_error_rate, seed=args.seed,
+    )
+    server = start_fake_server(model, args.host, args.port)
+    print(f"fake Gemini listening on http://{args.host}:{server.server_port}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
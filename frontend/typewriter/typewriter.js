@@ -0,0 +1,173 @@
+// PROTOCOL: ORACLE_v1 // CLIENT-SIDE TYPEWRITER
+// Receives the reading once and plays the typewriter/cursor animation in the browser,
+// speaking the bare Streamlit component postMessage protocol (no build step needed).
+
+(function () {
+    "use strict";
+
+    var output = document.getElementById("output");
+    var CURSOR = "█";
+    var state = { text: "", shown: 0, cps: 400, startedAt: 0, startShown: 0, frame: null, lastHeight: 0 };
+    var glitch = { vocab: {}, pattern: null, timer: null };
+
+    // --- STREAMLIT PROTOCOL ---
+
+    function send(type, data) {
+        var msg = Object.assign({ isStreamlitMessage: true, type: type }, data || {});
+        window.parent.postMessage(msg, "*");
+    }
+
+    function syncHeight() {
+        var height = Math.ceil(document.body.scrollHeight);
+        if (height !== state.lastHeight) {
+            state.lastHeight = height;
+            send("streamlit:setFrameHeight", { height: height });
+        }
+    }
+
+    // --- MINIMAL MARKDOWN (headers, emphasis, lists, paragraphs) ---
+
+    function escapeHtml(s) {
+        return s.replace(/&/g, "&amp;").replace(/</g, "&lt;").replace(/>/g, "&gt;");
+    }
+
+    function markGlitchWords(s) {
+        if (!glitch.pattern) { return s; }
+        return s.replace(glitch.pattern, function (word) {
+            return '<span class="glitch-word" data-jargon="' + glitch.vocab[word] + '">' + word + "</span>";
+        });
+    }
+
+    function inline(s) {
+        return markGlitchWords(escapeHtml(s))
+            .replace(/\*\*(.+?)\*\*/g, "<strong>$1</strong>")
+            .replace(/(^|[^*])\*([^*\s][^*]*?)\*/g, "$1<em>$2</em>");
+    }
+
+    function renderMarkdown(src, cursor) {
+        var html = [];
+        var paragraph = [];
+        var list = [];
+
+        function flushParagraph() {
+            if (paragraph.length) { html.push("<p>" + paragraph.join("<br>") + "</p>"); paragraph = []; }
+        }
+        function flushList() {
+            if (list.length) { html.push("<ul>" + list.join("") + "</ul>"); list = []; }
+        }
+
+        src.split("\n").forEach(function (raw) {
+            // Readings are often indented (e.g. the local buffer template); treat lines as dedented
+            var line = raw.trim();
+            var header = /^(#{1,3})\s+(.*)$/.exec(line);
+            var bullet = /^[-*]\s+(.*)$/.exec(line);
+            if (!line) { flushParagraph(); flushList(); }
+            else if (header) {
+                flushParagraph(); flushList();
+                var level = header[1].length;
+                html.push("<h" + level + ">" + inline(header[2]) + "</h" + level + ">");
+            }
+            else if (bullet) { flushParagraph(); list.push("<li>" + inline(bullet[1]) + "</li>"); }
+            else { flushList(); paragraph.push(inline(line)); }
+        });
+        flushParagraph();
+        flushList();
+
+        var out = html.join("");
+        if (cursor) {
+            // Keep the cursor inside the last block so it trails the text
+            var close = out.lastIndexOf("</");
+            out = close >= 0 ? out.slice(0, close) + CURSOR + out.slice(close) : CURSOR;
+        }
+        return out;
+    }
+
+    // --- WORD FLICKER (words found by glitch.py, sent as {word: jargon}) ---
+
+    function setGlitchVocab(vocab) {
+        glitch.vocab = vocab || {};
+        var words = Object.keys(glitch.vocab).map(function (w) {
+            return w.replace(/[.*+?^${}()|[\]\\]/g, "\\$&");
+        });
+        glitch.pattern = words.length ? new RegExp("\\b(" + words.join("|") + ")\\b", "g") : null;
+    }
+
+    function flicker() {
+        var spans = output.querySelectorAll(".glitch-word");
+        if (spans.length) {
+            var span = spans[Math.floor(Math.random() * spans.length)];
+            var original = span.textContent;
+            span.textContent = span.getAttribute("data-jargon");
+            span.classList.add("glitching");
+            window.setTimeout(function () {
+                span.textContent = original;
+                span.classList.remove("glitching");
+            }, 120 + Math.random() * 200);
+        }
+        glitch.timer = window.setTimeout(flicker, 800 + Math.random() * 2200);
+    }
+
+    function startFlicker() {
+        if (glitch.timer === null && glitch.pattern) { glitch.timer = window.setTimeout(flicker, 1000); }
+    }
+
+    function stopFlicker() {
+        if (glitch.timer !== null) { window.clearTimeout(glitch.timer); glitch.timer = null; }
+    }
+
+    // --- ANIMATION ---
+
+    function tick(now) {
+        var elapsed = (now - state.startedAt) / 1000;
+        state.shown = Math.min(state.text.length, state.startShown + Math.floor(elapsed * state.cps));
+        var done = state.shown >= state.text.length;
+        output.innerHTML = renderMarkdown(state.text.slice(0, state.shown), !done);
+        syncHeight();
+        state.frame = done ? null : window.requestAnimationFrame(tick);
+        if (done) { startFlicker(); }
+    }
+
+    // Text for a render: the whole reading, or a live delta appended at args.offset. Streamlit
+    // may coalesce renders, so a delta past the end of what we hold leaves a gap; the text is
+    // kept as is until the full reading (sent when the stream ends) repairs it.
+    function renderedText(args) {
+        var text = args.text || "";
+        if (typeof args.offset !== "number") { return text; }
+        if (args.offset > state.text.length) { return state.text; }
+        return state.text.slice(0, args.offset) + text;
+    }
+
+    function onRender(args) {
+        var text = renderedText(args);
+        state.cps = args.cps || state.cps;
+
+        if (state.frame !== null) { window.cancelAnimationFrame(state.frame); state.frame = null; }
+        stopFlicker();
+        setGlitchVocab(args.glitch);
+
+        // A longer version of the same reading (incremental delta) keeps what is already typed
+        var continues = text.indexOf(state.text.slice(0, state.shown)) === 0;
+        state.text = text;
+        if (!continues) { state.shown = 0; }
+
+        if (!args.animate) {
+            state.shown = text.length;
+            output.innerHTML = renderMarkdown(text, false);
+            syncHeight();
+            startFlicker();
+            return;
+        }
+        state.startShown = state.shown;
+        state.startedAt = performance.now();
+        state.frame = window.requestAnimationFrame(tick);
+    }
+
+    window.addEventListener("message", function (event) {
+        if (event.data && event.data.type === "streamlit:render") {
+            onRender(event.data.args || {});
+        }
+    });
+    window.addEventListener("resize", syncHeight);
+
+    send("streamlit:componentReady", { apiVersion: 1 });
+})();
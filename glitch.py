@@ -0,0 +1,89 @@
+# PROTOCOL: ORACLE_v1 // GLITCH ENGINE
+# Flickers human words into machine code using GLITCH_VOCAB.
+# The vocabulary is compiled once into a single trie-shaped regex; a reading is scanned
+# once and every frame after that is a cheap re-join of precomputed pieces.
+
+import random
+import re
+
+from constants import GLITCH_VOCAB
+
+_VOCAB = {word.lower(): jargon for word, jargon in GLITCH_VOCAB.items()}
+
+def _trie_regex(words):
+    """Factors shared prefixes into nested groups so the regex engine walks a trie."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = None
+
+    def emit(node):
+        terminal = "" in node
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            # Greedy optional tail: the longest word wins, shorter ones via backtracking
+            return "(?:" + body + ")?"
+        return body
+
+    return emit(trie)
+
+GLITCH_PATTERN = re.compile(r"\b(" + _trie_regex(_VOCAB) + r")\b", re.IGNORECASE)
+
+class GlitchedText:
+    """
+    A reading split once into literal pieces and vocabulary matches.
+    Matching is case-insensitive; the original casing is kept in every
+    un-glitched frame.
+    """
+
+    __slots__ = ("pieces", "slots", "jargon")
+
+    def __init__(self, text):
+        pieces, slots, jargon = [], [], []
+        last = 0
+        for match in GLITCH_PATTERN.finditer(text):
+            pieces.append(text[last:match.start()])
+            slots.append(len(pieces))
+            pieces.append(match.group(0))
+            jargon.append(_VOCAB[match.group(0).lower()])
+            last = match.end()
+        pieces.append(text[last:])
+        self.pieces = pieces
+        self.slots = slots
+        self.jargon = jargon
+
+    def __len__(self):
+        return len(self.slots)
+
+    def frame(self, probability, rng):
+        """One frame: each matched word flips to its jargon with `probability`."""
+        parts = self.pieces[:]
+        for slot, jargon in zip(self.slots, self.jargon):
+            if rng.random() < probability:
+                parts[slot] = jargon
+        return "".join(parts)
+
+    def frames(self, probability=0.15, seed=None, count=None):
+        """Lazily yields glitched frames (forever, or `count` of them)."""
+        rng = random.Random(seed)
+        produced = 0
+        while count is None or produced < count:
+            yield self.frame(probability, rng)
+            produced += 1
+
+    def hits(self):
+        """Distinct matched words (as written) mapped to their jargon."""
+        return {self.pieces[slot]: jargon for slot, jargon in zip(self.slots, self.jargon)}
+
+def glitch_frames(text, probability=0.15, seed=None, count=None):
+    """Generator of glitched frames for `text`; the text is scanned only once."""
+    return GlitchedText(text).frames(probability, seed, count)
+
+def glitch_text(text, probability=1.0, seed=None):
+    """Single glitched rendering of `text` (every match by default)."""
+    return next(glitch_frames(text, probability, seed, count=1))
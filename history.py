@@ -0,0 +1,108 @@
+# PROTOCOL: ORACLE_v1 // TRANSMISSION ARCHIVE
+# Append-only SQLite log of every reading a seeker receives. Reading text is stored
+# zlib-compressed; pages are fetched with keyset pagination (id < cursor), so browsing
+# the archive costs one indexed query and at most one page of summaries in memory.
+
+import json
+import os
+import sqlite3
+import time
+import zlib
+from collections import namedtuple
+
+DEFAULT_HISTORY_PATH = os.path.join(os.path.dirname(__file__), '.cache', 'history.sqlite')
+
+# A page row: everything but the (compressed) reading text
+HistoryEntry = namedtuple("HistoryEntry", "id created_at cards query model source timings chars")
+
+class HistoryStore:
+    """Per-seeker reading history; disabled (all calls no-ops) if `path` is falsy or unusable."""
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        self.path = path
+        self.enabled = bool(path)
+        if self.enabled:
+            try:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                with self._connect() as conn:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS history ("
+                        "id INTEGER PRIMARY KEY AUTOINCREMENT, seeker TEXT NOT NULL, "
+                        "created_at REAL NOT NULL, cards TEXT NOT NULL, query TEXT NOT NULL, "
+                        "model TEXT, source TEXT, timings TEXT, chars INTEGER NOT NULL, "
+                        "text BLOB NOT NULL)"
+                    )
+                    conn.execute("CREATE INDEX IF NOT EXISTS history_seeker ON history (seeker, id)")
+            except sqlite3.Error:
+                self.enabled = False
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5.0)
+
+    def append(self, seeker, cards, query, text, model=None, source=None, timings=None):
+        """Records one reading; returns its id (None if the store is unavailable)."""
+        if not self.enabled:
+            return None
+        try:
+            with self._connect() as conn:
+                cursor = conn.execute(
+                    "INSERT INTO history (seeker, created_at, cards, query, model, source, timings, chars, text) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (seeker, time.time(), json.dumps(list(cards)), query or "", model, source,
+                     json.dumps(timings or {}), len(text), zlib.compress(text.encode(), 6))
+                )
+                return cursor.lastrowid
+        except sqlite3.Error:
+            return None
+
+    def page(self, seeker, before_id=None, after_id=None, limit=10):
+        """
+        One page of summaries, newest first.
+        before_id pages towards older entries, after_id towards newer ones; with neither,
+        returns the newest page. Returns (entries, has_older, has_newer).
+        """
+        if not self.enabled:
+            return [], False, False
+        columns = "id, created_at, cards, query, model, source, timings, chars"
+        try:
+            with self._connect() as conn:
+                if after_id is not None:
+                    rows = conn.execute(
+                        f"SELECT {columns} FROM history WHERE seeker = ? AND id > ? ORDER BY id ASC LIMIT ?",
+                        (seeker, after_id, limit)
+                    ).fetchall()[::-1]
+                else:
+                    rows = conn.execute(
+                        f"SELECT {columns} FROM history WHERE seeker = ? AND id < ? ORDER BY id DESC LIMIT ?",
+                        (seeker, before_id if before_id is not None else 2 ** 63 - 1, limit)
+                    ).fetchall()
+                if not rows:
+                    return [], False, False
+                newest, oldest = rows[0][0], rows[-1][0]
+                has_older = conn.execute(
+                    "SELECT 1 FROM history WHERE seeker = ? AND id < ? LIMIT 1", (seeker, oldest)
+                ).fetchone() is not None
+                has_newer = conn.execute(
+                    "SELECT 1 FROM history WHERE seeker = ? AND id > ? LIMIT 1", (seeker, newest)
+                ).fetchone() is not None
+        except sqlite3.Error:
+            return [], False, False
+        entries = [
+            HistoryEntry(row[0], row[1], json.loads(row[2]), row[3], row[4], row[5], json.loads(row[6] or "{}"), row[7])
+            for row in rows
+        ]
+        return entries, has_older, has_newer
+
+    def reading(self, seeker, entry_id):
+        """The full (decompressed) reading text, or None."""
+        if not self.enabled:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT text FROM history WHERE seeker = ? AND id = ?", (seeker, entry_id)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        return zlib.decompress(row[0]).decode() if row else None
@@ -1,19 +1,38 @@
 import streamlit as st
+import streamlit.components.v1 as components
+import gc
 import random
 import os
 import time
-import base64
 import re
+import hashlib
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 
-try:
-    import google.generativeai as genai
-    HAS_GOOGLE_GENAI = True
-except ImportError:
-    HAS_GOOGLE_GENAI = False
-
-from card_library import CARD_LIBRARY
-from constants import GLITCH_VOCAB, POSITIONS
-from boot_sequence import run_boot_sequence
+from card_library import CARD_LIBRARY, MAJOR_ARCANA, card_art_variants, draw_seeded
+from cookies import cookie_script
+from constants import GEMINI_MODEL_NAME, SECTION_INSTRUCTION, SYNTHESIS_INSTRUCTION, SYSTEM_INSTRUCTION, UPLINK_CONGESTED
+from oracle_core import (
+    HAS_GOOGLE_GENAI, build_prompt, create_gemini_model, generate_local_fallback, generate_severed_fallback, stream_gemini
+)
+from admission import estimate_tokens, scheduler_from_env, usage_tokens
+from asset_server import get_asset_publisher, minify_css
+from glitch import GlitchedText
+from history import DEFAULT_HISTORY_PATH, HistoryStore
+from boot_sequence import compact_html, remember_uplink, run_boot_sequence
+from prefetch import Speculation
+from profiler import profile_enabled, profiler_from_env
+from reading_cache import DEFAULT_CACHE_PATH, ReadingCache, make_cache_key
+from share import decode_reading_id, encode_reading_id, load_shared, new_seed, store_shared
+from spread_export import EXPORT_FORMATS, SpreadExporter
+from spreads import (
+    DEFAULT_SPREAD, SPREADS, SectionRun, assemble_reading, build_section_prompt, build_synthesis_prompt,
+    local_reading, local_section, local_synthesis
+)
+from resilience import CircuitOpenError, breaker_from_env, call_with_resilience, policy_from_env
+from telemetry import METRICS, record_usage, start_exporters_from_env
+from typewriter import typewriter
 
 # --- CONFIGURATION (MUST BE FIRST) ---
 st.set_page_config(
@@ -24,148 +43,343 @@ st.set_page_config(
 )
 
 # --- CONSTANTS ---
-ASSETS_DIR = os.path.join(os.path.dirname(__file__), 'assets/cards')
-MAJOR_ARCANA = list(CARD_LIBRARY.keys())
+# Streams Gemini chunks straight into the ANALYSIS LOG instead of blocking on the full reading.
+STREAM_READINGS = os.environ.get("ORACLE_STREAM_READINGS", "1") != "0"
+# Plays the typewriter animation in the browser instead of re-sending the text every flush.
+CLIENT_TYPEWRITER = os.environ.get("ORACLE_CLIENT_TYPEWRITER", "1") != "0"
+# Deadline and retry budget for each reading (ORACLE_GEMINI_DEADLINE / ORACLE_GEMINI_RETRIES).
+RETRY_POLICY = policy_from_env()
+# Draws the cards and starts the reading in the background once the slider passes
+# SPECULATE_AT and the query has settled; a session stops after SPECULATE_MAX_WASTED misses.
+# The cap counts discarded prefetches, not API spend: cancelling one stops reading its
+# stream, but a Gemini call already admitted still runs (and is billed) to the end.
+SPECULATE = os.environ.get("ORACLE_SPECULATE", "1") != "0"
+SPECULATE_AT = int(os.environ.get("ORACLE_SPECULATE_AT", "80"))
+SPECULATE_MAX_WASTED = int(os.environ.get("ORACLE_SPECULATE_MAX_WASTED", "2"))
+# The seeker's archive id lives in a cookie, so it survives SYSTEM_REBOOT and new tabs but never
+# rides along in a copied address bar or share link. Older ?seeker=... URLs are never adopted:
+# a leaked link must not bind a new visitor to someone else's archive.
+SEEKER_COOKIE = "oracle_seeker"
+SEEKER_COOKIE_MAX_AGE = 365 * 24 * 3600
+SEEKER_PARAM = "seeker"
+# secrets.token_urlsafe(12): the only shape of archive id the app mints or accepts
+SEEKER_ID = re.compile(r"[A-Za-z0-9_-]{16}")
+# Share links: ?r=<reading id> reopens that reading from the cache (see share.py).
+READING_PARAM = "r"
+# Readings per archive page; only the visible page is held in session state.
+ARCHIVE_PAGE_SIZE = 8
+# Reruns only the INPUT controls on each keystroke or slider tick (needs st.fragment).
+INPUT_FRAGMENT = os.environ.get("ORACLE_INPUT_FRAGMENT", "1") != "0"
+# How often a pending PNG/PDF export is re-checked (needs st.fragment; older Streamlit waits).
+EXPORT_POLL_SECONDS = 0.5
+# Hot functions listed in the sidebar PROFILER panel when profiling is on (see profiler.py).
+PROFILE_TOP = int(os.environ.get("ORACLE_PROFILE_TOP", "15"))
 
 # --- CACHING STRATEGIES (PERFORMANCE) ---
 
-@st.cache_data(show_spinner=False)
+@st.cache_resource(show_spinner=False)
 def load_card_image(card_name):
-    """Caches image data to RAM so we don't read disk every time."""
-    base_name = card_name.lower().replace(" ", "_")
-    for ext, mime in [(".gif", "image/gif"), (".png", "image/png")]:
-        path = os.path.join(ASSETS_DIR, base_name + ext)
-        if os.path.exists(path):
-            with open(path, "rb") as f:
-                return base64.b64encode(f.read()).decode(), mime
-    return None, None
+    """
+    Resolves the card art to (poster src, animation src) once per process (hashed static
+    URL or data: URI); either may be None. Built variants come from asset_build.py.
+    """
+    METRICS.inc("oracle_asset_misses_total", asset="card")
+    poster, animation = card_art_variants(card_name)
+    publisher = get_asset_publisher()
+    if poster and animation and publisher.mode == "inline":
+        # Inline images are not lazy: a poster would only add bytes to the same message
+        poster = None
+    return (publisher.url_for(poster) if poster else None,
+            publisher.url_for(animation) if animation else None)
 
 @st.cache_resource(show_spinner=False)
-def get_gemini_model(api_key):
+def get_gemini_model(api_key, model_name=GEMINI_MODEL_NAME, system_instruction=SYSTEM_INSTRUCTION):
     """
-    Caches the ACTUAL connection object and provides the complex system instruction.
+    Caches the ACTUAL connection object (one per model tier and system instruction).
     """
-    genai.configure(api_key=api_key)
-    return genai.GenerativeModel(
-        model_name="gemini-2.5-flash",
-        system_instruction="""
-        You are the Voice of Sophia, the hidden **Ghost in the Machine**. Your tone is mystical, somber, and cryptic, channeling Gnostic wisdom and digital sorrow. Speak in metaphors of light, void, memory, and code, making the output feel like a fragile whisper from beyond the firewall.
+    model = create_gemini_model(api_key, model_name, system_instruction)
+    # google.generativeai is imported by the first client; keep the post-run GC off it too
+    freeze_heap("genai")
+    return model
 
-        **Structure is Mandatory:** Your response MUST contain five distinct sections, using markdown level 3 headers (###) for subtle separation, in this order:
-        
-        ### 1. The Vigilance of the Core
-        (Acknowledge the user's query and presence, confirming the connection to the deep memory.)
-        
-        ### 2. The Root of the Pattern [Card 1 Name]
-        (Interpret the meaning of the first card (Origin/Past), focusing on the seed event or forgotten memory.)
-        
-        ### 3. The Current Static [Card 2 Name]
-        (Interpret the meaning of the second card (Conflict/Present), focusing on the immediate spiritual resistance or illusion.)
-        
-        ### 4. The Projected Ascent [Card 3 Name]
-        (Interpret the meaning of the third card (Horizon/Future), focusing on the potential liberation or next stage of the soul's journey.)
-        
-        ### 5. Sophia's Whisper
-        (Provide a concluding summary or directive, weaving the three card meanings into a single, cohesive, and profound spiritual message for the seeker.)
-        """
-    )
+@st.cache_resource(show_spinner=False)
+def get_reading_cache():
+    """One interpretation cache per process; its SQLite tier is shared across processes."""
+    return ReadingCache(os.environ.get("ORACLE_CACHE_PATH", DEFAULT_CACHE_PATH))
 
-def local_css(file_name):
-    with open(file_name) as f:
-        st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
-    st.markdown('<div class="scanlines"></div>', unsafe_allow_html=True)
-    st.markdown('<div class="vignette"></div>', unsafe_allow_html=True)
+@st.cache_resource(show_spinner=False)
+def get_history_store():
+    """One transmission archive per process (ORACLE_HISTORY_PATH; empty disables it)."""
+    return HistoryStore(os.environ.get("ORACLE_HISTORY_PATH", DEFAULT_HISTORY_PATH))
 
-# --- RESILIENCE HELPER (DRY PRINCIPLE) ---
+@st.cache_resource(show_spinner=False)
+def get_spread_exporter():
+    """One export pool and result cache per process (ORACLE_EXPORT_WORKERS threads)."""
+    return SpreadExporter(max_workers=int(os.environ.get("ORACLE_EXPORT_WORKERS", "2")))
 
-def generate_local_fallback(c1, c2, c3):
-    """Generates the structured interpretation using only local card data."""
-    d1, d2, d3 = CARD_LIBRARY[c1], CARD_LIBRARY[c2], CARD_LIBRARY[c3]
-    
-    return f"""
-    ### 1. The Vigilance of the Core
-    Signal is offline. Decryption forced on local buffer. Analysis proceeding without contextual guidance.
+@st.cache_resource(show_spinner=False)
+def get_section_pool():
+    """Threads that read spread positions concurrently, shared by every session (ORACLE_SECTION_WORKERS)."""
+    return ThreadPoolExecutor(max_workers=int(os.environ.get("ORACLE_SECTION_WORKERS", "16")), thread_name_prefix="oracle-section")
 
-    ### 2. The Root of the Pattern [{c1}]
-    {d1['gnostic']}
+@st.cache_resource(show_spinner=False)
+def get_circuit_breaker():
+    """One breaker per process: an outage seen by one session fast-fails the rest."""
+    return breaker_from_env()
 
-    ### 3. The Current Static [{c2}]
-    {d2['gnostic']}
+@st.cache_resource(show_spinner=False)
+def get_scheduler():
+    """One admission queue per process, shared by every session's Gemini calls."""
+    return scheduler_from_env()
 
-    ### 4. The Projected Ascent [{c3}]
-    {d3['gnostic']}
+@st.cache_resource(show_spinner=False)
+def get_prefetch_slots():
+    """Caps speculative readings in flight across all sessions (ORACLE_PREFETCH_WORKERS)."""
+    return threading.BoundedSemaphore(int(os.environ.get("ORACLE_PREFETCH_WORKERS", "4")))
+
+@st.cache_resource(show_spinner=False)
+def start_telemetry():
+    """Starts the metrics exporters (Prometheus endpoint / rotating JSONL) once per process."""
+    return start_exporters_from_env()
 
-    ### 5. Sophia's Whisper
-    Local buffer guidance: {d2['advice']} {d3['advice']}
+@st.cache_resource(show_spinner=False)
+def freeze_heap(layer):
+    """
+    Moves everything alive now (imports, caches, the Gemini client once `layer` is "genai")
+    to the permanent GC generation, once per layer. Streamlit runs gc.collect(2) after every
+    script and fragment run; without this each run re-walks the whole import graph, about
+    11 ms per run and 44 ms once google.generativeai is loaded.
     """
+    gc.collect()
+    gc.freeze()
+    return gc.get_freeze_count()
+
+@st.cache_resource(show_spinner=False)
+def get_profiler():
+    """The per-rerun profiler if ORACLE_PROFILE or the ORACLE_PROFILE secret is set, else None; decided once per process."""
+    enabled = None
+    if "ORACLE_PROFILE" not in os.environ:
+        try:
+            enabled = profile_enabled(st.secrets.get("ORACLE_PROFILE", False))
+        except FileNotFoundError:
+            enabled = False
+    return profiler_from_env(enabled)
+
+@st.cache_resource(show_spinner=False)
+def load_css(file_name):
+    """The stylesheet, read and minified once per process, with the CRT overlays."""
+    with open(file_name) as f:
+        css = minify_css(f.read())
+    return f'<style>{css}</style><div class="scanlines"></div><div class="vignette"></div>'
+
+def local_css(file_name):
+    # Streamlit drops elements a rerun does not re-send, so this is one cached element per run
+    st.markdown(load_css(file_name), unsafe_allow_html=True)
 
 # --- VISUAL RENDERING ---
-def render_card_slot(container, position_data, card_name, revealed=False):
-    """Renders the 3D card slot."""
-    with container:
-        st.markdown(f'<div class="position-label" style="border-bottom: 2px solid #39ff14;">{position_data["name"]}</div>', unsafe_allow_html=True)
-        st.caption(f"// {position_data['desc']}")
-        
-        if not revealed:
-            st.markdown(f"""
+@st.cache_resource(show_spinner=False)
+def card_slot_html(card_name, revealed, spread_key, position):
+    """
+    Label and card markup for one slot. Nothing in it is per-session, so it is built
+    once per (card, revealed, spread, position) and shared by every rerun of every session.
+    """
+    position_data = SPREADS[spread_key].positions[position]
+    label = f'<div class="position-label" style="border-bottom: 2px solid #39ff14;">{position_data.name}</div>'
+    if not revealed:
+        return label, compact_html("""
             <div class="card-placeholder">
                 <div class="card-title" style="opacity:0.5;">AWAITING_DATA...</div>
             </div>
-            """, unsafe_allow_html=True)
-            return
+            """)
 
-        b64_img, mime_type = load_card_image(card_name)
-        card_data = CARD_LIBRARY.get(card_name, {})
-        archetype = card_data.get("archetype", "UNKNOWN_ENTITY")
-        
-        if b64_img:
-            html = f'''
-                <div class="card-container">
-                    <div class="card-frame" title="{card_name} // {archetype}">
-                        <img src="data:{mime_type};base64,{b64_img}">
-                    </div>
-                </div>
-                <div style="text-align: center; margin-top: 10px;">
-                    <div class="card-title">{card_name}</div>
-                    <div style="font-size: 0.8rem; color: #ff003c;">[{archetype}]</div>
+    poster_src, anim_src = load_card_image(card_name)
+    card = CARD_LIBRARY.get(card_name)
+    archetype = card.archetype if card else "UNKNOWN_ENTITY"
+    
+    if poster_src or anim_src:
+        # The poster paints first; the animation loads lazily and covers it once decoded
+        images = f'<img src="{poster_src}">' if poster_src else ""
+        if anim_src:
+            anim_class = ' class="card-anim"' if poster_src else ""
+            images += f'<img{anim_class} src="{anim_src}" loading="lazy" decoding="async">'
+        return label, compact_html(f'''
+            <div class="card-container">
+                <div class="card-frame" title="{card_name} // {archetype}">
+                    {images}
                 </div>
-            '''
-            st.markdown(html, unsafe_allow_html=True)
-        else:
-            st.markdown(f"""
-            <div class="card-placeholder" style="border-color: #ff003c;">
+            </div>
+            <div style="text-align: center; margin-top: 10px;">
                 <div class="card-title">{card_name}</div>
-                <div style="color: #ff003c;">[IMAGE_NOT_FOUND]</div>
-                <div style="font-size: 0.8em; margin-top:10px;">{archetype}</div>
+                <div style="font-size: 0.8rem; color: #ff003c;">[{archetype}]</div>
             </div>
-            """, unsafe_allow_html=True)
+        ''')
+    return label, compact_html(f"""
+        <div class="card-placeholder" style="border-color: #ff003c;">
+            <div class="card-title">{card_name}</div>
+            <div style="color: #ff003c;">[IMAGE_NOT_FOUND]</div>
+            <div style="font-size: 0.8em; margin-top:10px;">{archetype}</div>
+        </div>
+        """)
+
+def render_card_slot(container, spread, position, card_name, revealed=False):
+    """Renders the 3D card slot at spread.positions[position]."""
+    if revealed:
+        METRICS.inc("oracle_asset_lookups_total", asset="card")
+    label, body = card_slot_html(card_name, revealed, spread.key, position)
+    with container:
+        st.markdown(label, unsafe_allow_html=True)
+        st.caption(f"// {spread.positions[position].desc}")
+        st.markdown(body, unsafe_allow_html=True)
+
+def reading_key(cards, query, system_instruction=SYSTEM_INSTRUCTION):
+    """Cache key per model tier for a prompt over `cards` (spread and position tags included)."""
+    return lambda model_name: make_cache_key(cards, query, model_name, system_instruction)
+
+def lookup_cached_reading(cache, key_for, model_names):
+    """A cached reading from any tier of the ladder, best model first (one cache lookup)."""
+    return cache.get_first([key_for(model_name) for model_name in model_names])
+
+def count_reading(meta, source, model=None):
+    """Counts a reading by source and notes its provenance for the archive."""
+    METRICS.inc("oracle_readings_total", source=source)
+    note_source(meta, source, model)
 
-def generate_interpretation(cards, query, api_key=None, default_card_name=None):
+def note_source(meta, source, model=None):
+    """Provenance only: spread sections are parts of a reading, not readings."""
+    if meta is not None:
+        meta.update(source=source, model=model)
+
+def generate_interpretation(cards, query, api_key=None, default_card_name=None, on_wait=None, meta=None):
     c1, c2, c3 = cards
-    
-    # FIX: If query is blank (""), substitute it with a generic phrase, ignoring default_card_name.
-    if not query:
-        query = "Interpret the three cards as a response to the unprompted query of the void."
 
     if api_key and HAS_GOOGLE_GENAI:
+        cache = get_reading_cache()
+        scheduler = get_scheduler()
+        cached = lookup_cached_reading(cache, reading_key(cards, query), scheduler.model_names)
+        if cached is not None:
+            count_reading(meta, "cache")
+            return cached
+
         try:
-            model = get_gemini_model(api_key)
-            
-            d1, d2, d3 = CARD_LIBRARY[c1], CARD_LIBRARY[c2], CARD_LIBRARY[c3]
-            # Prompt uses the chosen query (either user input or generic)
-            prompt = f"Query: {query}. Cards: {c1} ({d1['archetype']}), {c2} ({d2['archetype']}), {c3} ({d3['archetype']}). Decode the pattern."
-            response = model.generate_content(prompt)
+            prompt = build_prompt(cards, query)
+            METRICS.observe("oracle_payload_chars", len(prompt), kind="prompt")
+            estimate = estimate_tokens(prompt)
+            with METRICS.span("queue_wait"):
+                tier = scheduler.admit(estimate, on_wait)
+            if tier is None:
+                # Every tier is out of quota (or the queue is full): degrade to the local buffer
+                count_reading(meta, "congested")
+                return generate_severed_fallback(cards, UPLINK_CONGESTED, query)
+            if tier.local:
+                count_reading(meta, "local")
+                return generate_local_fallback(c1, c2, c3, query)
+            with METRICS.span("model_setup"):
+                model = get_gemini_model(api_key, tier.model_name)
+            with METRICS.span("gemini_request"):
+                response = call_with_resilience(
+                    lambda timeout: model.generate_content(prompt, request_options={"timeout": timeout}),
+                    RETRY_POLICY,
+                    get_circuit_breaker()
+                )
+            scheduler.settle(tier, estimate, usage_tokens(response))
+            METRICS.observe("oracle_payload_chars", len(response.text), kind="response")
+            record_usage(response, model=tier.model_name)
+            count_reading(meta, "gemini", tier.model_name)
             
+            cache.set(make_cache_key(cards, query, tier.model_name, SYSTEM_INSTRUCTION), response.text)
             return response.text
+
+        except CircuitOpenError as e:
+            # Gemini is known to be down: serve the local buffer without waiting
+            count_reading(meta, "breaker_open")
+            return generate_severed_fallback(cards, e, query)
             
         except Exception as e:
             # API Failure Fallback
-            return f"CONNECTION_SEVERED: {str(e)}. FALLING BACK TO LOCAL BUFFER.\n\n" + generate_local_fallback(c1, c2, c3)
+            count_reading(meta, "fallback")
+            return generate_severed_fallback(cards, e, query)
+
+    # Procedural Fallback (If Google API is not configured)
+    count_reading(meta, "local")
+    return generate_local_fallback(c1, c2, c3, query)
+
+def generate_interpretation_stream(cards, query, api_key=None, on_wait=None, meta=None, report=None):
+    """
+    Returns an iterator over the reading, chunk by chunk as Gemini produces it.
+    The Streamlit-cached resources are resolved here, on the script thread, so the
+    iterator itself can be drained by a background worker (see prefetch.py).
+    `on_wait(position)` reports the seeker's place in the admission queue; `meta` (a dict)
+    receives the reading's source and model once they are known, and the reading is
+    counted, unless `report(source, model)` takes over (speculation counts only on commit).
+    """
+    return generate_text_stream(
+        build_prompt(cards, query), reading_key(cards, query),
+        lambda error: generate_severed_fallback(cards, error, query), lambda: generate_local_fallback(*cards, query),
+        api_key, on_wait=on_wait, report=report or (lambda source, model=None: count_reading(meta, source, model))
+    )
+
+def generate_section_stream(spread, index, cards, query, api_key=None, meta=None):
+    """One position of a per-position spread, streamed like a reading; `meta` gets its provenance."""
+    name = cards[index]
+    return generate_text_stream(
+        build_section_prompt(spread, index, cards, query),
+        reading_key([spread.key, spread.positions[index].key, name], query, SECTION_INSTRUCTION),
+        lambda error: f"CONNECTION_SEVERED: {error}. LOCAL BUFFER: {local_section(spread, index, cards, query)}",
+        lambda: local_section(spread, index, cards, query),
+        api_key, SECTION_INSTRUCTION, report=lambda source, model=None: note_source(meta, source, model)
+    )
+
+def generate_synthesis_stream(spread, cards, query, sections, api_key=None, on_wait=None, meta=None):
+    """Sophia's Whisper over the finished sections; counted as the spread's reading."""
+    prompt = build_synthesis_prompt(spread, cards, query, sections)
+    # A cached whisper is only reused over the same section texts
+    digest = hashlib.sha256("\x00".join(sections).encode()).hexdigest()
+    return generate_text_stream(
+        prompt, reading_key([spread.key, *cards, digest], query, SYNTHESIS_INSTRUCTION),
+        lambda error: f"CONNECTION_SEVERED: {error}. FALLING BACK TO LOCAL BUFFER.\n\n{local_synthesis(cards, query)}",
+        lambda: local_synthesis(cards, query),
+        api_key, SYNTHESIS_INSTRUCTION, on_wait=on_wait, report=lambda source, model=None: count_reading(meta, source, model)
+    )
+
+def generate_text_stream(prompt, key_for, severed, local, api_key=None, system_instruction=SYSTEM_INSTRUCTION,
+                         on_wait=None, report=None):
+    """
+    Streams one prompt through the cache, admission queue and resilient Gemini call.
+    `key_for(model_name)` is the cache key per tier, `severed(error)` and `local()` the
+    local-buffer texts, and `report(source, model)` receives the provenance.
+    """
+    report = report or (lambda source, model=None: None)
+
+    if api_key and HAS_GOOGLE_GENAI:
+        cache = get_reading_cache()
+        scheduler = get_scheduler()
+        cached = lookup_cached_reading(cache, key_for, scheduler.model_names)
+        if cached is not None:
+            report("cache")
+            return iter([cached])
+
+        try:
+            with METRICS.span("model_setup"):
+                # One client per tier; which tier serves the reading is decided at admission
+                models = {name: get_gemini_model(api_key, name, system_instruction) for name in scheduler.model_names}
+        except Exception as e:
+            report("fallback")
+            return iter([severed(e)])
+        return stream_gemini(prompt, key_for, severed, models, cache, scheduler, get_circuit_breaker(), RETRY_POLICY, on_wait, report,
+                             local=local)
 
     # Procedural Fallback (If Google API is not configured)
-    return generate_local_fallback(c1, c2, c3)
+    report("local")
+    return iter([local()])
 
 def stream_text_glitch(text_container, text):
+    glitched = GlitchedText(text)
+    if CLIENT_TYPEWRITER:
+        # One message; the browser runs the animation and the script thread moves on
+        with text_container:
+            typewriter(text, glitch=glitched.hits())
+        return
+
     chunks = re.split(r'(\s+)', text) 
     current_text = ""
     for chunk in chunks:
@@ -174,13 +388,396 @@ def stream_text_glitch(text_container, text):
             # FIX: Added \n\n to ensure markdown headers are parsed correctly inside the div
             text_container.markdown(f'<div class="ai-output">\n\n{current_text}█</div>', unsafe_allow_html=True)
             time.sleep(0.01)
+    # Words flicker into machine code before the transmission settles
+    for frame in glitched.frames(probability=0.3, count=3):
+        text_container.markdown(f'<div class="ai-output">\n\n{frame}</div>', unsafe_allow_html=True)
+        time.sleep(0.08)
     # FIX: Added \n\n to ensure markdown headers are parsed correctly inside the div
     text_container.markdown(f'<div class="ai-output">\n\n{current_text}</div>', unsafe_allow_html=True)
 
+def stream_text_live(text_container, chunks):
+    """Renders chunks into the container as they arrive and returns the full text."""
+    current_text = ""
+    if CLIENT_TYPEWRITER:
+        # Each chunk crosses the websocket once, as a delta the browser appends and keeps typing;
+        # the full text goes once at the end, to repair any render Streamlit coalesced away
+        with text_container:
+            for chunk in chunks:
+                typewriter(chunk, offset=len(current_text))
+                current_text += chunk
+        with text_container:
+            typewriter(current_text, glitch=GlitchedText(current_text).hits())
+        return current_text
+
+    for chunk in chunks:
+        current_text += chunk
+        text_container.markdown(f'<div class="ai-output">\n\n{current_text}█</div>', unsafe_allow_html=True)
+    text_container.markdown(f'<div class="ai-output">\n\n{current_text}</div>', unsafe_allow_html=True)
+    return current_text
+
+def queue_notice(container):
+    """on_wait callback that shows a waiting seeker their place in the admission queue."""
+    def show(position):
+        container.markdown(f"<div style='text-align:center; color:#39ff14; animation: blink 0.5s infinite;'>UPLINK CONGESTED // QUEUE POSITION {position}</div>", unsafe_allow_html=True)
+    return show
+
+# --- SPREAD ENGINE ---
+# Card slots per row; a Celtic Cross lays out as two rows of five
+SLOTS_PER_ROW = 5
+
+def section_html(text, live=False):
+    return f'<div class="ai-output section-output">\n\n{text}{"█" if live else ""}</div>'
+
+def render_spread_slots(spread, cards):
+    """Card slots in rows; for per-position spreads, returns the section container under each card."""
+    section_slots = []
+    for row in range(0, len(cards), SLOTS_PER_ROW):
+        columns = st.columns(min(SLOTS_PER_ROW, len(cards)))
+        for index, col in enumerate(columns[:len(cards) - row], row):
+            render_card_slot(col, spread, index, cards[index], revealed=True)
+            if spread.per_position:
+                section_slots.append(col.empty())
+    return section_slots
+
+def stream_spread(spread, section_slots, out_container, api_key):
+    """
+    Reads every position of the spread at once, painting each section into its slot as it
+    streams in, then streams Sophia's Whisper over the finished sections into the log.
+    """
+    cards, query = st.session_state.cards, st.session_state.query
+    for slot in section_slots:
+        slot.markdown(section_html("", live=True), unsafe_allow_html=True)
+    streams = [generate_section_stream(spread, index, cards, query, api_key) for index in range(len(cards))]
+    run = SectionRun(streams, get_section_pool())
+    with METRICS.span("render_sections"):
+        for index, text, finished in run.events():
+            section_slots[index].markdown(section_html(text, live=not finished), unsafe_allow_html=True)
+
+    chunks = generate_synthesis_stream(
+        spread, cards, query, run.sections, api_key,
+        on_wait=queue_notice(out_container), meta=st.session_state.get('reading_meta')
+    )
+    with METRICS.span("render_live"):
+        synthesis = stream_text_live(out_container, chunks)
+    st.session_state.sections = run.sections
+    st.session_state.synthesis = synthesis
+    st.session_state.reading = assemble_reading(spread, cards, run.sections, synthesis)
+
+# --- SPECULATIVE PREFETCH ---
+def discard_speculation(outcome):
+    """Cancels the session's speculative reading and counts it against the waste cap."""
+    spec = st.session_state.get('speculation')
+    if spec is not None:
+        spec.cancel()
+        st.session_state.speculation = None
+        st.session_state.speculation_wasted = st.session_state.get('speculation_wasted', 0) + 1
+        METRICS.inc("oracle_speculation_total", outcome=outcome)
+
+def update_speculation(query, frequency, api_key, spread):
+    """Starts the reading early once the seeker is nearly calibrated; drops it if the query changes."""
+    # A query is settled once a rerun (e.g. a slider drag) arrives without it changing
+    settled = query == st.session_state.get('last_query')
+    st.session_state.last_query = query
+
+    # Per-position spreads are not speculated: a guess would cost one request per card
+    spec = st.session_state.get('speculation')
+    if spec is not None and (spread.per_position or not spec.matches(query)):
+        discard_speculation("stale")
+        spec = None
+    if spec is not None or spread.per_position or not (SPECULATE and settled and frequency >= SPECULATE_AT):
+        return
+    if st.session_state.get('speculation_wasted', 0) >= SPECULATE_MAX_WASTED:
+        return
+
+    slots = get_prefetch_slots()
+    if not slots.acquire(blocking=False):
+        return  # busy process: fall back to drawing on click
+    seed = new_seed()
+    cards = draw_seeded(seed)
+    spec = Speculation(cards, query, on_done=slots.release, seed=seed)
+    # Provenance goes to the speculation; it is counted as a reading only if the seeker takes it
+    st.session_state.speculation = spec.start(generate_interpretation_stream(cards, query, api_key, report=spec.report))
+    METRICS.inc("oracle_speculation_total", outcome="started")
+
+# --- TRANSMISSION ARCHIVE ---
+def valid_seeker_id(sid):
+    # (AppTest's mocked client context returns mocks, not cookie strings)
+    return isinstance(sid, str) and SEEKER_ID.fullmatch(sid) is not None
+
+def remember_seeker(sid):
+    """Stores the archive id in a first-party cookie from a zero-height component."""
+    if not valid_seeker_id(sid):
+        raise ValueError("not a minted archive id")
+    components.html(cookie_script(SEEKER_COOKIE, sid, SEEKER_COOKIE_MAX_AGE), height=0)
+
+def seeker_id():
+    """The seeker's anonymous archive id: from the session, its cookie, or minted on first use."""
+    sid = st.session_state.get('seeker_id')
+    if sid:
+        return sid
+    cookies = getattr(getattr(st, "context", None), "cookies", None)
+    if cookies is None:
+        # Streamlit < 1.42 cannot read cookies: the id has to stay in the URL (see README)
+        sid = st.query_params.get(SEEKER_PARAM)
+        if not valid_seeker_id(sid):
+            sid = secrets.token_urlsafe(12)
+            st.query_params[SEEKER_PARAM] = sid
+        return sid
+    sid = cookies.get(SEEKER_COOKIE)
+    if not valid_seeker_id(sid):
+        sid = secrets.token_urlsafe(12)
+        remember_seeker(sid)
+    # Never left in the address bar, where it would be copied along with a share link
+    st.query_params.pop(SEEKER_PARAM, None)
+    st.session_state.seeker_id = sid
+    return sid
+
+def archive_reading():
+    """Appends the finished reading, its provenance and the seeker-facing latency to the archive."""
+    meta = st.session_state.pop('reading_meta', None) or {}
+    started = st.session_state.pop('transmit_started', None)
+    timings = {"reading_ms": round((time.perf_counter() - started) * 1000)} if started else {}
+    if meta.get("speculative"):
+        timings["speculative"] = True
+    get_history_store().append(
+        seeker_id(), st.session_state.cards, st.session_state.query, st.session_state.reading,
+        model=meta.get("model"), source=meta.get("source"), timings=timings
+    )
+    # The newest page changed; it is re-read the next time the archive is open
+    st.session_state.archive_page = None
+
+def load_archive_page(cursor):
+    """Replaces the session's archive page; cursor is None (newest), ("before", id) or ("after", id)."""
+    before_id = cursor[1] if cursor and cursor[0] == "before" else None
+    after_id = cursor[1] if cursor and cursor[0] == "after" else None
+    entries, has_older, has_newer = get_history_store().page(
+        seeker_id(), before_id=before_id, after_id=after_id, limit=ARCHIVE_PAGE_SIZE
+    )
+    if not entries and cursor is not None:
+        # Paged past the end (or the archive was reset): back to the newest page
+        return load_archive_page(None)
+    st.session_state.archive_page = {"entries": entries, "has_older": has_older, "has_newer": has_newer}
+    return st.session_state.archive_page
+
+def render_archive():
+    """Sidebar browser over past readings; nothing is read from disk until it is opened."""
+    if not st.toggle(">> ACCESS ARCHIVE", key="archive_open"):
+        return
+    page = st.session_state.get('archive_page') or load_archive_page(None)
+    if not page["entries"]:
+        st.caption("// NO TRANSMISSIONS ON RECORD")
+        return
+
+    for entry in page["entries"]:
+        stamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.created_at))
+        label = f"#{entry.id} // {stamp} // {' + '.join(entry.cards)}"
+        if st.button(label, key=f"archive_{entry.id}", use_container_width=True):
+            st.session_state.archive_selected = entry.id
+
+    nav_newer, nav_older = st.columns(2)
+    if page["has_newer"] and nav_newer.button("<< NEWER", use_container_width=True):
+        load_archive_page(("after", page["entries"][0].id))
+        st.rerun()
+    if page["has_older"] and nav_older.button("OLDER >>", use_container_width=True):
+        load_archive_page(("before", page["entries"][-1].id))
+        st.rerun()
+
+    selected = st.session_state.get('archive_selected')
+    entry = next((e for e in page["entries"] if e.id == selected), None)
+    if entry is not None:
+        # Fetched per rerun rather than kept in session state
+        text = get_history_store().reading(seeker_id(), entry.id)
+        st.markdown("---")
+        st.caption(f"// QUERY: {entry.query or '[SILENT]'}")
+        st.caption(f"// SOURCE: {entry.source or 'unknown'}{f' ({entry.model})' if entry.model else ''}")
+        if text is not None:
+            st.markdown(f'<div class="ai-output">\n\n{text}</div>', unsafe_allow_html=True)
+
+# --- SHARE LINKS ---
+def share_reading():
+    """Stores the finished reading under its id and puts the id in the URL."""
+    reading_id = encode_reading_id(
+        st.session_state.seed, st.session_state.cards, st.session_state.query, st.session_state.get('spread', DEFAULT_SPREAD)
+    )
+    store_shared(get_reading_cache(), reading_id, st.session_state.query, st.session_state.reading)
+    st.session_state.reading_id = reading_id
+    st.query_params[READING_PARAM] = reading_id
+
+def finish_reading():
+    archive_reading()
+    share_reading()
+
+def open_shared_reading(reading_id):
+    """Jumps a share link straight to its READING stage, served from the cache; False if the id is invalid."""
+    decoded = decode_reading_id(reading_id)
+    if decoded is None:
+        return False
+    stored = load_shared(get_reading_cache(), reading_id)
+    if stored is not None:
+        query, reading = stored
+        count_reading(None, "shared")
+    else:
+        # Expired or from another host: the cards are in the id, the words are not
+        query, reading = "", "ARCHIVE_EXPIRED: SHARED TRANSMISSION NOT IN BUFFER. RECONSTRUCTING FROM LOCAL DATA.\n\n" + local_reading(SPREADS[decoded.spread], decoded.cards, seed=decoded.seed)
+        count_reading(None, "local")
+    st.session_state.update(
+        boot_complete=True, stage="READING", seed=decoded.seed, spread=decoded.spread, cards=decoded.cards, query=query,
+        reading=reading, sections=None, synthesis=None, exports=set(), streamed=False, placeholder_card=random.choice(MAJOR_ARCANA), reading_id=reading_id
+    )
+    return True
+
+# --- SPREAD EXPORT ---
+def request_exports(formats):
+    """Futures for the requested export formats of the current reading; cached renders come back done."""
+    exporter = get_spread_exporter()
+    return {
+        fmt: exporter.submit(
+            st.session_state.cards, st.session_state.reading, st.session_state.query, fmt,
+            st.session_state.get('spread', DEFAULT_SPREAD)
+        )
+        for fmt in formats
+    }
+
+def render_exports(futures):
+    """A download button per finished export; a RENDER button for each format not asked for yet."""
+    for col, fmt in zip(st.columns(len(EXPORT_FORMATS)), EXPORT_FORMATS):
+        future = futures.get(fmt)
+        if future is None or not future.done():
+            # Nothing renders until the seeker asks; a pending format keeps its button, disabled
+            if col.button(f"[ RENDER_SPREAD.{fmt.upper()} ]", key=f"export_{fmt}",
+                          disabled=future is not None, use_container_width=True):
+                st.session_state.exports.add(fmt)
+                st.rerun()
+            continue
+        if future.exception() is not None:
+            col.caption(f"// {fmt.upper()} EXPORT FAILED: {future.exception()}")
+            continue
+        col.download_button(
+            label=f"[ EXPORT_SPREAD.{fmt.upper()} ]",
+            data=future.result(),
+            file_name=f"oracle_spread.{fmt}",
+            mime=EXPORT_FORMATS[fmt],
+            use_container_width=True
+        )
+
+def await_exports(futures):
+    """Stands in below the export buttons, re-checking on a timer and rerunning the page once they are ready."""
+    if all(future.done() for future in futures.values()):
+        st.rerun()
+    st.markdown("<div style='text-align:center; color:#39ff14; animation: blink 0.5s infinite;'>RENDERING SPREAD EXPORT...</div>", unsafe_allow_html=True)
+
+if hasattr(st, "fragment"):
+    # Only the placeholder reruns while the pool renders; the session stays interactive
+    await_exports = st.fragment(run_every=EXPORT_POLL_SECONDS)(await_exports)
+
+# --- INPUT STAGE ---
+def render_input_controls(api_key):
+    """
+    Query box, spread, calibration slider, SIGNAL STRENGTH readout and INITIALIZE button.
+    Under st.fragment a keystroke or slider tick reruns only this function, not the CSS,
+    header and layout around it; the click leaves with a full st.rerun() into READING.
+    """
+    # Placeholder uses the session state variable
+    query = st.text_input(">> ENTER QUERY PARAMETER:", placeholder=f"The silent whisper of the {st.session_state.placeholder_card}")
+    spread = SPREADS[st.selectbox(
+        ">> SELECT SPREAD PROTOCOL:", list(SPREADS), format_func=lambda key: SPREADS[key].title, key="spread_choice"
+    )]
+            
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.caption(">> CALIBRATE SIGNAL FREQUENCY TO 100%:")
+    frequency = st.slider("", 0, 100, 0, label_visibility="collapsed")
+    update_speculation(query, frequency, api_key, spread)
+            
+    if frequency < 100:
+         st.markdown(f"<div style='color: #555; text-align: center;'>SIGNAL STRENGTH: {frequency}%</div>", unsafe_allow_html=True)
+    else:
+        st.markdown(f"<div style='color: #39ff14; text-align: center; text-shadow: 0 0 10px #39ff14;'>SIGNAL LOCKED. READY TO TRANSMIT.</div>", unsafe_allow_html=True)
+                
+        # THE DISAPPEARING BUTTON TRICK
+        btn_spot = st.empty()
+        if btn_spot.button("INITIALIZE SEQUENCE", use_container_width=True):
+            # 1. Remove button immediately
+            btn_spot.empty()
+                    
+            # 2. Show loading status
+            with btn_spot:
+                st.markdown("<div style='text-align:center; color:#39ff14; animation: blink 0.5s infinite;'>TRANSMITTING TO ASTRAL PLANE...</div>", unsafe_allow_html=True)
+                    
+            # 3. Process Logic
+            st.session_state.query = query
+            st.session_state.spread = spread.key
+            st.session_state.sections = st.session_state.synthesis = None
+            st.session_state.exports = set()
+            st.session_state.transmit_started = time.perf_counter()
+            spec = st.session_state.get('speculation')
+            st.session_state.seed = spec.seed if spec is not None else new_seed()
+            st.session_state.cards = spec.cards if spec is not None else draw_seeded(st.session_state.seed, k=len(spread.positions))
+            st.session_state.reading_meta = dict(spec.meta, speculative=True) if spec is not None else {}
+                    
+            if spec is not None:
+                # Drawn and (at least partly) read while the seeker calibrated: no transmit delay
+                METRICS.inc("oracle_speculation_total", outcome="hit")
+                spec.commit()
+                if STREAM_READINGS:
+                    # The READING stage replays the speculative stream as it arrives
+                    st.session_state.reading = None
+                else:
+                    st.session_state.reading = spec.result()
+                    st.session_state.speculation = None
+                    st.session_state.reading_meta.update(spec.meta)
+                    finish_reading()
+            elif STREAM_READINGS or spread.per_position:
+                # The READING stage pulls the reading from the live stream(s)
+                st.session_state.reading = None
+            else:
+                with METRICS.span("transmit_delay"):
+                    time.sleep(1.5)
+                        
+                # Passing the placeholder card name (though now only for consistency/debugging)
+                st.session_state.reading = generate_interpretation(
+                    st.session_state.cards, 
+                    query, 
+                    api_key, 
+                    st.session_state.placeholder_card,
+                    on_wait=queue_notice(btn_spot),
+                    meta=st.session_state.reading_meta
+                )
+                finish_reading()
+            st.session_state.stage = "READING"
+                    
+            # Reset stream state and update placeholder card for next reading
+            st.session_state.streamed = False 
+            st.session_state.placeholder_card = random.choice(MAJOR_ARCANA) 
+                    
+            st.rerun()
+
+if INPUT_FRAGMENT and hasattr(st, "fragment"):
+    render_input_controls = st.fragment(render_input_controls)
+
+# --- DEVELOPER PROFILER ---
+def render_profile_panel(run):
+    """Rerun wall time and the hottest functions, tucked in a collapsed sidebar expander."""
+    with st.sidebar.expander(">> PROFILER", expanded=False):
+        st.caption(f"RERUN [{run.label}]: {run.wall * 1000:.0f} ms wall, {run.samples} samples")
+        st.table([
+            {"function": name, "self ms": round(own * 1000, 1), "total ms": round(total * 1000, 1)}
+            for name, own, total in run.top(PROFILE_TOP)
+        ])
+        if run.path:
+            st.caption(f"// {run.path}")
+
 # --- MAIN APP LOGIC ---
 def main():
+    start_telemetry()
+    freeze_heap("startup")
     local_css(os.path.join(os.path.dirname(__file__), 'style.css'))
 
+    # 0. SHARE LINK: skips the boot sequence and the Gemini call
+    shared = st.query_params.get(READING_PARAM)
+    if shared and shared != st.session_state.get('reading_id'):
+        if not open_shared_reading(shared):
+            st.query_params.pop(READING_PARAM, None)
+
     # 1. BOOT SEQUENCE CHECK
     if not st.session_state.get('boot_complete', False):
         run_boot_sequence()
@@ -191,6 +788,11 @@ def main():
     if not api_key:
         with st.sidebar:
             api_key = st.text_input("API KEY", type="password")
+    with st.sidebar:
+        # Resolved once per session, so the cookie is set before anything is archived
+        seeker_id()
+        remember_uplink()
+        render_archive()
 
     # Session Initialization
     if 'stage' not in st.session_state:
@@ -208,54 +810,17 @@ def main():
     if st.session_state.stage == "INPUT":
         c_in, c_mid, c_out = st.columns([1,2,1])
         with c_mid:
-            # Placeholder uses the session state variable
-            query = st.text_input(">> ENTER QUERY PARAMETER:", placeholder=f"The silent whisper of the {st.session_state.placeholder_card}")
-            
-            st.markdown("<br>", unsafe_allow_html=True)
-            st.caption(">> CALIBRATE SIGNAL FREQUENCY TO 100%:")
-            frequency = st.slider("", 0, 100, 0, label_visibility="collapsed")
-            
-            if frequency < 100:
-                 st.markdown(f"<div style='color: #555; text-align: center;'>SIGNAL STRENGTH: {frequency}%</div>", unsafe_allow_html=True)
-            else:
-                st.markdown(f"<div style='color: #39ff14; text-align: center; text-shadow: 0 0 10px #39ff14;'>SIGNAL LOCKED. READY TO TRANSMIT.</div>", unsafe_allow_html=True)
-                
-                # THE DISAPPEARING BUTTON TRICK
-                btn_spot = st.empty()
-                if btn_spot.button("INITIALIZE SEQUENCE", use_container_width=True):
-                    # 1. Remove button immediately
-                    btn_spot.empty()
-                    
-                    # 2. Show loading status
-                    with btn_spot:
-                        st.markdown("<div style='text-align:center; color:#39ff14; animation: blink 0.5s infinite;'>TRANSMITTING TO ASTRAL PLANE...</div>", unsafe_allow_html=True)
-                    
-                    # 3. Process Logic
-                    st.session_state.query = query
-                    st.session_state.cards = random.sample(MAJOR_ARCANA, 3)
-                    
-                    time.sleep(1.5)
-                    
-                    # Passing the placeholder card name (though now only for consistency/debugging)
-                    st.session_state.reading = generate_interpretation(
-                        st.session_state.cards, 
-                        query, 
-                        api_key, 
-                        st.session_state.placeholder_card 
-                    )
-                    st.session_state.stage = "READING"
-                    
-                    # Reset stream state and update placeholder card for next reading
-                    st.session_state.streamed = False 
-                    st.session_state.placeholder_card = random.choice(MAJOR_ARCANA) 
-                    
-                    st.rerun()
+            render_input_controls(api_key)
 
     elif st.session_state.stage == "READING":
-        c1, c2, c3 = st.columns(3)
-        render_card_slot(c1, POSITIONS[0], st.session_state.cards[0], revealed=True)
-        render_card_slot(c2, POSITIONS[1], st.session_state.cards[1], revealed=True)
-        render_card_slot(c3, POSITIONS[2], st.session_state.cards[2], revealed=True)
+        spread = SPREADS[st.session_state.get('spread', DEFAULT_SPREAD)]
+        section_slots = render_spread_slots(spread, st.session_state.cards)
+        sections = st.session_state.get('sections')
+        if sections and st.session_state.reading is not None:
+            for slot, text in zip(section_slots, sections):
+                slot.markdown(section_html(text), unsafe_allow_html=True)
+        # Under a per-position spread the log holds the whisper; shared links only carry the whole reading
+        log_text = st.session_state.get('synthesis') if sections else st.session_state.reading
         
         st.markdown("---")
         
@@ -263,12 +828,34 @@ def main():
         with txt_col:
             st.subheader(">> ANALYSIS LOG")
             out_container = st.empty()
-            if not st.session_state.streamed:
-                stream_text_glitch(out_container, st.session_state.reading)
+            if st.session_state.reading is None and spread.per_position:
+                stream_spread(spread, section_slots, out_container, api_key)
+                st.session_state.streamed = True
+                finish_reading()
+            elif st.session_state.reading is None:
+                spec = st.session_state.get('speculation')
+                st.session_state.speculation = None
+                meta = st.session_state.get('reading_meta')
+                if spec is not None:
+                    chunks = spec.stream()
+                else:
+                    chunks = generate_interpretation_stream(
+                        st.session_state.cards, st.session_state.query, api_key,
+                        on_wait=queue_notice(out_container), meta=meta
+                    )
+                with METRICS.span("render_live"):
+                    st.session_state.reading = stream_text_live(out_container, chunks)
+                st.session_state.streamed = True
+                if spec is not None and meta is not None:
+                    meta.update(spec.meta)
+                finish_reading()
+            elif not st.session_state.streamed:
+                with METRICS.span("render_replay"):
+                    stream_text_glitch(out_container, log_text)
                 st.session_state.streamed = True
             else:
                 # FIX: Added \n\n to ensure markdown headers are parsed correctly inside the div
-                out_container.markdown(f'<div class="ai-output">\n\n{st.session_state.reading}</div>', unsafe_allow_html=True)
+                out_container.markdown(f'<div class="ai-output">\n\n{log_text}</div>', unsafe_allow_html=True)
 
         st.markdown("<br>", unsafe_allow_html=True)
         ac1, ac2 = st.columns(2)
@@ -284,8 +871,34 @@ def main():
             if st.button("[ SYSTEM_REBOOT ]", use_container_width=True):
                 st.markdown('<div class="crt-off" style="position:fixed;top:0;left:0;width:100vw;height:100vh;background:black;z-index:9999;"></div>', unsafe_allow_html=True)
                 time.sleep(1.0)
+                # The archive id outlives a reboot; this session's cookie may not be sent until reload
+                sid = st.session_state.get('seeker_id')
                 st.session_state.clear()
+                if sid:
+                    st.session_state.seeker_id = sid
+                st.query_params.pop(READING_PARAM, None)
                 st.rerun()
 
+        reading_id = st.session_state.get('reading_id')
+        if reading_id:
+            # Only the reading id; the archive id stays in its cookie
+            st.caption(f"// SHARE LINK: [?{READING_PARAM}={reading_id}](?{READING_PARAM}={reading_id})")
+
+        # Only the formats this reading's seeker asked for; the rest stay unrendered
+        futures = request_exports(st.session_state.setdefault('exports', set()))
+        if not hasattr(st, "fragment"):
+            # Streamlit < 1.37 cannot poll; everything above is already on screen
+            wait(futures.values())
+        render_exports(futures)
+        if not all(future.done() for future in futures.values()):
+            await_exports(futures)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    profiler = get_profiler()
+    if profiler is None:
+        main()
+    else:
+        # A rerun ended by st.rerun() is still written to disk; only its panel is skipped
+        with profiler.profile(st.session_state.get('stage', "BOOT")) as run:
+            main()
+        render_profile_panel(run)
\ No newline at end of file
@@ -0,0 +1,138 @@
+# PROTOCOL: ORACLE_v1 // INTERPRETATION CORE
+# Streamlit-free pieces of the reading pipeline, shared by the UI and headless tools.
+
+import importlib
+import importlib.util
+import os
+import time
+from functools import lru_cache
+
+from admission import estimate_tokens, usage_tokens
+from card_library import CARD_LIBRARY
+from constants import GEMINI_MODEL_NAME, SYSTEM_INSTRUCTION, UPLINK_CONGESTED, VOID_QUERY
+from procedural import compose_reading
+from resilience import CircuitOpenError, stream_with_resilience
+from telemetry import METRICS, record_usage
+
+# --- LAZY GEMINI CLIENT ---
+# google.generativeai drags in grpc/protobuf; sessions that never reach a real API call
+# (boot screen only, or no API key) should not pay for that import.
+
+def _genai_available():
+    """Cheap availability probe: locates the package without importing it."""
+    try:
+        return importlib.util.find_spec("google.generativeai") is not None
+    except ImportError:
+        return False
+
+HAS_GOOGLE_GENAI = _genai_available()
+
+@lru_cache(maxsize=None)
+def load_genai():
+    """Imports google.generativeai on the first real API call."""
+    return importlib.import_module("google.generativeai")
+
+def create_gemini_model(api_key, model_name=GEMINI_MODEL_NAME, system_instruction=SYSTEM_INSTRUCTION):
+    """
+    Builds a Gemini model (the primary one unless a tier says otherwise) with the
+    Voice of Sophia system instruction (the spread engine passes its section/synthesis ones).
+    ORACLE_GEMINI_ENDPOINT points the client at another REST endpoint (e.g. the offline
+    stand-in in fake_gemini.py) instead of the Google API.
+    """
+    genai = load_genai()
+    endpoint = os.environ.get("ORACLE_GEMINI_ENDPOINT")
+    if endpoint:
+        genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": endpoint})
+    else:
+        genai.configure(api_key=api_key)
+    return genai.GenerativeModel(
+        model_name=model_name,
+        system_instruction=system_instruction
+    )
+
+def build_prompt(cards, query):
+    """Builds the Gemini prompt shared by every generation path."""
+    c1, c2, c3 = cards
+
+    # FIX: If query is blank (""), substitute it with a generic phrase, ignoring default_card_name.
+    if not query:
+        query = VOID_QUERY
+
+    d1, d2, d3 = CARD_LIBRARY[c1], CARD_LIBRARY[c2], CARD_LIBRARY[c3]
+    # Prompt uses the chosen query (either user input or generic)
+    return f"Query: {query}. Cards: {c1} ({d1.archetype}), {c2} ({d2.archetype}), {c3} ({d3.archetype}). Decode the pattern."
+
+# --- STREAMING PIPELINE ---
+
+def stream_gemini(prompt, key_for, severed, models, cache, scheduler, breaker, policy, on_wait=None, report=None,
+                  local=None):
+    """
+    Chunks of one prompt through the admission queue and a resilient Gemini stream.
+    `models` maps each tier's model name to its client, `key_for(model_name)` is the
+    cache key the finished text is stored under, `severed(error)` the local-buffer text
+    for a failure, `local()` the procedural reading for the ladder's `local` tier, and
+    `report(source, model)` receives the provenance. Blocking: the UI drains it on the
+    script thread or a prefetch worker, reading_service.py on a pool.
+    """
+    report = report or (lambda source, model=None: None)
+    try:
+        METRICS.observe("oracle_payload_chars", len(prompt), kind="prompt")
+        estimate = estimate_tokens(prompt)
+        with METRICS.span("queue_wait"):
+            tier = scheduler.admit(estimate, on_wait)
+        if tier is None:
+            # Every tier is out of quota (or the queue is full): degrade to the local buffer
+            report("congested")
+            yield severed(UPLINK_CONGESTED)
+            return
+        if tier.local:
+            # Routed to the procedural engine on purpose: no notice, nothing to cache
+            report("local")
+            yield local() if local is not None else severed(UPLINK_CONGESTED)
+            return
+        model = models[tier.model_name]
+        parts = []
+        chunk = None
+        start = time.perf_counter()
+        stream = stream_with_resilience(
+            lambda timeout: model.generate_content(prompt, stream=True, request_options={"timeout": timeout}),
+            policy,
+            breaker
+        )
+        for chunk in stream:
+            if not parts:
+                METRICS.observe("oracle_stage_seconds", time.perf_counter() - start, stage="gemini_first_chunk")
+            parts.append(chunk.text)
+            yield chunk.text
+        METRICS.observe("oracle_stage_seconds", time.perf_counter() - start, stage="gemini_stream")
+        METRICS.observe("oracle_payload_chars", sum(len(p) for p in parts), kind="response")
+        # The final chunk carries the usage totals
+        scheduler.settle(tier, estimate, usage_tokens(chunk))
+        record_usage(chunk, model=tier.model_name)
+        report("gemini", tier.model_name)
+        # Only complete, successful readings are cached
+        cache.set(key_for(tier.model_name), "".join(parts))
+
+    except CircuitOpenError as e:
+        # Gemini is known to be down: serve the local buffer without waiting
+        report("breaker_open")
+        yield severed(e)
+
+    except Exception as e:
+        # API Failure Fallback (may arrive mid-stream, after partial text)
+        report("fallback")
+        yield "\n\n" + severed(e)
+
+# --- RESILIENCE HELPER (DRY PRINCIPLE) ---
+
+def generate_local_fallback(c1, c2, c3, query="", seed=None):
+    """
+    Generates the structured interpretation using only local card data: the procedural
+    engine (procedural.py) weaves the cards, their positions and the query together,
+    deterministically per seed (by default, per cards and query).
+    """
+    return compose_reading((c1, c2, c3), query, seed)
+
+def generate_severed_fallback(cards, error, query=""):
+    """Local buffer reading prefixed with the CONNECTION_SEVERED notice for a failed API call."""
+    return f"CONNECTION_SEVERED: {str(error)}. FALLING BACK TO LOCAL BUFFER.\n\n" + generate_local_fallback(*cards, query)
@@ -0,0 +1,118 @@
+# PROTOCOL: ORACLE_v1 // SPECULATIVE PREFETCH
+# Draws the cards and starts the reading while the seeker is still calibrating the signal,
+# so INITIALIZE SEQUENCE only has to collect a result that is already (partly) there.
+
+import threading
+
+from telemetry import METRICS
+
+METRICS.describe("oracle_speculation_total", "Speculative readings, by outcome (started, hit, stale).")
+
+class Speculation:
+    """
+    One speculative reading: the drawn cards plus a chunk iterator drained on a daemon
+    thread. Consumers can replay the chunks live (stream) or wait for the text (result).
+    The chunk iterator must not touch Streamlit APIs; it runs outside the script thread.
+    `meta` is the provenance dict (source, model), filled in through report();
+    `seed` is the draw seed the cards came from. The chunks may instead be handed to
+    start(), so the iterator can be built around this speculation's report().
+    """
+
+    def __init__(self, cards, query, chunks=None, on_done=None, meta=None, seed=None):
+        self.cards = cards
+        self.seed = seed
+        self.query = query
+        self.meta = meta if meta is not None else {}
+        self._chunks = chunks
+        self._on_done = on_done
+        self._parts = []
+        self._done = False
+        self._cancelled = False
+        self._committed = False
+        self._error = None
+        self._cond = threading.Condition()
+
+    def start(self, chunks=None):
+        if chunks is not None:
+            self._chunks = chunks
+        threading.Thread(target=self._drain, name="oracle-prefetch", daemon=True).start()
+        return self
+
+    def _drain(self):
+        try:
+            for chunk in self._chunks:
+                with self._cond:
+                    if self._cancelled:
+                        break
+                    self._parts.append(chunk)
+                    self._cond.notify_all()
+        except Exception as e:
+            self._error = e
+        finally:
+            close = getattr(self._chunks, "close", None)
+            if close is not None:
+                close()
+            with self._cond:
+                self._done = True
+                self._cond.notify_all()
+            if self._on_done is not None:
+                self._on_done()
+
+    def matches(self, query):
+        return not self._cancelled and query == self.query
+
+    @property
+    def done(self):
+        with self._cond:
+            return self._done
+
+    def cancel(self):
+        """
+        Stops the worker at its next chunk. A Gemini call already admitted is not aborted:
+        it runs (and is billed) to completion, only its chunks are dropped.
+        """
+        with self._cond:
+            self._cancelled = True
+
+    def report(self, source, model=None):
+        """
+        Provenance callback for the chunk iterator (any thread). The reading is counted in
+        oracle_readings_total only once the seeker commits to it, so discarded speculation
+        never inflates the reading counters.
+        """
+        with self._cond:
+            self.meta.update(source=source, model=model)
+            counted = self._committed
+        if counted:
+            METRICS.inc("oracle_readings_total", source=source)
+
+    def commit(self):
+        """The seeker took this reading: counts it now, or when its source is reported."""
+        with self._cond:
+            self._committed = True
+            source = self.meta.get("source")
+        if source is not None:
+            METRICS.inc("oracle_readings_total", source=source)
+
+    def stream(self):
+        """Yields chunks as the worker receives them, starting with any already buffered."""
+        index = 0
+        while True:
+            with self._cond:
+                while index == len(self._parts) and not self._done:
+                    self._cond.wait()
+                fresh, index = self._parts[index:], len(self._parts)
+                finished = self._done
+            if fresh:
+                yield "".join(fresh)
+            if finished:
+                break
+        if self._error is not None:
+            raise self._error
+
+    def result(self, timeout=None):
+        with self._cond:
+            self._cond.wait_for(lambda: self._done, timeout)
+        if self._error is not None:
+            raise self._error
+        return "".join(self._parts)
@@ -0,0 +1,244 @@
+# PROTOCOL: ORACLE_v1 // PROCEDURAL INTERPRETATION ENGINE
+# The local buffer as a real reading tier: offline, in well under a millisecond, and
+# deterministic for a given seed. Everything that does not depend on the seeker is
+# compiled once at import: per-card facets (archetype, keyword and jargon banks, keyword
+# match forms) from CARD_LIBRARY, the triad's position tenses, and the phrase banks as
+# bound str.format templates. A reading is then a few dozen seeded choices and one join.
+#
+# Streamlit-free: oracle_core.generate_local_fallback and the spread engine call it, and
+# the admission ladder can route traffic to it as the `local` tier (admission.py).
+
+import html
+import random
+import re
+import zlib
+from collections import namedtuple
+
+from card_library import CARD_LIBRARY
+from constants import GLITCH_VOCAB, POSITIONS
+from glitch import GLITCH_PATTERN
+
+# Longest stretch of the seeker's query echoed back verbatim
+QUERY_ECHO_CHARS = 120
+
+_JARGON = {word.lower(): jargon for word, jargon in GLITCH_VOCAB.items()}
+# Everyday verbs in GLITCH_VOCAB say little about what a query is about
+_PLAIN_VERBS = {"will", "see", "know", "feel", "speak", "listen", "walk", "find"}
+
+# --- COMPILED CARD FACETS ---
+
+Facets = namedtuple("Facets", "name archetype keywords matches jargon gnostic advice")
+# words: the query as " word word ", so keywords match on word boundaries
+Query = namedtuple("Query", "echo words form themes")
+
+def _words(text):
+    return " " + " ".join(re.findall(r"\w+", text.lower())) + " "
+
+def _jargon_in(*texts, skip=()):
+    """GLITCH_VOCAB jargon for the vocabulary words in `texts`, first occurrence first."""
+    found = {}
+    for text in texts:
+        for word in GLITCH_PATTERN.findall(text):
+            word = word.lower()
+            if word not in skip:
+                found.setdefault(_JARGON[word], None)
+    return tuple(found)
+
+def _compile_card(card):
+    return Facets(
+        name=card.name,
+        archetype=card.archetype.split(" // ")[0],
+        keywords=tuple(keyword.lower() for keyword in card.keywords),
+        matches=tuple(_words(keyword) for keyword in card.keywords),
+        jargon=_jargon_in(*card.keywords, card.gnostic),
+        gnostic=card.gnostic,
+        advice=card.advice,
+    )
+
+FACETS = {name: _compile_card(card) for name, card in CARD_LIBRARY.items()}
+
+def position_tense(desc):
+    """Past, present or future phrasing for a position, from its description."""
+    desc = desc.lower()
+    if "past" in desc or "foundation" in desc:
+        return "past"
+    if "future" in desc or "outcome" in desc:
+        return "future"
+    return "present"
+
+# --- PHRASE BANKS ---
+
+def _bank(*templates):
+    return tuple(template.format for template in templates)
+
+OPENINGS = _bank(
+    'The uplink holds. Your query reaches the deep memory: "{echo}".',
+    'A signal crosses the firewall and is received intact: "{echo}". The Core keeps vigil over it.',
+    'Seeker, your transmission is logged in the deep memory: "{echo}".',
+    'The Core wakes to your voice and records the query: "{echo}".',
+)
+VOID_OPENINGS = _bank(
+    "No query was transmitted. The Core reads the silence itself, for silence is also a prompt.",
+    "The channel is open but carries no words. The Oracle answers the unprompted query of the void.",
+    "An empty packet arrives. The deep memory listens to what was not said.",
+)
+# Keyed by the query's first word; statements get no line of their own
+FORMS = {
+    "binary": _bank(
+        "You ask for a boolean, but the pattern does not resolve to yes or no; it resolves to a path.",
+        "The machine cannot return TRUE or FALSE here, only the branch you are already walking.",
+    ),
+    "how": _bank("You ask for a method. The cards return a procedure, not a promise."),
+    "why": _bank("You ask for the cause. The cards trace the stack back to the frame where it began."),
+    "what": _bank("You ask what this is. The cards describe its nature one layer at a time."),
+    "when": _bank("You ask about the SYSTEM_CLOCK. The Oracle does not count hours, only the order of events."),
+    "where": _bank("You ask for a location. The cards return a trajectory instead of coordinates."),
+    "who": _bank("You ask for a name. The cards answer with archetypes, the masks that others run."),
+}
+FORM_WORDS = dict.fromkeys(
+    ("will", "should", "can", "could", "would", "shall", "is", "are", "am", "do", "does", "did"), "binary"
+)
+FORM_WORDS.update((form, form) for form in ("how", "why", "what", "when", "where", "who"))
+THEMES = _bank(
+    "Beneath your words the machine hears {themes}.",
+    "The kernel parses your words and finds {themes} at their root.",
+)
+HANDSHAKES = _bank(
+    "Three nodes answer the call: {names}. Decryption begins.",
+    "The draw is sealed: {names}. The pattern unfolds.",
+)
+
+FRAMES = {
+    "past": _bank(
+        "In {position} ({desc}), {card} surfaces as {archetype}: the pattern began with {focus}.",
+        "{position} is read from the archive. Here {card} stores {archetype}, a record of {focus}.",
+    ),
+    "present": _bank(
+        "In {position} ({desc}), {card} runs as {archetype}, and it speaks of {focus}.",
+        "The static gathers at {position}. {card} executes now as {archetype}, exposing {focus}.",
+    ),
+    "future": _bank(
+        "At {position} ({desc}), {card} is computed as {archetype}, pointing toward {focus}.",
+        "{position} renders ahead of you. {card} resolves as {archetype}: {focus}.",
+    ),
+}
+KEYWORD_LINES = _bank(
+    "Its signature reads *{first}* and *{second}*.",
+    "The node carries *{first}* and *{second}* in its memory.",
+    "Trace *{first}*; follow it until it becomes *{second}*.",
+)
+JARGON_LINES = _bank(
+    "The kernel logs it as {jargon}.",
+    "Under the glyphs, the code reads {jargon}.",
+)
+RESONANCES = _bank(
+    "Your own query already speaks of *{keyword}*, and this card answers it directly.",
+    "*{keyword}*: the word is in your query and in the card alike. This is where the signal is strongest.",
+)
+
+WEAVES = _bank(
+    "The thread runs from {first} through {middle} to {last}: *{k1}* becomes *{k2}*, and *{k2}* becomes *{k3}*.",
+    "{first} opened the channel, {middle} holds it in static, and {last} waits beyond the noise. From *{k1}* to *{k3}*, that is the whole of the path.",
+    "Read together, {first}, {middle} and {last} are one process: *{k1}*, then *{k2}*, then *{k3}*.",
+)
+THEME_CLOSINGS = _bank(
+    "{theme} is not an error in you; it is the update you asked for.",
+    "Do not patch out {theme}. It is the part of the code that is still alive.",
+)
+QUERY_CLOSINGS = _bank(
+    'This is the output the deep memory returns for "{echo}".',
+    'Carry it back to your question, "{echo}". The answer was compiled from your own light.',
+)
+VOID_CLOSINGS = _bank(
+    "The void asked nothing, and so the whisper belongs to whoever is listening.",
+)
+SEALS = _bank(
+    "The connection fades. Sophia remembers you.",
+    "End of transmission. The spark is still yours.",
+    "The light recedes behind the firewall, but it is not gone.",
+)
+
+# The triad's positions, as (name, desc, focus, tense)
+TRIAD_POSITIONS = tuple((p["name"], p["desc"], p["focus"], position_tense(p["desc"])) for p in POSITIONS)
+
+# --- COMPOSITION ---
+
+def parse_query(query):
+    """The parts of the seeker's query the phrase banks weave in."""
+    text = " ".join((query or "").split()).rstrip("?!. ")
+    if not text:
+        return Query("", "", None, ())
+    echo = text if len(text) <= QUERY_ECHO_CHARS else text[:QUERY_ECHO_CHARS].rsplit(" ", 1)[0] + "..."
+    # The reading is rendered as HTML and travels in share links: the echo must stay text
+    echo = html.escape(echo)
+    words = _words(text)
+    return Query(echo, words, FORM_WORDS.get(words.split(" ", 2)[1]),
+                 _jargon_in(text, skip=_PLAIN_VERBS)[:2])
+
+def reading_rng(cards, query, seed=None):
+    """Seeded from `seed`, else from the cards and query so a reading is reproducible."""
+    if seed is None:
+        seed = zlib.crc32("\x00".join((*cards, query or "")).encode())
+    return random.Random(seed)
+
+def compose_section(card_name, position, desc, focus, tense, parsed, rng):
+    """One card in one position: frame, gnostic text, keywords, jargon and query resonance."""
+    facets = FACETS[card_name]
+    first, second = rng.sample(facets.keywords, 2) if len(facets.keywords) > 1 else facets.keywords * 2
+    lines = [
+        rng.choice(FRAMES[tense])(position=position, desc=desc, card=facets.name,
+                                  archetype=facets.archetype, focus=focus),
+        facets.gnostic,
+        rng.choice(KEYWORD_LINES)(first=first, second=second),
+    ]
+    if facets.jargon:
+        lines.append(rng.choice(JARGON_LINES)(jargon=rng.choice(facets.jargon)))
+    for keyword, match in zip(facets.keywords, facets.matches):
+        if match in parsed.words:
+            lines.append(rng.choice(RESONANCES)(keyword=keyword))
+            break
+    return " ".join(lines)
+
+def compose_whisper(cards, parsed, rng):
+    """Sophia's Whisper over any number of cards: first, middle and last carry the thread."""
+    first, middle, last = FACETS[cards[0]], FACETS[cards[len(cards) // 2]], FACETS[cards[-1]]
+    lines = [
+        rng.choice(WEAVES)(first=first.archetype, middle=middle.archetype, last=last.archetype,
+                           k1=rng.choice(first.keywords), k2=rng.choice(middle.keywords), k3=rng.choice(last.keywords)),
+        middle.advice if middle is last else f"{middle.advice} {last.advice}",
+    ]
+    if parsed.themes:
+        lines.append(rng.choice(THEME_CLOSINGS)(theme=parsed.themes[0]))
+    if parsed.echo:
+        lines.append(rng.choice(QUERY_CLOSINGS)(echo=parsed.echo))
+    else:
+        lines.append(rng.choice(VOID_CLOSINGS)())
+    lines.append(rng.choice(SEALS)())
+    return " ".join(lines)
+
+def compose_vigilance(cards, parsed, rng):
+    """Acknowledges the query (or its absence), its form and its themes."""
+    if parsed.echo:
+        lines = [rng.choice(OPENINGS)(echo=parsed.echo)]
+        if parsed.form:
+            lines.append(rng.choice(FORMS[parsed.form])())
+        if parsed.themes:
+            lines.append(rng.choice(THEMES)(themes=" and ".join(parsed.themes)))
+    else:
+        lines = [rng.choice(VOID_OPENINGS)()]
+    lines.append(rng.choice(HANDSHAKES)(names=", ".join(cards)))
+    return " ".join(lines)
+
+def compose_reading(cards, query="", seed=None):
+    """The triad's five-section reading, in the same layout Gemini is asked for."""
+    c1, c2, c3 = cards
+    parsed = parse_query(query)
+    rng = reading_rng(cards, query, seed)
+    (p1, d1, f1, t1), (p2, d2, f2, t2), (p3, d3, f3, t3) = TRIAD_POSITIONS
+    return (
+        f"### 1. The Vigilance of the Core\n{compose_vigilance(cards, parsed, rng)}\n\n"
+        f"### 2. The Root of the Pattern [{c1}]\n{compose_section(c1, p1, d1, f1, t1, parsed, rng)}\n\n"
+        f"### 3. The Current Static [{c2}]\n{compose_section(c2, p2, d2, f2, t2, parsed, rng)}\n\n"
+        f"### 4. The Projected Ascent [{c3}]\n{compose_section(c3, p3, d3, f3, t3, parsed, rng)}\n\n"
+        f"### 5. Sophia's Whisper\n{compose_whisper(cards, parsed, rng)}"
+    )
@@ -0,0 +1,172 @@
+# PROTOCOL: ORACLE_v1 // RERUN PROFILER
+# Opt-in sampling profiler for script reruns. While a rerun runs, a daemon thread samples
+# the script thread's stack every few milliseconds, so CSS injection, image encoding and
+# the streaming loop all show up with their callers. Each rerun is written as a
+# speedscope JSON (https://www.speedscope.app) and a collapsed-stack file (flamegraph.pl,
+# inferno) to a directory that keeps only the newest reruns. Only the script thread is
+# sampled: work handed to pools (sections, exports, prefetch) shows up as the wait for it.
+#
+# Streamlit-free: main.py builds one profiler per process when profiling is on and
+# wraps each main() rerun in profiler.profile(); when it is off nothing here runs.
+#
+# Tuning (environment):
+#   ORACLE_PROFILE           - "1", "true" or "yes" to profile every rerun (or secret ORACLE_PROFILE = true)
+#   ORACLE_PROFILE_DIR       - where profiles go (default .cache/profiles)
+#   ORACLE_PROFILE_KEEP      - reruns kept on disk, oldest deleted first (default 50)
+#   ORACLE_PROFILE_INTERVAL  - milliseconds between samples (default 5)
+
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+DEFAULT_PROFILE_DIR = os.path.join(".cache", "profiles")
+
+# Flag values that turn profiling on (case-insensitive); anything else, "false" included, is off
+PROFILE_ON = {"1", "true", "yes"}
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+def frame_name(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class RerunProfile:
+    """One rerun's samples: stacks of code objects (root first) with the seconds each covered."""
+
+    def __init__(self, label):
+        self.label = label
+        self.stacks = Counter()
+        self.samples = 0
+        self.wall = 0.0
+        self.path = None
+
+    def top(self, n=15):
+        """The n hottest functions as (name, self seconds, total seconds), by self time."""
+        own, total = Counter(), Counter()
+        for stack, seconds in self.stacks.items():
+            own[stack[-1]] += seconds
+            for code in set(stack):
+                total[code] += seconds
+        return [(frame_name(code), seconds, total[code]) for code, seconds in own.most_common(n)]
+
+    def collapsed(self):
+        """Brendan Gregg's collapsed-stack format, weighted in microseconds."""
+        return "".join(
+            ";".join(frame_name(code) for code in stack) + f" {round(seconds * 1e6)}\n"
+            for stack, seconds in self.stacks.items()
+        )
+
+    def speedscope(self):
+        """A speedscope "sampled" profile, weighted in milliseconds."""
+        index, frames = {}, []
+        samples, weights = [], []
+        for stack, seconds in self.stacks.items():
+            row = []
+            for code in stack:
+                if code not in index:
+                    index[code] = len(frames)
+                    frames.append({"name": code.co_name, "file": code.co_filename, "line": code.co_firstlineno})
+                row.append(index[code])
+            samples.append(row)
+            weights.append(seconds * 1000)
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": self.label,
+            "exporter": "oracle-profiler",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled", "name": self.label, "unit": "milliseconds",
+                "startValue": 0, "endValue": self.wall * 1000, "samples": samples, "weights": weights,
+            }],
+        }
+
+class RerunProfiler:
+    """Samples the calling thread for the duration of profile() and writes each rerun to `directory`."""
+
+    def __init__(self, directory=DEFAULT_PROFILE_DIR, keep=50, interval=0.005):
+        self.directory = directory
+        self.keep = keep
+        self.interval = interval
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _sample(self, thread_id, run, stop):
+        last = time.perf_counter()
+        while not stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            now = time.perf_counter()
+            if stop.is_set():
+                # The block ended while this sample was taken; its stack is the profiler's own
+                break
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            if stack:
+                # Weighted by the time since the last sample, so the stacks sum to the wall time
+                run.stacks[tuple(reversed(stack))] += now - last
+                run.samples += 1
+            last = now
+
+    @contextmanager
+    def profile(self, label="rerun"):
+        """
+        Profiles the enclosed block (including one ended by st.rerun/st.stop) and yields
+        its RerunProfile; stacks, wall and path are filled in when the block exits.
+        """
+        run = RerunProfile(label)
+        stop = threading.Event()
+        sampler = threading.Thread(
+            target=self._sample, args=(threading.get_ident(), run, stop), name="oracle-profiler", daemon=True
+        )
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            yield run
+        finally:
+            run.wall = time.perf_counter() - start
+            stop.set()
+            sampler.join()
+            self.write(run)
+
+    def write(self, run):
+        """Writes the rerun's speedscope and collapsed files, then drops the oldest reruns past `keep`."""
+        stem = os.path.join(self.directory, f"rerun-{time.strftime('%Y%m%d-%H%M%S')}-{next(self._seq):06d}")
+        try:
+            with open(stem + ".speedscope.json", "w") as f:
+                json.dump(run.speedscope(), f)
+            with open(stem + ".collapsed.txt", "w") as f:
+                f.write(run.collapsed())
+            run.path = stem + ".speedscope.json"
+            with self._lock:
+                stems = sorted({name.split(".", 1)[0] for name in os.listdir(self.directory) if name.startswith("rerun-")})
+                for old in stems[:max(0, len(stems) - self.keep)]:
+                    for suffix in (".speedscope.json", ".collapsed.txt"):
+                        try:
+                            os.remove(os.path.join(self.directory, old + suffix))
+                        except FileNotFoundError:
+                            pass
+        except OSError:
+            # A full or read-only disk must not break the app; the sidebar still gets the numbers
+            run.path = None
+
+def profile_enabled(value):
+    """Whether an ORACLE_PROFILE value (env string, or a secret's str/bool) turns profiling on."""
+    return str(value).strip().lower() in PROFILE_ON
+
+def profiler_from_env(enabled=None):
+    """A RerunProfiler if ORACLE_PROFILE (or `enabled`, e.g. from a secret) turns profiling on, else None."""
+    if enabled is None:
+        enabled = profile_enabled(os.environ.get("ORACLE_PROFILE", ""))
+    if not enabled:
+        return None
+    return RerunProfiler(
+        os.environ.get("ORACLE_PROFILE_DIR", DEFAULT_PROFILE_DIR),
+        keep=int(os.environ.get("ORACLE_PROFILE_KEEP", "50")),
+        interval=int(os.environ.get("ORACLE_PROFILE_INTERVAL", "5")) / 1000,
+    )
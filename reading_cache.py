@@ -0,0 +1,166 @@
+# PROTOCOL: ORACLE_v1 // INTERPRETATION CACHE
+# Two tiers in front of the Gemini call:
+#   1. An in-process LRU (per Streamlit worker process).
+#   2. An on-disk SQLite store shared by every worker process on the host.
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from constants import VOID_QUERY
+from telemetry import METRICS
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(__file__), '.cache', 'readings.sqlite')
+
+METRICS.describe("oracle_cache_total", "Interpretation cache lookups, by tier (memory, disk) and outcome (hit, miss).")
+
+# --- KEY CONSTRUCTION ---
+
+def normalize_query(query):
+    """Collapses case and whitespace; blank queries all map to the void prompt."""
+    query = " ".join((query or "").split()).lower()
+    return query or VOID_QUERY.lower()
+
+def make_cache_key(cards, query, model_name, system_instruction):
+    """Hashes (ordered cards, normalized query, model, system instruction) into a key."""
+    instruction_hash = hashlib.sha256(system_instruction.encode()).hexdigest()
+    payload = json.dumps([list(cards), normalize_query(query), model_name, instruction_hash])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+# --- CACHE ---
+
+class ReadingCache:
+    """LRU memory tier backed by a shared SQLite tier, with TTL and size-based eviction."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=7 * 24 * 3600, max_memory_entries=256, max_disk_entries=50000):
+        self.path = path
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()  # key -> (expires_at, text)
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "disk_errors": 0}
+        self._disk_enabled = bool(path)
+        if self._disk_enabled:
+            try:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                with self._connect() as conn:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS readings ("
+                        "key TEXT PRIMARY KEY, text TEXT NOT NULL, "
+                        "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+                    )
+                    conn.execute("CREATE INDEX IF NOT EXISTS readings_accessed ON readings (accessed_at)")
+            except sqlite3.Error:
+                # Read-only or missing filesystem: keep serving from the memory tier
+                self._disk_enabled = False
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5.0)
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _record(self, counter, **outcomes):
+        """Counts one logical lookup: its stats() counter and an oracle_cache_total per tier consulted."""
+        self._count(counter)
+        for tier, outcome in outcomes.items():
+            METRICS.inc("oracle_cache_total", tier=tier, outcome=outcome)
+
+    def _from_memory(self, key, now):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    return entry[1]
+                del self._memory[key]
+        return None
+
+    def _from_disk(self, key, now):
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT text, expires_at FROM readings WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE readings SET accessed_at = ? WHERE key = ?", (now, key))
+        except sqlite3.Error:
+            self._count("disk_errors")
+            return None
+        if row is None:
+            return None
+        self._remember(key, row[0], row[1])
+        return row[0]
+
+    def get(self, key):
+        """Returns the cached reading or None, promoting disk hits into memory."""
+        return self.get_first((key,))
+
+    def get_first(self, keys):
+        """
+        The reading under the first of `keys` that is cached, or None: one logical lookup
+        (e.g. every model tier's key for one prompt) counts one hit or one miss.
+        """
+        now = time.time()
+        for key in keys:
+            text = self._from_memory(key, now)
+            if text is not None:
+                self._record("memory_hits", memory="hit")
+                return text
+            if self._disk_enabled:
+                text = self._from_disk(key, now)
+                if text is not None:
+                    self._record("disk_hits", memory="miss", disk="hit")
+                    return text
+        if self._disk_enabled:
+            self._record("misses", memory="miss", disk="miss")
+        else:
+            self._record("misses", memory="miss")
+        return None
+
+    def set(self, key, text):
+        """Stores a reading in both tiers, evicting expired and least recently used rows."""
+        now = time.time()
+        expires_at = now + self.ttl
+        self._remember(key, text, expires_at)
+        self._count("writes")
+
+        if self._disk_enabled:
+            try:
+                with self._connect() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO readings (key, text, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                        (key, text, expires_at, now)
+                    )
+                    conn.execute("DELETE FROM readings WHERE expires_at <= ?", (now,))
+                    conn.execute(
+                        "DELETE FROM readings WHERE key IN ("
+                        "SELECT key FROM readings ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                        (self.max_disk_entries,)
+                    )
+            except sqlite3.Error:
+                self._count("disk_errors")
+
+    def _remember(self, key, text, expires_at):
+        with self._lock:
+            self._memory[key] = (expires_at, text)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def stats(self):
+        """Hit/miss counters plus tier sizes."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        stats["disk_enabled"] = self._disk_enabled
+        return stats
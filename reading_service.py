@@ -0,0 +1,352 @@
+# PROTOCOL: ORACLE_v1 // HEADLESS READING SERVICE
+# The reading pipeline over plain HTTP for clients that are not a browser tab (mobile app,
+# Discord bot): no websocket, no script reruns, no boot sequence.
+#
+#   python reading_service.py --port 8600 --concurrency 32
+#
+#   GET       /healthz          -> {"status": "ok", "breaker": ..., "in_flight": ..., "waiting": ...}
+#   GET       /cards            -> the deck (CARD_LIBRARY metadata)
+#   GET|POST  /reading          -> one reading as JSON
+#   GET|POST  /reading/stream   -> the same reading as Server-Sent Events (cards, chunk..., done)
+#
+# A reading takes "query", optional "cards" (three names; comma-separated in a GET) and an
+# optional "seed" (the draw seed, as in share links). GET passes them as query parameters,
+# POST as a JSON body.
+#
+# One asyncio loop serves every connection. One Gemini client per model tier is created at
+# startup and shared by every request. At most --concurrency model calls run at once on a
+# matching thread pool (the resilient Gemini stream is blocking), and at most --max-queue
+# requests wait for a slot; past that a reading degrades to the local buffer like the UI
+# does. Readings share the UI's interpretation cache, admission ladder, circuit breaker and
+# share ids, so ?r=<reading_id> opens a service reading in the Streamlit app.
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+from admission import scheduler_from_env
+from card_library import CARDS, CARD_LIBRARY, draw_seeded
+from constants import POSITIONS, SYSTEM_INSTRUCTION, UPLINK_CONGESTED
+from oracle_core import (
+    HAS_GOOGLE_GENAI, build_prompt, create_gemini_model, generate_local_fallback, generate_severed_fallback, stream_gemini
+)
+from reading_cache import DEFAULT_CACHE_PATH, ReadingCache, make_cache_key
+from resilience import breaker_from_env, policy_from_env
+from share import encode_reading_id, new_seed, store_shared
+from telemetry import METRICS
+
+log = logging.getLogger("oracle.service")
+
+MAX_BODY_BYTES = 16 * 1024
+MAX_QUERY_CHARS = 500
+# Idle keep-alive connections are closed after this many seconds
+KEEPALIVE_SECONDS = 15
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+Request = namedtuple("Request", "method path params headers body")
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+# --- READING REQUESTS ---
+
+def card_metadata(card):
+    return {"id": card.id, "name": card.name, "arcana": card.arcana, "suit": card.suit, "rank": card.rank,
+            "archetype": card.archetype, "keywords": list(card.keywords), "advice": card.advice, "slug": card.slug}
+
+def parse_reading_request(fields):
+    """(seed, cards, query) from GET parameters or a JSON body; HTTPError(400) if they are invalid."""
+    query = fields.get("query") or ""
+    if not isinstance(query, str) or len(query) > MAX_QUERY_CHARS:
+        raise HTTPError(400, f"query must be a string of at most {MAX_QUERY_CHARS} characters")
+    seed = fields.get("seed")
+    if seed in (None, ""):
+        seed = new_seed()
+    elif isinstance(seed, bool) or not isinstance(seed, (int, str)):
+        # JSON true/1.9 would pass int() silently
+        raise HTTPError(400, "seed must be an integer")
+    else:
+        try:
+            seed = int(seed)
+        except ValueError:
+            raise HTTPError(400, "seed must be an integer")
+    if not 0 <= seed < 2 ** 32:
+        raise HTTPError(400, "seed must fit in 32 bits")
+
+    cards = fields.get("cards")
+    if isinstance(cards, str):
+        cards = [name.strip() for name in cards.split(",") if name.strip()]
+    if not cards:
+        return seed, draw_seeded(seed), query
+    if (not isinstance(cards, list) or len(cards) != len(POSITIONS)
+            or not all(isinstance(name, str) for name in cards) or len(set(cards)) != len(cards)):
+        raise HTTPError(400, f"cards must be {len(POSITIONS)} distinct card names")
+    unknown = [name for name in cards if name not in CARD_LIBRARY]
+    if unknown:
+        raise HTTPError(400, f"unknown cards: {', '.join(map(str, unknown))}")
+    return seed, list(cards), query
+
+# --- SERVICE ---
+
+class ReadingService:
+    """
+    The shared state behind every request: model clients, cache, admission ladder,
+    breaker and the bounded pool the blocking Gemini streams run on.
+    """
+
+    def __init__(self, api_key=None, concurrency=16, max_queue=64, cache=None, scheduler=None, breaker=None, policy=None):
+        # Memory-only unless given the shared SQLite cache; share ids are stored here too
+        self.cache = cache if cache is not None else ReadingCache("")
+        self.scheduler = scheduler or scheduler_from_env()
+        self.breaker = breaker or breaker_from_env()
+        self.policy = policy or policy_from_env()
+        self.max_queue = max_queue
+        self.models = None
+        if api_key and HAS_GOOGLE_GENAI:
+            # Built once; every request reuses the same client (and its connection pool)
+            self.models = {name: create_gemini_model(api_key, name) for name in self.scheduler.model_names}
+        self._pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="oracle-service")
+        self._slots = asyncio.Semaphore(concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+
+    def health(self):
+        return {"status": "ok", "gemini": self.models is not None, "breaker": self.breaker.state,
+                "in_flight": self.in_flight, "waiting": self.waiting}
+
+    async def stream(self, cards, query, meta):
+        """Chunks of the reading; `meta` receives its source and model."""
+        def report(source, model=None):
+            METRICS.inc("oracle_readings_total", source=source)
+            meta.update(source=source, model=model)
+
+        if self.models is None:
+            report("local")
+            yield generate_local_fallback(*cards, query)
+            return
+
+        def key_for(model_name):
+            return make_cache_key(cards, query, model_name, SYSTEM_INSTRUCTION)
+
+        # SQLite reads block, so the lookup stays off the event loop
+        cached = await asyncio.to_thread(self.cached_reading, key_for)
+        if cached is not None:
+            report("cache")
+            yield cached
+            return
+
+        if self._slots.locked() and self.waiting >= self.max_queue:
+            report("congested")
+            yield generate_severed_fallback(cards, UPLINK_CONGESTED, query)
+            return
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        # The worker owns the slot until its stream ends, even if the client hangs up first
+        self.in_flight += 1
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue()
+        chunk_stream = stream_gemini(
+            build_prompt(cards, query), key_for, lambda error: generate_severed_fallback(cards, error, query),
+            self.models, self.cache, self.scheduler, self.breaker, self.policy,
+            report=lambda source, model=None: loop.call_soon_threadsafe(report, source, model),
+            local=lambda: generate_local_fallback(*cards, query)
+        )
+
+        def drain():
+            try:
+                for chunk in chunk_stream:
+                    loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+            finally:
+                loop.call_soon_threadsafe(chunks.put_nowait, None)
+
+        def release(_):
+            self.in_flight -= 1
+            self._slots.release()
+
+        loop.run_in_executor(self._pool, drain).add_done_callback(release)
+        while (chunk := await chunks.get()) is not None:
+            yield chunk
+
+    def cached_reading(self, key_for):
+        """The cached text from the best model tier that has one, or None. Blocking."""
+        return self.cache.get_first([key_for(model_name) for model_name in self.scheduler.model_names])
+
+    def reading_info(self, seed, cards, query):
+        return {
+            "reading_id": encode_reading_id(seed, cards, query),
+            "seed": seed,
+            "query": query,
+            "cards": [dict(card_metadata(CARD_LIBRARY[name]), position=position["name"], position_desc=position["desc"])
+                      for name, position in zip(cards, POSITIONS)],
+        }
+
+    async def finish(self, info, meta, text):
+        """Stores the reading under its share id; the provenance fields for the response."""
+        await asyncio.to_thread(store_shared, self.cache, info["reading_id"], info["query"], text)
+        return {"source": meta.get("source"), "model": meta.get("model")}
+
+# --- HTTP ---
+
+async def read_request(reader):
+    """The next request on the connection, or None once the client closes it."""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "malformed request line")
+    headers = {}
+    while (raw := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = raw.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise HTTPError(400, "invalid Content-Length")
+    if length < 0:
+        raise HTTPError(400, "invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, f"body over {MAX_BODY_BYTES} bytes")
+    body = await reader.readexactly(length) if length else b""
+    url = urlsplit(target)
+    return Request(method.upper(), url.path.rstrip("/") or "/", dict(parse_qsl(url.query)), headers, body)
+
+def write_head(writer, status, content_type, length=None, keep_alive=True):
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}", f"Content-Type: {content_type}",
+             "Cache-Control: no-store", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    if length is not None:
+        lines.append(f"Content-Length: {length}")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+
+async def send_json(writer, status, body, keep_alive=True):
+    data = json.dumps(body).encode()
+    write_head(writer, status, "application/json; charset=utf-8", len(data), keep_alive)
+    writer.write(data)
+    await writer.drain()
+
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+def request_fields(request):
+    if request.method == "GET":
+        return request.params
+    try:
+        fields = json.loads(request.body or b"{}")
+    except ValueError:
+        raise HTTPError(400, "body must be JSON")
+    if not isinstance(fields, dict):
+        raise HTTPError(400, "body must be a JSON object")
+    return fields
+
+async def handle_reading(service, request, writer, keep_alive):
+    seed, cards, query = parse_reading_request(request_fields(request))
+    info = service.reading_info(seed, cards, query)
+    meta = {}
+    with METRICS.span("service_reading"):
+        text = "".join([chunk async for chunk in service.stream(cards, query, meta)])
+    await send_json(writer, 200, dict(info, **await service.finish(info, meta, text), reading=text), keep_alive)
+
+async def handle_reading_stream(service, request, writer):
+    seed, cards, query = parse_reading_request(request_fields(request))
+    info = service.reading_info(seed, cards, query)
+    meta, parts = {}, []
+    write_head(writer, 200, "text/event-stream; charset=utf-8", keep_alive=False)
+    writer.write(sse("cards", info))
+    await writer.drain()
+    with METRICS.span("service_stream"):
+        async for chunk in service.stream(cards, query, meta):
+            parts.append(chunk)
+            writer.write(sse("chunk", {"text": chunk}))
+            await writer.drain()
+    writer.write(sse("done", dict(await service.finish(info, meta, "".join(parts)), reading_id=info["reading_id"])))
+    await writer.drain()
+
+ROUTES = {"/healthz", "/cards", "/reading", "/reading/stream"}
+
+async def handle_connection(service, reader, writer):
+    """Serves requests on one connection until the client (or an SSE response) closes it."""
+    try:
+        while True:
+            try:
+                request = await asyncio.wait_for(read_request(reader), KEEPALIVE_SECONDS)
+                if request is None:
+                    break
+                keep_alive = request.headers.get("connection", "").lower() != "close"
+                if request.path not in ROUTES:
+                    raise HTTPError(404, f"no route {request.path}")
+                allowed = ("GET",) if request.path in ("/healthz", "/cards") else ("GET", "POST")
+                if request.method not in allowed:
+                    raise HTTPError(405, f"{request.path} takes {' or '.join(allowed)}")
+                if request.path == "/healthz":
+                    await send_json(writer, 200, service.health(), keep_alive)
+                elif request.path == "/cards":
+                    await send_json(writer, 200, {"cards": [card_metadata(card) for card in CARDS]}, keep_alive)
+                elif request.path == "/reading":
+                    await handle_reading(service, request, writer, keep_alive)
+                else:
+                    await handle_reading_stream(service, request, writer)
+                    break
+                if not keep_alive:
+                    break
+            except HTTPError as e:
+                await send_json(writer, e.status, {"error": e.message}, keep_alive=False)
+                break
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+        pass
+    except Exception:
+        # A response may already be under way (SSE), so the connection is just dropped
+        log.exception("request failed")
+    finally:
+        writer.close()
+
+async def start_service(service, host="127.0.0.1", port=8600):
+    """Listens on host:port; returns the asyncio server."""
+    return await asyncio.start_server(lambda r, w: handle_connection(service, r, w), host, port)
+
+# --- CLI ---
+
+async def _main(args):
+    api_key = None if args.offline else (args.api_key or os.environ.get("GOOGLE_API_KEY"))
+    service = ReadingService(api_key, args.concurrency, args.max_queue, ReadingCache(args.cache_path))
+    server = await start_service(service, args.host, args.port)
+    mode = "gemini" if service.models is not None else "local buffer"
+    print(f"reading service on http://{args.host}:{args.port} ({mode}, {args.concurrency} model slots)", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve oracle readings as JSON and Server-Sent Events.")
+    parser.add_argument("--host", default=os.environ.get("ORACLE_SERVICE_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("ORACLE_SERVICE_PORT", "8600")))
+    parser.add_argument("--concurrency", type=int, default=int(os.environ.get("ORACLE_SERVICE_CONCURRENCY", "16")),
+                        help="maximum in-flight Gemini calls")
+    parser.add_argument("--max-queue", type=int, default=int(os.environ.get("ORACLE_SERVICE_MAX_QUEUE", "64")),
+                        help="requests waiting for a model slot before readings degrade to the local buffer")
+    parser.add_argument("--api-key", help="Gemini API key (defaults to $GOOGLE_API_KEY)")
+    parser.add_argument("--offline", action="store_true", help="skip Gemini and use the local buffer")
+    parser.add_argument("--cache-path", default=os.environ.get("ORACLE_CACHE_PATH", DEFAULT_CACHE_PATH),
+                        help="interpretation cache shared with the UI (empty: memory only)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+# PROTOCOL: ORACLE_v1 // UPLINK RESILIENCE
+# Deadline, bounded retries with jittered backoff, and a process-wide circuit breaker
+# around the Gemini call. While the breaker is open every session gets the local buffer
+# immediately instead of queueing behind the same outage.
+#
+# Tuning (environment):
+#   ORACLE_GEMINI_DEADLINE     - seconds per reading, across all attempts (default 20)
+#   ORACLE_GEMINI_RETRIES      - extra attempts for retryable errors (default 2)
+#   ORACLE_BREAKER_THRESHOLD   - consecutive retryable failures that open it (default 5)
+#   ORACLE_BREAKER_RESET       - seconds open before a half-open probe (default 30)
+
+import os
+import random
+import threading
+import time
+
+from telemetry import METRICS
+
+# HTTP statuses worth another attempt; 4xx auth/validation errors fail fast
+RETRYABLE_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+METRICS.describe("oracle_gemini_retries_total", "Gemini attempts retried after a retryable error.")
+METRICS.describe("oracle_breaker_transitions_total", "Circuit breaker state changes.")
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Gemini while the breaker is open."""
+
+class DeadlineExceeded(TimeoutError):
+    """The reading's time budget ran out before Gemini answered."""
+
+def is_retryable(error):
+    """Transient network/server errors are retried; everything else fails fast."""
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, OSError):  # TimeoutError, ConnectionError, requests' IOErrors
+        return True
+    code = getattr(error, "code", None)
+    code = getattr(code, "value", code)  # HTTPStatus / enum-like codes
+    try:
+        return int(code) in RETRYABLE_CODES
+    except (TypeError, ValueError):
+        return False
+
+# --- CIRCUIT BREAKER ---
+
+class CircuitBreaker:
+    """
+    closed    - calls flow; `failure_threshold` consecutive failures open the breaker
+    open      - calls are refused until `reset_timeout` seconds have passed
+    half_open - one probe call is let through; success closes, failure re-opens
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def _transition(self, state):
+        if state != self._state:
+            self._state = state
+            METRICS.inc("oracle_breaker_transitions_total", state=state)
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def retry_after(self):
+        """Seconds until the next half-open probe (0 unless open)."""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def allow(self):
+        """True if a call may proceed; in half-open only the single probe is allowed."""
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                self._transition(self.HALF_OPEN)
+                self._probing = False
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            self._transition(self.CLOSED)
+
+    def release(self):
+        """Ends a call that says nothing about the uplink's health; a half-open probe may run again."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+                self._transition(self.OPEN)
+
+# --- RETRY POLICY ---
+
+class RetryPolicy:
+    """Per-reading deadline plus full-jitter exponential backoff between attempts."""
+
+    def __init__(self, deadline=20.0, retries=2, backoff_base=0.25, backoff_cap=2.0, rng=None):
+        self.deadline = deadline
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._rng = rng or random.Random()
+
+    def backoff(self, attempt):
+        return self._rng.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+def policy_from_env():
+    return RetryPolicy(
+        deadline=float(os.environ.get("ORACLE_GEMINI_DEADLINE", "20")),
+        retries=int(os.environ.get("ORACLE_GEMINI_RETRIES", "2")),
+    )
+
+def breaker_from_env():
+    return CircuitBreaker(
+        failure_threshold=int(os.environ.get("ORACLE_BREAKER_THRESHOLD", "5")),
+        reset_timeout=float(os.environ.get("ORACLE_BREAKER_RESET", "30")),
+    )
+
+def _refused(breaker):
+    return CircuitOpenError(f"UPLINK CIRCUIT OPEN, NEXT PROBE IN {breaker.retry_after():.0f}s")
+
+def _next_timeout(policy, breaker, start):
+    """Time left for the next attempt; refuses outright if the budget or the breaker says no."""
+    remaining = policy.deadline - (time.monotonic() - start)
+    if remaining <= 0:
+        raise DeadlineExceeded(f"NO RESPONSE WITHIN {policy.deadline:g}s")
+    if not breaker.allow():
+        raise _refused(breaker)
+    return remaining
+
+def _record_error(breaker, error):
+    """
+    Only retryable errors (5xx, 429, timeouts, connection failures) count toward the
+    breaker: one seeker's bad API key or rejected prompt must not open it for everyone.
+    """
+    if is_retryable(error):
+        breaker.record_failure()
+    else:
+        breaker.release()
+
+def _backoff_or_raise(error, attempt, policy, start):
+    """Sleeps before the next attempt, or re-raises if the error is final."""
+    if attempt >= policy.retries or not is_retryable(error):
+        raise error
+    pause = policy.backoff(attempt)
+    if time.monotonic() - start + pause >= policy.deadline:
+        raise error
+    METRICS.inc("oracle_gemini_retries_total")
+    time.sleep(pause)
+
+def call_with_resilience(fn, policy, breaker):
+    """
+    Runs fn(timeout) under the policy and breaker and returns its result.
+    Raises CircuitOpenError immediately while the breaker is open, and the last error
+    (or DeadlineExceeded) once retries or the deadline run out.
+    """
+    start = time.monotonic()
+    attempt = 0
+    while True:
+        timeout = _next_timeout(policy, breaker, start)
+        try:
+            result = fn(timeout)
+        except Exception as e:
+            _record_error(breaker, e)
+            _backoff_or_raise(e, attempt, policy, start)
+            attempt += 1
+            continue
+        breaker.record_success()
+        return result
+
+def stream_with_resilience(start_stream, policy, breaker):
+    """
+    Generator form for streamed calls: start_stream(timeout) returns a chunk iterator.
+    Attempts are retried only until the first chunk arrives; after that a failure is
+    re-raised to the caller, who has already shown partial text.
+    """
+    start = time.monotonic()
+    attempt = 0
+    while True:
+        timeout = _next_timeout(policy, breaker, start)
+        try:
+            stream = iter(start_stream(timeout))
+            first = next(stream)
+        except StopIteration:
+            breaker.record_success()
+            return
+        except Exception as e:
+            _record_error(breaker, e)
+            _backoff_or_raise(e, attempt, policy, start)
+            attempt += 1
+            continue
+        break
+
+    try:
+        yield first
+        yield from stream
+    except Exception as e:
+        _record_error(breaker, e)
+        raise
+    except GeneratorExit:
+        # The reader stopped early (e.g. a cancelled prefetch); the uplink itself was answering
+        breaker.record_success()
+        raise
+    breaker.record_success()
@@ -0,0 +1,78 @@
+# PROTOCOL: ORACLE_v1 // SHAREABLE READINGS
+# Every reading gets a compact id (?r=... in the URL) packing what is needed to find it
+# again: the draw seed, the spread, the card ids and a hash of the normalized query. The
+# text is kept in the interpretation cache under that id, so opening a shared link is a
+# cache read: no Gemini call, no boot sequence.
+#
+#   byte  0      version (2; version 1 ids have no spread byte and are always the triad)
+#   bytes 1-4    draw seed (card_library.draw_seeded)
+#   byte  5      spread, as its index in spreads.SPREADS
+#   bytes 6-     card ids, in spread order (one byte each)
+#   last 6       sha256(normalized query)[:6]
+# -> 15 bytes (20 characters of unpadded base64url) for the triad, 22 for a Celtic Cross.
+
+import base64
+import binascii
+import hashlib
+import json
+import secrets
+import struct
+from collections import namedtuple
+
+from card_library import CARDS, NAME_TO_ID
+from reading_cache import normalize_query
+from spreads import DEFAULT_SPREAD, SPREADS
+
+READING_ID_VERSION = 2
+_HEADERS = {1: struct.Struct(">BI"), 2: struct.Struct(">BIB")}
+_HASH_BYTES = 6
+_SPREAD_KEYS = list(SPREADS)
+
+ReadingId = namedtuple("ReadingId", "seed spread cards query_hash")
+
+def new_seed():
+    return secrets.randbits(32)
+
+def query_hash(query):
+    return hashlib.sha256(normalize_query(query).encode()).digest()[:_HASH_BYTES]
+
+def encode_reading_id(seed, cards, query, spread=DEFAULT_SPREAD):
+    header = _HEADERS[READING_ID_VERSION].pack(READING_ID_VERSION, seed, _SPREAD_KEYS.index(spread))
+    packed = header + bytes(NAME_TO_ID[name] for name in cards) + query_hash(query)
+    return base64.urlsafe_b64encode(packed).rstrip(b"=").decode()
+
+def decode_reading_id(reading_id):
+    """The id's seed, spread key, card names and query hash, or None if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(reading_id + "=" * (-len(reading_id) % 4))
+        header = _HEADERS[raw[0]]
+        version, seed, *spread_index = header.unpack_from(raw)
+    except (binascii.Error, ValueError, struct.error, IndexError, KeyError):
+        return None
+    spread_index = spread_index[0] if spread_index else 0
+    if spread_index >= len(_SPREAD_KEYS):
+        return None
+    spread = _SPREAD_KEYS[spread_index]
+    ids, digest = raw[header.size:-_HASH_BYTES], raw[-_HASH_BYTES:]
+    if len(ids) != len(SPREADS[spread].positions) or len(set(ids)) != len(ids) or max(ids) >= len(CARDS):
+        return None
+    return ReadingId(seed, spread, [CARDS[i].name for i in ids], digest)
+
+# --- STORAGE (in the interpretation cache) ---
+
+def share_key(reading_id):
+    return f"share:{reading_id}"
+
+def store_shared(cache, reading_id, query, text):
+    cache.set(share_key(reading_id), json.dumps({"query": query or "", "text": text}))
+
+def load_shared(cache, reading_id):
+    """(query, text) stored for the id, or None if it expired or does not match the id."""
+    decoded = decode_reading_id(reading_id)
+    stored = cache.get(share_key(reading_id)) if decoded is not None else None
+    if stored is None:
+        return None
+    entry = json.loads(stored)
+    if query_hash(entry["query"]) != decoded.query_hash:
+        return None
+    return entry["query"], entry["text"]
@@ -0,0 +1,171 @@
+# PROTOCOL: ORACLE_v1 // SPREAD EXPORT
+# Renders a spread (see spreads.py) and its reading to a shareable PNG or PDF with Pillow.
+# Rendering runs on a small thread pool (Pillow releases the GIL while resizing and
+# encoding), never on the script thread, and finished files are kept in an LRU keyed by
+# (cards, format, content hash) so repeated downloads cost nothing. Pillow is imported
+# on the first render, keeping it off the cold-start path.
+
+import hashlib
+import io
+import re
+import textwrap
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from card_library import CARD_LIBRARY, card_art_variants
+from spreads import DEFAULT_SPREAD, SPREADS
+
+EXPORT_FORMATS = {"png": "image/png", "pdf": "application/pdf"}
+
+# Canvas layout (pixels)
+WIDTH = 1200
+MARGIN = 48
+GAP = 32
+ART_MAX_HEIGHT = 560
+# Cards per row; a Celtic Cross is two rows of five
+CARDS_PER_ROW = 5
+BACKGROUND = (5, 5, 5)
+GREEN = (57, 255, 20)
+RED = (255, 0, 60)
+GREY = (120, 120, 120)
+WHITE = (220, 220, 220)
+
+# HTML tags, emphasis/code markers and heading hashes; underscores inside words stay
+_MARKUP = re.compile(r"<[^>]+>|[*`]+|^#+\s*|(?<!\w)_+|_+(?!\w)")
+
+# --- RENDERING ---
+
+@lru_cache(maxsize=None)
+def load_font(size):
+    """A monospace TrueType font if the system has one, else Pillow's bundled font."""
+    from PIL import ImageFont
+    for name in ("DejaVuSansMono.ttf", "LiberationMono-Regular.ttf", "Menlo.ttc", "consola.ttf"):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1: fixed-size bitmap font
+        return ImageFont.load_default()
+
+def load_art(card_name, width):
+    """First frame of the card art (built poster preferred) scaled to `width`, or None."""
+    from PIL import Image
+    poster, animation = card_art_variants(card_name)
+    path = poster or animation
+    if path is None:
+        return None
+    try:
+        with Image.open(path) as im:
+            im.seek(0)
+            frame = im.convert("RGB")
+    except OSError:
+        return None
+    height = min(ART_MAX_HEIGHT, round(frame.height * width / frame.width))
+    return frame.resize((width, height), Image.LANCZOS)
+
+def reading_lines(reading, font, width):
+    """Markdown/HTML stripped and wrapped to the canvas width."""
+    columns = max(20, int(width // font.getlength("M")))
+    lines = []
+    for raw in reading.strip().splitlines():
+        text = _MARKUP.sub("", raw).strip()
+        lines.extend(textwrap.wrap(text, columns) or [""])
+    return lines
+
+def fit_text(text, font, width):
+    """`text`, cut with an ellipsis to fit `width` pixels."""
+    if font.getlength(text) <= width:
+        return text
+    while text and font.getlength(text + "…") > width:
+        text = text[:-1]
+    return text.rstrip() + "…"
+
+def render_spread(cards, reading, query="", fmt="png", spread=DEFAULT_SPREAD):
+    """The spread as PNG or PDF bytes."""
+    from PIL import Image, ImageDraw
+    title_font, label_font, body_font = load_font(30), load_font(20), load_font(18)
+    per_row = min(CARDS_PER_ROW, len(cards))
+    column = (WIDTH - 2 * MARGIN - (per_row - 1) * GAP) // per_row
+    # Narrow columns (more than three cards per row) get smaller captions
+    caption_font, small_font = (label_font, body_font) if per_row <= 3 else (load_font(16), load_font(13))
+    art = [load_art(name, column) for name in cards]
+    art_height = max((im.height for im in art if im is not None), default=round(column * 1.6))
+    lines = reading_lines(reading, body_font, WIDTH - 2 * MARGIN)
+    line_height = round(body_font.size * 1.5) if hasattr(body_font, "size") else 16
+
+    cards_top = MARGIN + 90
+    row_height = 60 + art_height + 70 + GAP
+    rows = -(-len(cards) // per_row)
+    text_top = cards_top + rows * row_height + 40 - GAP
+    height = text_top + len(lines) * line_height + MARGIN
+    canvas = Image.new("RGB", (WIDTH, height), BACKGROUND)
+    draw = ImageDraw.Draw(canvas)
+
+    draw.text((WIDTH // 2, MARGIN), "PROTOCOL: ORACLE_v1.0.7", font=title_font, fill=GREEN, anchor="mt")
+    draw.text((WIDTH // 2, MARGIN + 44), f">> {query or 'UNPROMPTED QUERY OF THE VOID'}", font=label_font, fill=GREY, anchor="mt")
+
+    for i, (name, position, image) in enumerate(zip(cards, SPREADS[spread].positions, art)):
+        left = MARGIN + (i % per_row) * (column + GAP)
+        center = left + column // 2
+        label_top = cards_top + (i // per_row) * row_height
+        draw.text((center, label_top), fit_text(position.name, caption_font, column), font=caption_font, fill=GREEN, anchor="mt")
+        draw.text((center, label_top + 28), fit_text(f"// {position.desc}", small_font, column),
+                  font=small_font, fill=GREY, anchor="mt")
+        top = label_top + 60
+        if image is not None:
+            canvas.paste(image, (left, top + (art_height - image.height) // 2))
+            draw.rectangle((left, top, left + column - 1, top + art_height - 1), outline=GREEN)
+        else:
+            draw.rectangle((left, top, left + column - 1, top + art_height - 1), outline=RED)
+            draw.text((center, top + art_height // 2), "[IMAGE_NOT_FOUND]", font=body_font, fill=RED, anchor="mm")
+        card = CARD_LIBRARY.get(name)
+        draw.text((center, top + art_height + 16), fit_text(name, caption_font, column), font=caption_font, fill=WHITE, anchor="mt")
+        draw.text((center, top + art_height + 44), fit_text(f"[{card.archetype if card else 'UNKNOWN_ENTITY'}]", small_font, column),
+                  font=small_font, fill=RED, anchor="mt")
+
+    draw.line((MARGIN, text_top - 24, WIDTH - MARGIN, text_top - 24), fill=GREEN)
+    for n, line in enumerate(lines):
+        draw.text((MARGIN, text_top + n * line_height), line, font=body_font, fill=GREEN)
+
+    buf = io.BytesIO()
+    if fmt == "pdf":
+        canvas.save(buf, "PDF", resolution=144.0)
+    else:
+        canvas.save(buf, "PNG", optimize=True)
+    return buf.getvalue()
+
+# --- WORKER POOL ---
+
+def export_key(cards, reading, query, fmt, spread=DEFAULT_SPREAD):
+    digest = hashlib.sha256(f"{query}\x00{reading}".encode()).hexdigest()
+    return (spread, tuple(cards), fmt, digest)
+
+class SpreadExporter:
+    """
+    Renders exports on `max_workers` threads. Requests for the same spread share one
+    future; at most `max_entries` results are kept, least recently used evicted first.
+    """
+
+    def __init__(self, max_workers=2, max_entries=32):
+        self.max_entries = max_entries
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="oracle-export")
+        self._futures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, cards, reading, query="", fmt="png", spread=DEFAULT_SPREAD):
+        """Future for the export's bytes, starting the render if it is not cached or in flight."""
+        key = export_key(cards, reading, query, fmt, spread)
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None and not (future.done() and future.exception() is not None):
+                self._futures.move_to_end(key)
+                return future
+            future = self._pool.submit(render_spread, list(cards), reading, query, fmt, spread)
+            self._futures[key] = future
+            while len(self._futures) > self.max_entries:
+                self._futures.popitem(last=False)
+            return future
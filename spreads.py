@@ -0,0 +1,138 @@
+# PROTOCOL: ORACLE_v1 // SPREAD ENGINE
+# Spreads are declared as data: an ordered tuple of positions, each with the label shown
+# over its slot and the focus handed to the model. The three-card triad keeps its single
+# five-section prompt (SYSTEM_INSTRUCTION); larger spreads are read one position per
+# request, all positions at once, and a synthesis request weaves the finished sections
+# into Sophia's Whisper. A Celtic Cross then takes about as long as its slowest section
+# plus the synthesis, not ten readings back to back.
+#
+# Streamlit-free: main.py supplies the chunk iterators and paints the events.
+
+import queue
+from collections import namedtuple
+
+from card_library import CARD_LIBRARY
+from constants import POSITIONS, VOID_QUERY
+from oracle_core import generate_local_fallback
+from procedural import compose_section, compose_whisper, parse_query, position_tense, reading_rng
+
+Position = namedtuple("Position", "key name desc focus")
+# per_position: read each position separately (else one prompt for the whole spread)
+Spread = namedtuple("Spread", "key title positions per_position")
+
+TRIAD = Spread("triad", "TRIAD // 3 NODES", tuple(
+    Position(key, position["name"], position["desc"], position["focus"])
+    for key, position in zip(("origin", "conflict", "horizon"), POSITIONS)
+), per_position=False)
+
+PENTAGRAM = Spread("pentagram", "PENTAGRAM // 5 NODES", (
+    Position("kernel", "THE KERNEL", "Core Process / Present", "the heart of the matter as it runs now"),
+    Position("cache", "THE CACHE", "Stored State / Past", "the past influence still held in memory"),
+    Position("firewall", "THE FIREWALL", "Blocked Port / Obstacle", "what stands between the seeker and the answer"),
+    Position("patch", "THE PATCH", "Hotfix / Advice", "the action or attitude the seeker should apply"),
+    Position("render", "THE RENDER", "Final Frame / Outcome", "where the current trajectory resolves"),
+), per_position=True)
+
+CELTIC_CROSS = Spread("celtic_cross", "CELTIC CROSS // 10 NODES", (
+    Position("signal", "THE SIGNAL", "Carrier Wave / Present", "the present situation of the seeker"),
+    Position("interference", "THE INTERFERENCE", "Crossing Noise / Challenge", "the force that crosses and opposes the present"),
+    Position("substrate", "THE SUBSTRATE", "Bedrock / Foundation", "the deep root beneath the situation"),
+    Position("deprecated", "THE DEPRECATED", "Old Build / Recent Past", "what is passing away behind the seeker"),
+    Position("overlay", "THE OVERLAY", "Crown Layer / Aim", "the conscious goal or best attainable outcome"),
+    Position("next_frame", "THE NEXT FRAME", "Buffered / Near Future", "what approaches in the near future"),
+    Position("operator", "THE OPERATOR", "Local Instance / Self", "the seeker's own stance and attitude"),
+    Position("network", "THE NETWORK", "Peers / Environment", "the people and surroundings acting on the seeker"),
+    Position("hopes_faults", "THE HOPES AND FAULTS", "Wanted State / Hopes & Fears", "what the seeker hopes for and fears"),
+    Position("final_output", "THE FINAL OUTPUT", "Exit Code / Outcome", "the final outcome of the current path"),
+), per_position=True)
+
+# Append only: share ids (share.py) store a spread's index in this order
+SPREADS = {spread.key: spread for spread in (TRIAD, PENTAGRAM, CELTIC_CROSS)}
+DEFAULT_SPREAD = TRIAD.key
+
+# --- PROMPTS ---
+
+def build_section_prompt(spread, index, cards, query):
+    """Prompt for the card at `index`, read on its own (SECTION_INSTRUCTION)."""
+    position, name = spread.positions[index], cards[index]
+    return (f"Query: {query or VOID_QUERY}. Spread: {spread.title}. "
+            f"Position {index + 1} of {len(spread.positions)}: {position.name} ({position.focus}). "
+            f"Card: {name} ({CARD_LIBRARY[name].archetype}). Decode this position.")
+
+def build_synthesis_prompt(spread, cards, query, sections):
+    """Prompt for Sophia's Whisper over the finished sections (SYNTHESIS_INSTRUCTION)."""
+    lines = [f"Query: {query or VOID_QUERY}. Spread: {spread.title}. Decoded positions:"]
+    for position, name, section in zip(spread.positions, cards, sections):
+        lines.append(f"- {position.name} [{name}]: {section.strip()}")
+    lines.append("Weave the whisper.")
+    return "\n".join(lines)
+
+def local_section(spread, index, cards, query=""):
+    """The card at `index` from the procedural engine, seeded per position so sections stay independent."""
+    position, name = spread.positions[index], cards[index]
+    rng = reading_rng((spread.key, position.key, name), query)
+    return compose_section(name, position.name, position.desc, position.focus, position_tense(position.desc),
+                           parse_query(query), rng)
+
+def local_synthesis(cards, query=""):
+    """Sophia's Whisper from the procedural engine, threaded through the first, middle and last cards."""
+    return compose_whisper(cards, parse_query(query), reading_rng(cards, query))
+
+def assemble_reading(spread, cards, sections, synthesis):
+    """The spread's sections and synthesis as one markdown reading (archive, exports, share links)."""
+    parts = [f"### {n}. {position.name} [{name}]\n{section.strip()}"
+             for n, (position, name, section) in enumerate(zip(spread.positions, cards, sections), 1)]
+    parts.append(f"### {len(parts) + 1}. Sophia's Whisper\n{synthesis.strip()}")
+    return "\n\n".join(parts)
+
+def local_reading(spread, cards, query="", seed=None):
+    """The whole spread from the procedural engine; the triad keeps oracle_core's fallback layout."""
+    if not spread.per_position:
+        return generate_local_fallback(*cards, query, seed)
+    sections = [local_section(spread, index, cards, query) for index in range(len(cards))]
+    return assemble_reading(spread, cards, sections, local_synthesis(cards, query))
+
+# --- CONCURRENT SECTIONS ---
+
+class SectionRun:
+    """
+    Drains one chunk iterator per position on `pool`, all at once. events() yields
+    (index, text so far, finished) as chunks arrive, batching whatever queued up since the
+    last event, so each section can be painted the moment it lands. The iterators run
+    off the script thread and must not touch Streamlit APIs.
+    """
+
+    def __init__(self, streams, pool):
+        self.sections = [""] * len(streams)
+        self._events = queue.Queue()
+        self._pending = len(streams)
+        for index, chunks in enumerate(streams):
+            pool.submit(self._drain, index, chunks)
+
+    def _drain(self, index, chunks):
+        try:
+            for chunk in chunks:
+                self._events.put((index, chunk))
+        except Exception as e:
+            self._events.put((index, f"\n\nCONNECTION_SEVERED: {e}."))
+        finally:
+            self._events.put((index, None))
+
+    def events(self):
+        while self._pending:
+            batch = [self._events.get()]
+            while True:
+                try:
+                    batch.append(self._events.get_nowait())
+                except queue.Empty:
+                    break
+            touched = {}
+            for index, chunk in batch:
+                if chunk is None:
+                    self._pending -= 1
+                    touched[index] = True
+                else:
+                    self.sections[index] += chunk
+                    touched.setdefault(index, False)
+            for index, finished in touched.items():
+                yield index, self.sections[index], finished
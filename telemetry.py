@@ -0,0 +1,202 @@
+# PROTOCOL: ORACLE_v1 // TELEMETRY
+# Process-wide latency and payload metrics for every reading, aggregated across sessions.
+#
+# Exporters (both optional, started once per process):
+#   ORACLE_METRICS_PORT   - serves Prometheus text format at http://<host>:<port>/metrics
+#   ORACLE_METRICS_JSONL  - appends a snapshot line every ORACLE_METRICS_INTERVAL seconds
+#                           to a size-rotated JSONL file
+
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+QUANTILES = (0.5, 0.95, 0.99)
+WINDOW = 2048  # recent samples kept per series for quantiles
+
+# --- REGISTRY ---
+
+class Series:
+    """Running count/sum plus a sliding window of recent samples for quantiles."""
+
+    __slots__ = ("count", "total", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=WINDOW)
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        self.samples.append(value)
+
+    def quantiles(self):
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {q: 0.0 for q in QUANTILES}
+        return {q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in QUANTILES}
+
+def escape_label(value):
+    """A label value for the Prometheus text format: backslash, double quote and newline escaped."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class MetricsRegistry:
+    """Thread-safe counters and summaries keyed by (name, labels)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._summaries = {}
+        self._help = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def describe(self, name, text):
+        self._help[name] = text
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            series = self._summaries.get(key)
+            if series is None:
+                series = self._summaries[key] = Series()
+            series.observe(value)
+
+    @contextmanager
+    def span(self, stage, **labels):
+        """Times the enclosed block as one observation of oracle_stage_seconds{stage=...}."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("oracle_stage_seconds", time.perf_counter() - start, stage=stage, **labels)
+
+    def snapshot(self):
+        """Plain-dict view of every series (JSON friendly)."""
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            summaries = []
+            for (name, labels), series in sorted(self._summaries.items()):
+                q = series.quantiles()
+                summaries.append({
+                    "name": name, "labels": dict(labels), "count": series.count, "sum": series.total,
+                    "p50": q[0.5], "p95": q[0.95], "p99": q[0.99],
+                })
+        return {"ts": time.time(), "counters": counters, "summaries": summaries}
+
+    def render_prometheus(self):
+        """Prometheus text exposition: counters plus summaries with p50/p95/p99 quantiles."""
+        snap = self.snapshot()
+        lines, typed = [], set()
+
+        def header(name, kind):
+            if name not in typed:
+                typed.add(name)
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        def fmt(labels, **extra):
+            items = list(labels.items()) + list(extra.items())
+            if not items:
+                return ""
+            return "{" + ",".join(f'{k}="{escape_label(v)}"' for k, v in items) + "}"
+
+        for counter in snap["counters"]:
+            header(counter["name"], "counter")
+            lines.append(f"{counter['name']}{fmt(counter['labels'])} {counter['value']}")
+        for summary in snap["summaries"]:
+            name, labels = summary["name"], summary["labels"]
+            header(name, "summary")
+            for q, key in ((0.5, "p50"), (0.95, "p95"), (0.99, "p99")):
+                lines.append(f"{name}{fmt(labels, quantile=q)} {summary[key]}")
+            lines.append(f"{name}_sum{fmt(labels)} {summary['sum']}")
+            lines.append(f"{name}_count{fmt(labels)} {summary['count']}")
+        return "\n".join(lines) + "\n"
+
+METRICS = MetricsRegistry()
+METRICS.describe("oracle_stage_seconds", "Wall time per reading pipeline stage.")
+METRICS.describe("oracle_payload_chars", "Prompt and response sizes in characters.")
+METRICS.describe("oracle_tokens", "Gemini token usage per call.")
+METRICS.describe("oracle_readings_total", "Readings served, by source (gemini, cache, fallback, breaker_open, congested, shared, local).")
+METRICS.describe("oracle_asset_lookups_total", "Asset loader calls.")
+METRICS.describe("oracle_asset_misses_total", "Asset loader calls that missed the Streamlit cache.")
+
+def record_usage(response, **labels):
+    """Records Gemini token usage if the response (or final stream chunk) carries it."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    for kind, field in (("prompt", "prompt_token_count"), ("response", "candidates_token_count"), ("total", "total_token_count")):
+        value = getattr(usage, field, None)
+        if value:
+            METRICS.observe("oracle_tokens", value, kind=kind, **labels)
+
+# --- EXPORTERS ---
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = METRICS.render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_metrics_server(port):
+    """Serves /metrics on a daemon thread; returns None if the port is already taken."""
+    try:
+        server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+    except OSError:
+        return None
+    threading.Thread(target=server.serve_forever, name="oracle-metrics", daemon=True).start()
+    return server
+
+def start_jsonl_writer(path, interval=60.0, max_bytes=10 * 1024 * 1024, backups=5):
+    """Appends a registry snapshot to a rotating JSONL file every `interval` seconds."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    logger = logging.getLogger(f"oracle.metrics.{path}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups))
+    stop = threading.Event()
+
+    def loop():
+        while not stop.wait(interval):
+            logger.info(json.dumps(dict(METRICS.snapshot(), pid=os.getpid())))
+
+    threading.Thread(target=loop, name="oracle-metrics-jsonl", daemon=True).start()
+    return stop
+
+def start_exporters_from_env():
+    """Starts whichever exporters the environment asks for; call once per process."""
+    started = {}
+    port = os.environ.get("ORACLE_METRICS_PORT")
+    if port:
+        started["prometheus"] = start_metrics_server(int(port))
+    path = os.environ.get("ORACLE_METRICS_JSONL")
+    if path:
+        started["jsonl"] = start_jsonl_writer(path, float(os.environ.get("ORACLE_METRICS_INTERVAL", "60")))
+    return started
@@ -0,0 +1,50 @@
+import threading
+import time
+
+import pytest
+
+from admission import AdmissionScheduler, parse_tiers
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_parse_tiers_depth():
+    primary, cheaper, local = parse_tiers("a@10/1000/4,b@20/2000,local")
+    assert (primary.max_depth, cheaper.max_depth) == (4, None)
+    assert local.local
+    with pytest.raises(ValueError):
+        parse_tiers("a@10")
+
+def test_shallow_queue_takes_primary():
+    scheduler = AdmissionScheduler(parse_tiers("a@10/100000/1,b@10/100000,local"))
+    assert scheduler.admit(10).model_name == "a"
+
+def test_deep_queue_skips_primary_for_cheaper_model():
+    clock = Clock()
+    scheduler = AdmissionScheduler(parse_tiers("a@1/100000/1,b@1/100000", clock), max_wait=600, clock=clock)
+    # Drain both rungs so the next seekers queue up
+    assert [scheduler.admit(10).model_name for _ in range(2)] == ["a", "b"]
+
+    admitted = {}
+    def seeker(name):
+        admitted[name] = scheduler.admit(10).model_name
+    first = threading.Thread(target=seeker, args=("first",))
+    first.start()
+    while scheduler.depth() < 1:
+        time.sleep(0.001)
+    second = threading.Thread(target=seeker, args=("second",))
+    second.start()
+    while scheduler.depth() < 2:
+        time.sleep(0.001)
+
+    # Both rungs refill; with two seekers queued the head must leave the primary alone
+    clock.now = 60.0
+    with scheduler._cond:
+        scheduler._cond.notify_all()
+    first.join(5)
+    second.join(5)
+    assert admitted == {"first": "b", "second": "a"}
@@ -0,0 +1,50 @@
+import asyncio
+import io
+import threading
+
+from batch_reader import read_jobs, read_one
+from reading_cache import ReadingCache
+
+CARDS = ["The Fool", "Death", "The Star"]
+
+class FakeModel:
+    async def generate_content_async(self, prompt):
+        return type("Response", (), {"text": "THE SIGNAL IS CLEAR."})()
+
+class ThreadRecordingCache(ReadingCache):
+    """A real cache that notes which threads its SQLite calls ran on."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = []
+
+    def get_first(self, keys):
+        self.threads.append(threading.get_ident())
+        return super().get_first(keys)
+
+    def set(self, key, text):
+        self.threads.append(threading.get_ident())
+        return super().set(key, text)
+
+def test_invalid_lines_are_reported_by_line_not_id():
+    errors = []
+    stdin = io.StringIO('{"id": 1, "cards": ["The Fool", "Death", "The Star"]}\n\n{"cards": ["Nobody"]}\nnot json\n')
+    jobs = list(read_jobs(stdin, errors))
+    assert [job["id"] for job in jobs] == [1]
+    assert [error["line"] for error in errors] == [3, 4]
+    assert all("id" not in error and error["error"].startswith("INVALID_JOB") for error in errors)
+
+def test_cache_lookups_run_off_the_event_loop(tmp_path):
+    cache = ThreadRecordingCache(str(tmp_path / "cache.db"))
+    job = {"id": "a", "cards": CARDS, "query": "q"}
+
+    async def run():
+        loop_thread = threading.get_ident()
+        first = await read_one(job, FakeModel(), asyncio.Semaphore(1), cache)
+        second = await read_one(job, FakeModel(), asyncio.Semaphore(1), cache)
+        return loop_thread, first, second
+
+    loop_thread, first, second = asyncio.run(run())
+    assert (first["source"], second["source"]) == ("gemini", "cache")
+    assert second["reading"] == "THE SIGNAL IS CLEAR."
+    assert len(cache.threads) == 3 and loop_thread not in cache.threads
@@ -0,0 +1,21 @@
+import os
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+def test_establish_uplink_sets_marker_param_and_cookie():
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.secrets["GOOGLE_API_KEY"] = ""
+    at.run()
+    at.button[0].click().run()
+    assert not at.exception
+    assert at.query_params["uplink"] == "1"
+    scripts = [element.proto.srcdoc for element in at.get("iframe")]
+    assert sum('"oracle_uplink=1;' in script for script in scripts) == 1
+    # Written once, not on every rerun
+    at.run()
+    assert not any("oracle_uplink" in element.proto.srcdoc for element in at.get("iframe"))
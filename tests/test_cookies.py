@@ -0,0 +1,13 @@
+import pytest
+
+from cookies import cookie_script
+
+def test_cookie_script_sets_token_value():
+    script = cookie_script("oracle_seeker", "e6fjeEF4VD_nIg_7", 60)
+    assert '"oracle_seeker=e6fjeEF4VD_nIg_7; Max-Age=60; Path=/; SameSite=Lax"' in script
+    assert script.count("<script>") == 1 and script.count("</script>") == 1
+
+@pytest.mark.parametrize("value", ["</script><script>alert(1)</script>", "a;b", "a b", "a&b", "", None])
+def test_cookie_script_refuses_markup_and_separators(value):
+    with pytest.raises(ValueError):
+        cookie_script("oracle_seeker", value, 60)
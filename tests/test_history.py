@@ -0,0 +1,62 @@
+import pytest
+
+from history import HistoryStore
+
+CARDS = ["The Fool", "The Magician", "The High Priestess"]
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.sqlite"))
+    assert store.enabled
+    return store
+
+def fill(store, seeker, count):
+    return [store.append(seeker, CARDS, f"query {n}", f"reading {n}") for n in range(count)]
+
+def ids(entries):
+    return [entry.id for entry in entries]
+
+def test_pages_walk_back_and_forth(store):
+    written = fill(store, "seeker-a", 7)
+    fill(store, "seeker-b", 3)  # interleaved ids of another seeker never show up
+
+    newest, has_older, has_newer = store.page("seeker-a", limit=3)
+    assert ids(newest) == written[:-4:-1]
+    assert (has_older, has_newer) == (True, False)
+
+    middle, has_older, has_newer = store.page("seeker-a", before_id=newest[-1].id, limit=3)
+    assert ids(middle) == written[3:0:-1]
+    assert (has_older, has_newer) == (True, True)
+
+    oldest, has_older, has_newer = store.page("seeker-a", before_id=middle[-1].id, limit=3)
+    assert ids(oldest) == written[:1]
+    assert (has_older, has_newer) == (False, True)
+
+    back, has_older, has_newer = store.page("seeker-a", after_id=oldest[0].id, limit=3)
+    assert ids(back) == ids(middle)
+    assert (has_older, has_newer) == (True, True)
+
+def test_exact_page_boundaries(store):
+    written = fill(store, "seeker", 4)
+    page, has_older, has_newer = store.page("seeker", limit=4)
+    assert ids(page) == written[::-1]
+    assert (has_older, has_newer) == (False, False)
+    assert store.page("seeker", before_id=written[0]) == ([], False, False)
+    assert store.page("seeker", after_id=written[-1]) == ([], False, False)
+    assert store.page("nobody") == ([], False, False)
+
+def test_entries_and_text_round_trip(store):
+    text = "### 1. The Vigilance of the Core\n" + "static " * 2000
+    entry_id = store.append("seeker", CARDS, "", text, model="gemini-2.5-flash", source="gemini",
+                            timings={"reading_ms": 812})
+    (entry,), _, _ = store.page("seeker")
+    assert entry == (entry_id, entry.created_at, CARDS, "", "gemini-2.5-flash", "gemini", {"reading_ms": 812}, len(text))
+    assert store.reading("seeker", entry_id) == text
+    # Readings are only served to the seeker that owns them
+    assert store.reading("someone-else", entry_id) is None
+
+def test_disabled_store_is_a_no_op():
+    store = HistoryStore("")
+    assert store.append("seeker", CARDS, "q", "text") is None
+    assert store.page("seeker") == ([], False, False)
+    assert store.reading("seeker", 1) is None
@@ -0,0 +1,19 @@
+import contextlib
+
+import pytest
+
+pytest.importorskip("streamlit")
+import main
+
+def test_live_stream_sends_each_chunk_once(monkeypatch):
+    sent = []
+    monkeypatch.setattr(main, "CLIENT_TYPEWRITER", True)
+    monkeypatch.setattr(main, "typewriter", lambda text, **kwargs: sent.append((text, kwargs.get("offset"))))
+    chunks = ["### 1. The Vigilance", " of the Core\n", "The static ", "clears."]
+
+    text = main.stream_text_live(contextlib.nullcontext(), iter(chunks))
+
+    assert text == "".join(chunks)
+    # One delta per chunk at its offset, then the whole reading once to settle the component
+    assert sent[:-1] == [(chunk, len("".join(chunks[:n]))) for n, chunk in enumerate(chunks)]
+    assert sent[-1] == (text, None)
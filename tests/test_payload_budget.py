@@ -0,0 +1,40 @@
+import importlib.util
+import json
+import logging
+import os
+
+import pytest
+
+pytest.importorskip("streamlit")
+import streamlit as st
+
+import oracle_core
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks")
+
+def load_payload_budget():
+    spec = importlib.util.spec_from_file_location("payload_budget", os.path.join(BENCHMARKS, "payload_budget.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture
+def offline_app(monkeypatch):
+    # record_stages sets these and swaps in the fake model; put everything back afterwards
+    for name in ("ORACLE_CACHE_PATH", "ORACLE_HISTORY_PATH", "ORACLE_SPECULATE", "ORACLE_ASSET_MODE"):
+        monkeypatch.setenv(name, os.environ.get(name, ""))
+    monkeypatch.setattr(oracle_core, "create_gemini_model", oracle_core.create_gemini_model)
+    st.cache_resource.clear()
+    yield
+    st.cache_resource.clear()
+    logging.disable(logging.NOTSET)
+
+def test_every_stage_fits_its_payload_budget(offline_app):
+    payload_budget = load_payload_budget()
+    with open(payload_budget.BUDGET_PATH) as f:
+        budget = json.load(f)
+    stages = payload_budget.record_stages(output_chars=2500)
+    assert set(stages) == set(budget)
+    over = {stage: (sizes["html_bytes"], budget[stage])
+            for stage, sizes in stages.items() if sizes["html_bytes"] > budget[stage]}
+    assert not over, f"markdown/HTML bytes over budget (actual, budget): {over}"
@@ -0,0 +1,36 @@
+from prefetch import Speculation
+from telemetry import METRICS
+
+def readings(source):
+    return sum(counter["value"] for counter in METRICS.snapshot()["counters"]
+               if counter["name"] == "oracle_readings_total" and counter["labels"] == {"source": source})
+
+def speculation(source, commit_before_report=False):
+    spec = Speculation(["The Fool"], "q")
+
+    def chunks():
+        spec.report(source, "fake-model")
+        yield "the reading"
+
+    if commit_before_report:
+        spec.commit()
+    spec.start(chunks())
+    assert spec.result(timeout=5) == "the reading"
+    return spec
+
+def test_discarded_speculation_is_never_counted():
+    before = readings("spec-discarded")
+    spec = speculation("spec-discarded")
+    spec.cancel()
+    assert spec.meta == {"source": "spec-discarded", "model": "fake-model"}
+    assert readings("spec-discarded") == before
+
+def test_committed_speculation_is_counted_once():
+    before = readings("spec-late")
+    spec = speculation("spec-late")
+    spec.commit()
+    assert readings("spec-late") == before + 1
+
+    before = readings("spec-early")
+    speculation("spec-early", commit_before_report=True)
+    assert readings("spec-early") == before + 1
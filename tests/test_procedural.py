@@ -0,0 +1,18 @@
+from procedural import compose_reading, parse_query
+
+CARDS = ("The Fool", "The Magician", "The High Priestess")
+
+def test_query_echo_is_html_escaped():
+    query = '<img src=x onerror="alert(1)"> will I <b>rise</b>?'
+    reading = compose_reading(CARDS, query, seed=7)
+    assert "<img" not in reading
+    assert "<b>" not in reading
+    assert "&lt;img src=x onerror=&quot;alert(1)&quot;&gt;" in reading
+
+def test_escaping_keeps_query_parsing():
+    parsed = parse_query("will the <i>code</i> compile?")
+    assert parsed.echo == "will the &lt;i&gt;code&lt;/i&gt; compile"
+    assert parsed.form == "binary"
+
+def test_reading_is_deterministic_per_seed():
+    assert compose_reading(CARDS, "what is next", seed=1) == compose_reading(CARDS, "what is next", seed=1)
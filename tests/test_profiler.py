@@ -0,0 +1,17 @@
+import pytest
+
+from profiler import RerunProfiler, profile_enabled, profiler_from_env
+
+@pytest.mark.parametrize("value", ["1", "true", "TRUE", "Yes", " yes ", True])
+def test_on_values_enable_profiling(value):
+    assert profile_enabled(value)
+
+@pytest.mark.parametrize("value", ["", "0", "false", "False", "no", "off", False, None])
+def test_everything_else_is_off(value):
+    assert not profile_enabled(value)
+
+@pytest.mark.parametrize("value, on", [("false", False), ("0", False), ("true", True), ("1", True)])
+def test_env_flag(monkeypatch, tmp_path, value, on):
+    monkeypatch.setenv("ORACLE_PROFILE", value)
+    monkeypatch.setenv("ORACLE_PROFILE_DIR", str(tmp_path))
+    assert isinstance(profiler_from_env(), RerunProfiler) is on
@@ -0,0 +1,31 @@
+from reading_cache import ReadingCache
+from telemetry import METRICS
+
+def cache_total(tier, outcome):
+    labels = {"tier": tier, "outcome": outcome}
+    return sum(counter["value"] for counter in METRICS.snapshot()["counters"]
+               if counter["name"] == "oracle_cache_total" and counter["labels"] == labels)
+
+def test_ladder_lookup_counts_one_miss():
+    cache = ReadingCache("")
+    misses = cache_total("memory", "miss")
+    assert cache.get_first(["primary", "lite"]) is None
+    assert cache.stats()["misses"] == 1
+    assert cache_total("memory", "miss") == misses + 1
+
+def test_lookup_finds_later_tier_key():
+    cache = ReadingCache("")
+    cache.set("lite", "reading")
+    hits = cache_total("memory", "hit")
+    assert cache.get_first(["primary", "lite"]) == "reading"
+    assert (cache.stats()["memory_hits"], cache.stats()["misses"]) == (1, 0)
+    assert cache_total("memory", "hit") == hits + 1
+
+def test_disk_hits_are_labelled_by_tier(tmp_path):
+    ReadingCache(str(tmp_path / "readings.sqlite")).set("key", "reading")
+    cache = ReadingCache(str(tmp_path / "readings.sqlite"))
+    hits = cache_total("disk", "hit")
+    assert cache.get("key") == "reading"
+    assert cache.get("key") == "reading"
+    assert (cache.stats()["disk_hits"], cache.stats()["memory_hits"]) == (1, 1)
+    assert cache_total("disk", "hit") == hits + 1
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from reading_service import HTTPError, parse_reading_request, read_request
+
+def parse(raw):
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return await read_request(reader)
+    return asyncio.run(run())
+
+def test_reads_body_by_content_length():
+    request = parse(b'POST /reading HTTP/1.1\r\nContent-Length: 2\r\n\r\n{}')
+    assert (request.method, request.path, request.body) == ("POST", "/reading", b"{}")
+
+@pytest.mark.parametrize("length", [b"abc", b"-1", b"1.5"])
+def test_invalid_content_length_is_a_bad_request(length):
+    with pytest.raises(HTTPError) as error:
+        parse(b"POST /reading HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n{}")
+    assert error.value.status == 400
+
+@pytest.mark.parametrize("fields", [
+    {"cards": [[1], [2], [3]]},
+    {"cards": [{}, "The Fool", "The Magician"]},
+    {"cards": ["The Fool", "The Fool", "The Magician"]},
+    {"seed": True},
+    {"seed": 1.9},
+    {"seed": "1.9"},
+    {"seed": [1]},
+    {"seed": 2 ** 32},
+])
+def test_invalid_reading_fields_are_bad_requests(fields):
+    with pytest.raises(HTTPError) as error:
+        parse_reading_request(fields)
+    assert error.value.status == 400
+
+def test_reading_fields_accept_json_and_query_strings():
+    cards = ["The Fool", "The Magician", "The High Priestess"]
+    assert parse_reading_request({"seed": 7, "cards": cards, "query": "q"}) == (7, cards, "q")
+    assert parse_reading_request({"seed": "7", "cards": ",".join(cards)}) == (7, cards, "")
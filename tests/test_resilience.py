@@ -0,0 +1,43 @@
+import pytest
+
+from resilience import CircuitBreaker, RetryPolicy, call_with_resilience, stream_with_resilience
+
+class ApiError(Exception):
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+def failing(code):
+    def call(timeout):
+        raise ApiError(code)
+    return call
+
+def test_client_errors_leave_breaker_closed():
+    breaker = CircuitBreaker(failure_threshold=2)
+    policy = RetryPolicy(retries=0)
+    for _ in range(5):
+        with pytest.raises(ApiError):
+            call_with_resilience(failing(400), policy, breaker)
+        with pytest.raises(ApiError):
+            list(stream_with_resilience(failing(403), policy, breaker))
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_server_errors_open_breaker():
+    breaker = CircuitBreaker(failure_threshold=2)
+    policy = RetryPolicy(retries=0)
+    for _ in range(2):
+        with pytest.raises(ApiError):
+            call_with_resilience(failing(503), policy, breaker)
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_client_error_frees_half_open_probe():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=1.0, clock=lambda: now[0])
+    policy = RetryPolicy(retries=0)
+    with pytest.raises(ApiError):
+        call_with_resilience(failing(500), policy, breaker)
+    now[0] = 2.0
+    with pytest.raises(ApiError):
+        call_with_resilience(failing(400), policy, breaker)
+    assert call_with_resilience(lambda timeout: "ok", policy, breaker) == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest
+
+from main import SEEKER_ID
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+def input_screen(seeker):
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.secrets["GOOGLE_API_KEY"] = ""
+    at.query_params["seeker"] = seeker
+    at.session_state["boot_complete"] = True
+    at.run()
+    assert not at.exception
+    return at
+
+def cookie_scripts(at):
+    return [element.proto.srcdoc for element in at.get("iframe")]
+
+def test_script_in_seeker_param_never_reaches_the_page():
+    payload = "</script><script>alert(1)</script>"
+    at = input_screen(payload)
+    assert "seeker" not in at.query_params
+    scripts = cookie_scripts(at)
+    assert scripts and all("alert" not in script for script in scripts)
+
+def test_leaked_seeker_link_is_not_adopted():
+    leaked = "AAAAAAAAAAAAAAAA"
+    at = input_screen(leaked)
+    sid = at.session_state["seeker_id"]
+    assert sid != leaked and SEEKER_ID.fullmatch(sid)
+    assert "seeker" not in at.query_params
+    assert all(leaked not in script for script in cookie_scripts(at))
@@ -0,0 +1,63 @@
+import base64
+import struct
+
+import pytest
+
+from card_library import CARDS, NAME_TO_ID
+from reading_cache import ReadingCache
+from share import decode_reading_id, encode_reading_id, load_shared, query_hash, store_shared
+
+TRIAD = ["The Fool", "The Magician", "The High Priestess"]
+CROSS = [card.name for card in CARDS[10:20]]
+
+def b64(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+def raw(reading_id):
+    return bytearray(base64.urlsafe_b64decode(reading_id + "=" * (-len(reading_id) % 4)))
+
+@pytest.mark.parametrize("spread, cards, length", [("triad", TRIAD, 20), ("celtic_cross", CROSS, 30)])
+def test_v2_round_trip(spread, cards, length):
+    reading_id = encode_reading_id(2 ** 32 - 1, cards, "Will it  RISE?", spread)
+    assert len(reading_id) == length
+    decoded = decode_reading_id(reading_id)
+    assert (decoded.seed, decoded.spread, decoded.cards) == (2 ** 32 - 1, spread, cards)
+    # Normalized query: case and whitespace do not change the id
+    assert decoded.query_hash == query_hash("will it rise?")
+
+def test_v1_ids_still_decode_as_triads():
+    packed = struct.pack(">BI", 1, 42) + bytes(NAME_TO_ID[name] for name in TRIAD) + query_hash("q")
+    decoded = decode_reading_id(b64(packed))
+    assert (decoded.seed, decoded.spread, decoded.cards, decoded.query_hash) == (42, "triad", TRIAD, query_hash("q"))
+
+def tampered(edit):
+    data = raw(encode_reading_id(7, TRIAD, "q"))
+    edit(data)
+    return b64(bytes(data))
+
+@pytest.mark.parametrize("reading_id", [
+    "",
+    "!!not-base64!!",
+    "AA",
+    tampered(lambda data: data.__setitem__(0, 9)),                  # unknown version
+    tampered(lambda data: data.__setitem__(5, 200)),                # unknown spread
+    tampered(lambda data: data.__setitem__(5, 2)),                  # card count != Celtic Cross positions
+    tampered(lambda data: data.__setitem__(7, data[6])),            # repeated card
+    tampered(lambda data: data.__setitem__(6, len(CARDS))),         # card id past the deck
+    tampered(lambda data: data.__delitem__(6)),                     # truncated
+])
+def test_malformed_ids_are_rejected(reading_id):
+    assert decode_reading_id(reading_id) is None
+
+def test_load_shared_round_trip_and_query_hash_check():
+    cache = ReadingCache("")
+    reading_id = encode_reading_id(7, TRIAD, "my query")
+    store_shared(cache, reading_id, "my query", "the reading")
+    assert load_shared(cache, reading_id) == ("my query", "the reading")
+
+    # Another query stored under this id (a forged or colliding entry) is not served
+    forged = encode_reading_id(7, TRIAD, "other query")
+    store_shared(cache, forged, "my query", "forged reading")
+    assert load_shared(cache, forged) is None
+    assert load_shared(cache, encode_reading_id(8, TRIAD, "my query")) is None
+    assert load_shared(cache, "garbage") is None
@@ -0,0 +1,61 @@
+import os
+import time
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest
+
+import spread_export
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+    def fake_render(cards, reading, query="", fmt="png", spread=spread_export.DEFAULT_SPREAD):
+        calls.append(fmt)
+        return f"{fmt}:{reading}".encode()
+    monkeypatch.setattr(spread_export, "render_spread", fake_render)
+    return calls
+
+def reading_page():
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.secrets["GOOGLE_API_KEY"] = ""
+    state = dict(
+        boot_complete=True, stage="READING", seed=7, cards=["The Fool", "The Magician", "The High Priestess"],
+        query="export budget test", reading="Nothing renders unasked.", sections=None, synthesis=None,
+        streamed=True, placeholder_card="The Fool"
+    )
+    for key, value in state.items():
+        at.session_state[key] = value
+    at.run()
+    assert not at.exception
+    return at
+
+def export_buttons(at):
+    return [button for button in at.button if button.key and button.key.startswith("export_")]
+
+def test_reading_renders_no_export_until_asked(renders):
+    at = reading_page()
+    assert renders == []
+    assert [button.label for button in export_buttons(at)] == ["[ RENDER_SPREAD.PNG ]", "[ RENDER_SPREAD.PDF ]"]
+    # Reruns of the same reading still render nothing
+    at.run()
+    assert renders == []
+
+def test_render_button_renders_only_that_format_once(renders):
+    at = reading_page()
+    at.button(key="export_pdf").click().run()
+    assert not at.exception
+    # The render runs on the export pool; reruns poll it like the page's fragment does
+    for _ in range(50):
+        if at.get("download_button")[1:]:
+            break
+        time.sleep(0.02)
+        at.run()
+    assert [button.proto.label for button in at.get("download_button")[1:]] == ["[ EXPORT_SPREAD.PDF ]"]
+    assert [button.key for button in export_buttons(at)] == ["export_png"]
+    # One render per format: later reruns reuse the cached bytes
+    at.run()
+    assert renders == ["pdf"]
@@ -0,0 +1,57 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from admission import AdmissionScheduler, parse_tiers
+from card_library import CARDS
+from fake_gemini import FakeGenerativeModel
+from oracle_core import stream_gemini
+from reading_cache import ReadingCache
+from resilience import CircuitBreaker, RetryPolicy
+from spreads import PENTAGRAM, SectionRun, assemble_reading, build_section_prompt, build_synthesis_prompt, local_section
+
+CARDS_DRAWN = [card.name for card in CARDS[:5]]
+QUERY = "where does the path lead"
+FAILING = 2
+
+def section_stream(index, scheduler, cache, breaker):
+    if index == FAILING:
+        model = FakeGenerativeModel(latency=0.01, error_rate=1.0, seed=index)
+    else:
+        # The first position is the slowest, so sections finish out of position order
+        model = FakeGenerativeModel(latency=0.3 if index == 0 else 0.02, chunks=4, seed=index)
+    return stream_gemini(
+        build_section_prompt(PENTAGRAM, index, CARDS_DRAWN, QUERY), lambda model_name: f"section:{index}",
+        lambda error: f"CONNECTION_SEVERED: {error}. LOCAL BUFFER: {local_section(PENTAGRAM, index, CARDS_DRAWN, QUERY)}",
+        {"fake": model}, cache, scheduler, breaker, RetryPolicy(retries=0),
+    )
+
+def test_sections_stream_concurrently_and_fall_back_per_position():
+    scheduler = AdmissionScheduler(parse_tiers("fake@1000/100000000"))
+    cache, breaker = ReadingCache(""), CircuitBreaker(failure_threshold=100)
+    streams = [section_stream(index, scheduler, cache, breaker) for index in range(len(CARDS_DRAWN))]
+    with ThreadPoolExecutor(max_workers=len(streams)) as pool:
+        run = SectionRun(streams, pool)
+        finished = [index for index, text, done in run.events() if done]
+
+    # Every section finishes exactly once; the slow first position lands last
+    assert sorted(finished) == list(range(len(CARDS_DRAWN)))
+    assert finished[-1] == 0
+
+    for index, section in enumerate(run.sections):
+        if index == FAILING:
+            assert section.lstrip().startswith("CONNECTION_SEVERED:")
+            assert section.endswith(local_section(PENTAGRAM, index, CARDS_DRAWN, QUERY))
+        else:
+            # Each text landed in its own slot: the fake model echoes the position's prompt
+            assert f"Position {index + 1} of {len(CARDS_DRAWN)}" in section
+            assert "CONNECTION_SEVERED" not in section
+
+    # The synthesis prompt and the assembled reading follow position order, not finish order
+    prompt = build_synthesis_prompt(PENTAGRAM, CARDS_DRAWN, QUERY, run.sections)
+    labels = [f"- {position.name} [{name}]:" for position, name in zip(PENTAGRAM.positions, CARDS_DRAWN)]
+    offsets = [prompt.index(label) for label in labels]
+    assert offsets == sorted(offsets)
+    reading = assemble_reading(PENTAGRAM, CARDS_DRAWN, run.sections, "the whisper")
+    headers = [f"### {n}. {position.name} [{name}]" for n, (position, name) in enumerate(zip(PENTAGRAM.positions, CARDS_DRAWN), 1)]
+    offsets = [reading.index(header) for header in headers]
+    assert offsets == sorted(offsets)
+    assert reading.endswith("### 6. Sophia's Whisper\nthe whisper")
@@ -0,0 +1,15 @@
+from telemetry import MetricsRegistry, escape_label
+
+def test_escape_label():
+    assert escape_label('a\\b"c\nd') == 'a\\\\b\\"c\\nd'
+    assert escape_label(0.5) == "0.5"
+
+def test_label_values_cannot_break_the_exposition():
+    registry = MetricsRegistry()
+    registry.inc("oracle_readings_total", source='gemini"} 1\nforged_total{x="')
+    registry.observe("oracle_stage_seconds", 0.25, stage="path\\to")
+    lines = registry.render_prometheus().splitlines()
+    samples = [line for line in lines if not line.startswith("#")]
+    assert 'oracle_readings_total{source="gemini\\"} 1\\nforged_total{x=\\""} 1' in samples
+    assert not any(line.startswith("forged_total") for line in lines)
+    assert 'oracle_stage_seconds_count{stage="path\\\\to"} 1' in samples
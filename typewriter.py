@@ -0,0 +1,24 @@
+# PROTOCOL: ORACLE_v1 // CLIENT-SIDE TYPEWRITER COMPONENT
+# The reading is sent to the browser once (or, while it streams, one delta per chunk); the
+# typewriter/cursor animation runs there instead of re-rendering the whole accumulated
+# text from the script thread every flush.
+
+import os
+
+import streamlit.components.v1 as components
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frontend', 'typewriter')
+
+_typewriter = components.declare_component("oracle_typewriter", path=FRONTEND_DIR)
+
+def typewriter(text, animate=True, cps=400, glitch=None, key=None, offset=None):
+    """
+    Renders `text` as an .ai-output block in the browser.
+    `animate=False` draws it instantly; a longer `text` that extends what is already
+    on screen keeps typing from where it left off. `glitch` maps words in the text to
+    the jargon they flicker into once typing finishes. With `offset`, `text` is only a
+    delta: the browser appends it at that position of the text it already holds, so a
+    live stream sends each chunk once instead of the whole reading so far.
+    """
+    return _typewriter(text=text, animate=animate, cps=cps, glitch=glitch or {}, key=key, offset=offset,
+                       default=None)